@@ -3,11 +3,13 @@
 import os
 import csv, sys
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                            QFileDialog, QMessageBox, QTextEdit, QApplication, QListWidget)
+                            QFileDialog, QMessageBox, QApplication, QListWidget)
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QIcon
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
+from vendor_resolver import get_vendor_resolver
 
 
 def resource_path(relative_path):
@@ -70,7 +72,7 @@ class APReconcileWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -84,17 +86,7 @@ class APReconcileWindow(RetroWindow):
         )
         if files and len(files) == 3:  # Expecting 3 CSV files now
             # Identify which file is which
-            ach_file = None
-            r365_file = None
-            balance_file = None
-
-            for file in files:
-                if os.path.basename(file).startswith('Ach'):
-                    ach_file = file
-                elif os.path.basename(file).lower().startswith('balance'):
-                    balance_file = file
-                else:
-                    r365_file = file
+            r365_file, ach_file, balance_file = categorize_reconcile_files(files)
 
             if ach_file and r365_file and balance_file:
                 self.selected_files = [r365_file, ach_file, balance_file]
@@ -182,6 +174,33 @@ The program will:
         msg_box.setStandardButtons(QMessageBox.Ok)
         msg_box.exec_()
 
+LOAN_ACCOUNTS = ['COMMERCIAL TERM LOAN- US ADDRESSEE 149800',
+                 'COMMERCIAL TERM LOAN- US ADDRESSEE 152110',
+                 '3rd Loan CNB 153570']
+
+
+def to_cents(amount_str):
+    """Parse a bank export amount such as '$1,234.56' into integer cents"""
+    amount = Decimal(amount_str.strip().replace('$', '').replace(',', ''))
+    return int((amount * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def categorize_reconcile_files(files):
+    """Identify the R365, ACH ('Ach...') and balance ('balance...') files among the selected CSVs"""
+    ach_file = None
+    r365_file = None
+    balance_file = None
+
+    for file in files:
+        if os.path.basename(file).startswith('Ach'):
+            ach_file = file
+        elif os.path.basename(file).lower().startswith('balance'):
+            balance_file = file
+        else:
+            r365_file = file
+
+    return r365_file, ach_file, balance_file
+
 class ReconcileThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
@@ -233,76 +252,97 @@ class ReconcileThread(QThread):
             "Carrot Franchise Systems, LLC 30000481015": "Carrot Express Franchise System LLC"
         }
 
-        self.vendor_name_mapping = {
-            "Action Plumbing and Heating Blackflow Corp": "ACTION PLUMBING AND HEATING BACKFLO",
-            "Choice Mechanical Refrigeration Services": "Choice Mechanical Refrigeration Ser",
-            "Fire Zone Ventilation & Suppression Inc.": "Fire Zone Ventilation & Suppression",
-            "Duke Martin Refrigeration & Air Cond Inc": "Duke Martin Refrigeration & Air Con",
-            "Sunshine Cleaning Contractor & Services": "Sunshine Cleaning Contractor & Serv",
-            "ALFRED I DUPONT BUILDING PARTNERSHIP LLP": "ALFRED I DUPONT BUILDING PARTNERSHI",
-            "Universal Environmental Consulting, Inc": "Universal Environmental Consulting,",
-            "Hernan Gonzalez - Petit Cash SoFLC": "Hernan Gonzalez Petit Cash SoFLC",
-            "Ginette Salas Petit Cash River Landing": "Ginette Salas PC River Landing",
-            "Currus Group, LLC": "Currus Group LLC",
-            "Fabiola Cavalier PC  Commissary": "Fabiola Cavalier PC Commissary",
-        }
+        self.vendor_resolver = get_vendor_resolver()
 
     def extract_balances_from_csv(self):
+        """
+        Stream the CNB balance export, which repeats groups of three lines
+        (Available Balance, Current Balance, account name), into available
+        balances in cents keyed by account name. Loan accounts are skipped.
+        """
         balances = {}
+        stats = {'rows': 0, 'accounts': 0, 'skipped_loans': 0}
         try:
-            current_balance = None
+            pending_cents = None
+            lines_to_account = 0
             with open(self.balance_file, 'r') as f:
-                lines = f.readlines()
+                for raw_line in f:
+                    stats['rows'] += 1
+                    line = raw_line.strip().strip('"')
+
+                    # The account name comes two lines after its Available Balance line
+                    if lines_to_account:
+                        lines_to_account -= 1
+                        if lines_to_account:
+                            continue
+                        if line.startswith('City National Bank of Florida'):
+                            account_info = line.replace('City National Bank of Florida ', '').strip()
+
+                            if any(loan in account_info for loan in LOAN_ACCOUNTS):
+                                stats['skipped_loans'] += 1
+                            else:
+                                # Extract just the text part before the account number
+                                account_name = ' '.join(account_info.split()[:-1])
 
-                # Process lines in groups of 3 (Available Balance, Current Balance, Account Name)
-                i = 0
-                while i < len(lines):
-                    line = lines[i].strip().strip('"')
+                                # Handle special cases
+                                if account_name == "REGULAR COMMERCIAL CHECKING":
+                                    account_name = "Beyond Branding"
+                                elif account_name == "Carrot Love Plantation Operating LLC":
+                                    account_name = "Carrot Love Plantation Operating ?LLC"
+
+                                balances[account_name] = pending_cents
+                                stats['accounts'] += 1
+                                self.update_signal.emit(f"Stored balance for {account_name}: {pending_cents / 100}")
 
-                    # If we find an Available Balance line
                     if 'Available Balance' in line:
                         try:
-                            # Get the Available Balance amount
-                            amount_str = line.split('$')[1].strip()
-                            amount = float(amount_str.replace(',', ''))
-
-                            # Skip Current Balance line
-                            i += 1
-
-                            # Get the account name from the next line
-                            if i + 1 < len(lines):
-                                account_line = lines[i + 1].strip().strip('"')
-                                if account_line.startswith('City National Bank of Florida'):
-                                    account_info = account_line.replace('City National Bank of Florida ', '').strip()
-
-                                    # Skip loan accounts
-                                    if not any(loan in account_info for loan in
-                                        ['COMMERCIAL TERM LOAN- US ADDRESSEE 149800',
-                                         'COMMERCIAL TERM LOAN- US ADDRESSEE 152110',
-                                         '3rd Loan CNB 153570']):
-
-                                        # Extract just the text part before the account number
-                                        account_name = ' '.join(account_info.split()[:-1])
-
-                                        # Handle special cases
-                                        if account_name == "REGULAR COMMERCIAL CHECKING":
-                                            account_name = "Beyond Branding"
-                                        elif account_name == "Carrot Love Plantation Operating LLC":
-                                            account_name = "Carrot Love Plantation Operating ?LLC"
-
-                                        balances[account_name] = amount
-                                        self.update_signal.emit(f"Stored balance for {account_name}: {amount}")
-                        except (ValueError, IndexError) as e:
+                            pending_cents = to_cents(line.split('$')[1])
+                            lines_to_account = 2
+                        except (ArithmeticError, IndexError) as e:
                             self.update_signal.emit(f"Error processing balance: {str(e)}")
-                    i += 1
 
-            self.update_signal.emit(f"Extracted balances: {balances}")
+            self.update_signal.emit(f"Extracted balances: { {name: cents / 100 for name, cents in balances.items()} }")
+            self.update_signal.emit(f"Balance file: {stats['rows']} rows, {stats['accounts']} accounts, "
+                                    f"{stats['skipped_loans']} loan accounts skipped")
             return balances
 
         except Exception as e:
             self.update_signal.emit(f"Error processing balance file: {str(e)}")
             return {}
 
+    def read_ach_payments(self):
+        """
+        Stream the ACH export into running cent totals per account and recipient, so
+        memory grows with the number of recipients rather than the number of rows.
+        An account row starts a block and the recipient rows below it belong to it.
+
+        Returns:
+            {account: {recipient: cents}} with every account that has a block, in the
+            order first seen
+        """
+        accounts = {}
+        stats = {'rows': 0, 'payments': 0, 'skipped': 0}
+        current_account = None
+
+        with open(self.ach_file, 'r') as f:
+            for row in csv.DictReader(f):
+                stats['rows'] += 1
+                if row['From Account'].strip():
+                    current_account = row['From Account'].strip()
+                    accounts.setdefault(current_account, {})
+                elif row['Recipient Payment Amount'].strip():
+                    if current_account is None:
+                        stats['skipped'] += 1
+                        continue
+                    recipients = accounts[current_account]
+                    recipient = row['Recipient Name']
+                    recipients[recipient] = recipients.get(recipient, 0) + to_cents(row['Recipient Payment Amount'])
+                    stats['payments'] += 1
+
+        self.update_signal.emit(f"ACH file: {stats['rows']} rows, {len(accounts)} accounts, "
+                                f"{stats['payments']} payments, {stats['skipped']} payments without an account skipped")
+        return accounts
+
     def run(self):
         import pandas as pd
         try:
@@ -330,9 +370,6 @@ class ReconcileThread(QThread):
                     reverse_account_to_store[account] = []
                 reverse_account_to_store[account].append(store)
 
-            # Create case-insensitive vendor mapping
-            vendor_mapping_lower = {k.lower(): v for k, v in self.vendor_name_mapping.items()}
-
             # Read R365 file and debug columns
             r365_df = pd.read_csv(self.r365_file, skiprows=1)
             self.update_signal.emit(f"R365 columns found: {list(r365_df.columns)}")
@@ -364,23 +401,30 @@ class ReconcileThread(QThread):
             if not approved_payment_date_column:
                 raise ValueError("Could not find Approved Payment Date column in R365 file")
 
-            # Filter R365 data
-            r365_df = r365_df[~r365_df[store_column].isin(excluded_stores)]
-
-            # Calculate ACHB totals
-            achb_df = r365_df[r365_df[payment_type_column] == 'ACHB']
-
-            # Get WIRE and RENT entries
-            wire_rent_df = r365_df[r365_df[payment_type_column].isin(['WIRE', 'RENT'])]
-
-            # Handle XFR entries separately - EXCLUDE if Approved Payment Date contains "Paid"
-            xfr_df = r365_df[r365_df[payment_type_column] == 'XFR']
-            valid_xfr_df = xfr_df[
-                ~xfr_df[approved_payment_date_column].astype(str).str.contains('paid', case=False, na=False)
-            ]
-
-            # Combine valid XFR entries with WIRE and RENT entries
-            wire_xfr_df = pd.concat([wire_rent_df, valid_xfr_df])
+            # Filter R365 data and parse the Total column once
+            r365_df = r365_df[~r365_df[store_column].isin(excluded_stores)].copy()
+            r365_df[total_column] = pd.to_numeric(
+                r365_df[total_column].astype(str).str.replace(r'[$,]', '', regex=True))
+            r365_df['Account'] = r365_df[store_column].map(store_to_account)
+
+            # ACHB entries are reconciled against the ACH file. WIRE and RENT entries count toward
+            # the WIRE/XFR/RENT net, as do XFR entries unless the Approved Payment Date contains "Paid"
+            payment_type = r365_df[payment_type_column]
+            xfr_paid = r365_df[approved_payment_date_column].astype(str).str.contains('paid', case=False, na=False)
+            r365_df['Payment Group'] = None
+            r365_df.loc[payment_type == 'ACHB', 'Payment Group'] = 'ACHB'
+            r365_df.loc[payment_type.isin(['WIRE', 'RENT']) | ((payment_type == 'XFR') & ~xfr_paid),
+                        'Payment Group'] = 'WIRE/XFR/RENT'
+
+            # Vendor totals per account and payment group in one pass. Vendors keep the order they were
+            # first met in, walking stores in file order and each store's vendors alphabetically
+            payments = r365_df[r365_df['Account'].notna() & r365_df['Payment Group'].notna()].copy()
+            payments['Store Order'] = payments.groupby('Payment Group')[store_column].transform(
+                lambda stores: stores.map({store: i for i, store in enumerate(stores.unique())}))
+            vendor_totals = (payments.groupby(['Account', 'Payment Group', vendor_column], dropna=False, sort=False)
+                             .agg(Total=(total_column, 'sum'), Order=('Store Order', 'min'))
+                             .reset_index()
+                             .sort_values(['Order', vendor_column], kind='stable'))
 
             # Group R365 data and calculate net amounts
             r365_totals = {}
@@ -388,91 +432,30 @@ class ReconcileThread(QThread):
             wire_xfr_nets = {}
 
             # Track all accounts that have any kind of data
-            all_accounts = set()
-
-            # Process ACHB data
-            for store in achb_df[store_column].unique():
-                if store in store_to_account:
-                    account = store_to_account[store]
-                    all_accounts.add(account)
-                    store_data = achb_df[achb_df[store_column] == store]
-
-                    # Convert Total column to float
-                    store_data[total_column] = store_data[total_column].apply(lambda x: float(str(x).replace('$', '').replace(',', '')))
+            all_accounts = set(vendor_totals['Account'])
 
-                    if account not in r365_totals:
-                        r365_totals[account] = {}
-                        r365_nets[account] = 0
-
-                    for vendor, amount in store_data.groupby(vendor_column)[total_column].sum().items():
-                        if vendor in r365_totals[account]:
-                            r365_totals[account][vendor] += amount
-                        else:
-                            r365_totals[account][vendor] = amount
-                        r365_nets[account] += amount
-
-            # Process WIRE/XFR/RENT data (excluding XFR entries with "Paid")
-            for store in wire_xfr_df[store_column].unique():
-                if store in store_to_account:
-                    account = store_to_account[store]
-                    all_accounts.add(account)
-                    store_data = wire_xfr_df[wire_xfr_df[store_column] == store]
-
-                    # Convert Total column to float
-                    store_data[total_column] = store_data[total_column].apply(lambda x: float(str(x).replace('$', '').replace(',', '')))
+            achb_totals = vendor_totals[vendor_totals['Payment Group'] == 'ACHB']
+            for account, totals in achb_totals.groupby('Account', sort=False):
+                totals = totals.dropna(subset=[vendor_column])
+                r365_totals[account] = dict(zip(totals[vendor_column], totals['Total']))
+                r365_nets[account] = totals['Total'].sum()
 
-                    if account not in wire_xfr_nets:
-                        wire_xfr_nets[account] = 0
+            wire_xfr_totals = vendor_totals[vendor_totals['Payment Group'] == 'WIRE/XFR/RENT']
+            wire_xfr_nets = wire_xfr_totals.groupby('Account')['Total'].sum().to_dict()
 
-                    wire_xfr_nets[account] += store_data[total_column].sum()
+            # First invoice number per account and vendor, for the discrepancy report
+            first_invoices = r365_df.dropna(subset=['Account']).drop_duplicates(['Account', vendor_column])
+            first_invoice_numbers = dict(zip(zip(first_invoices['Account'], first_invoices[vendor_column]),
+                                             first_invoices[invoice_number_column]))
 
             # Process ACH data
             self.update_signal.emit("Processing ACH data...")
-            ach_totals = {}
-            ach_nets = {}
-            current_account = None
-            account_totals = {}
-            current_net = 0
-
-            with open(self.ach_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['From Account'].strip():
-                        # Only save and reset when we find a new account
-                        new_account = row['From Account'].strip()
-                        if current_account and new_account != current_account:
-                            all_accounts.add(current_account)
-                            if current_account in ach_totals:
-                                for vendor, amount in account_totals.items():
-                                    ach_totals[current_account][vendor] = ach_totals[current_account].get(vendor, 0) + amount
-                                ach_nets[current_account] = ach_nets.get(current_account, 0) + current_net
-                            else:
-                                ach_totals[current_account] = account_totals.copy()
-                                ach_nets[current_account] = current_net
-                            account_totals = {}
-                            current_net = 0
-                        current_account = new_account
-                    elif row['Recipient Payment Amount'].strip():
-                        recipient = row['Recipient Name']
-                        amount_str = row['Recipient Payment Amount'].strip().replace('$', '').replace(',', '')
-                        amount = float(amount_str)
-
-                        if recipient in account_totals:
-                            account_totals[recipient] += amount
-                        else:
-                            account_totals[recipient] = amount
-                        current_net += amount
-
-            # Save the last account's totals
-            if current_account and account_totals:
-                all_accounts.add(current_account)
-                if current_account in ach_totals:
-                    for vendor, amount in account_totals.items():
-                        ach_totals[current_account][vendor] = ach_totals[current_account].get(vendor, 0) + amount
-                    ach_nets[current_account] = ach_nets.get(current_account, 0) + current_net
-                else:
-                    ach_totals[current_account] = account_totals.copy()
-                    ach_nets[current_account] = current_net
+            ach_cents = self.read_ach_payments()
+
+            ach_totals = {account: {recipient: cents / 100 for recipient, cents in recipients.items()}
+                          for account, recipients in ach_cents.items()}
+            ach_nets = {account: sum(recipients.values()) / 100 for account, recipients in ach_cents.items()}
+            all_accounts.update(ach_cents)
 
             # Compare and find discrepancies
             self.update_signal.emit("Comparing files and checking for discrepancies...")
@@ -486,7 +469,7 @@ class ReconcileThread(QThread):
 
                 # Extract the account name without the number for matching
                 account_name = ' '.join(account.split()[:-1])
-                available_balance = balances.get(account_name, 0)
+                available_balance = balances.get(account_name, 0) / 100
 
                 # Calculate total payment amount including WIRE/XFR
                 total_payment = ach_net + wire_xfr_net
@@ -500,7 +483,7 @@ class ReconcileThread(QThread):
 
                     # Check R365 against ACH
                     for vendor, r365_amount in r365_vendor_totals.items():
-                        ach_vendor = vendor_mapping_lower.get(vendor.lower(), vendor)
+                        ach_vendor = self.vendor_resolver.ach_name(vendor)
                         ach_amount = 0
                         for ach_v, amt in ach_vendor_totals.items():
                             if ach_v.lower() == ach_vendor.lower():
@@ -508,11 +491,7 @@ class ReconcileThread(QThread):
                                 break
 
                         if abs(r365_amount - ach_amount) > 0.001:
-                            invoice_number = ''
-                            vendor_data = r365_df[(r365_df[store_column].map(store_to_account) == account) &
-                                                (r365_df[vendor_column] == vendor)]
-                            if not vendor_data.empty:
-                                invoice_number = vendor_data[invoice_number_column].iloc[0]
+                            invoice_number = first_invoice_numbers.get((account, vendor), '')
 
                             bank_discrepancies.append({
                                 'Bank': account,
@@ -526,13 +505,8 @@ class ReconcileThread(QThread):
 
                     # Check ACH against R365
                     for ach_vendor, ach_amount in ach_vendor_totals.items():
-                        r365_vendor = ach_vendor
+                        r365_vendor = self.vendor_resolver.r365_name(ach_vendor)
                         r365_amount = 0
-                        for k, v in vendor_mapping_lower.items():
-                            if v.lower() == ach_vendor.lower():
-                                r365_vendor = next(orig_k for orig_k in self.vendor_name_mapping.keys()
-                                                if orig_k.lower() == k)
-                                break
                         for r365_v, amt in r365_vendor_totals.items():
                             if r365_v.lower() == r365_vendor.lower():
                                 r365_amount = amt
@@ -1,17 +1,21 @@
 """
 Auto-updater module for Joshs Overnight Oats application.
-Handles version checking and automatic updates with backup safety.
+Handles version checking and automatic updates with snapshot rollback.
 """
 
 import os
 import sys
+import json
+import hashlib
 import shutil
+import zipfile
+import tempfile
 import subprocess
 from typing import Optional, Dict, Any
 import requests
 from packaging import version
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QThread, pyqtSignal, QEventLoop
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import QThread, pyqtSignal
 import time
 import logging
 from pathlib import Path
@@ -21,6 +25,28 @@ OWNER = "JoshOats"
 REPO = "Joshs-Overnight-Oats"
 CURRENT_VERSION = "v1.2.37"
 UPDATE_TIMEOUT = 5
+# Override with a local stand-in (e.g. `python -m http.server` serving a copy of the
+# GitHub release JSON) to exercise the update check offline
+RELEASES_URL = os.environ.get(
+    "OVERNIGHT_OATS_RELEASES_URL",
+    f"https://api.github.com/repos/{OWNER}/{REPO}/releases/latest"
+)
+# Release metadata is reused without asking the server for this many seconds, then
+# revalidated with If-None-Match/If-Modified-Since, which costs a 304 when nothing changed
+MIN_CHECK_INTERVAL = int(os.environ.get("OVERNIGHT_OATS_UPDATE_INTERVAL", 6 * 60 * 60))
+RELEASE_CACHE = "release_cache.json"
+# Published next to the release zip by build_exe.py:
+#   {"archive": {"name", "size", "sha256"},
+#    "files": {path under app/: {"size", "sha256"}},
+#    "delta": {"name", "size", "sha256", "files": [paths changed since the previous release]}}
+# A copy is installed in the app directory so the next update knows what it put there.
+MANIFEST_ASSET = "manifest.json"
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+DOWNLOAD_RETRIES = 3
+# Previous versions of replaced files, one folder per update, under the app directory
+SNAPSHOTS_DIR = "snapshots"
+UPDATE_MARKER = "update_in_progress"
+SNAPSHOT_PRUNE_BUDGET = 2.0
 
 # Setup logging
 log_path = os.path.join(os.path.expanduser('~'), 'josh_oats_update.log')
@@ -30,259 +56,591 @@ logging.basicConfig(
     format='%(asctime)s - %(message)s'
 )
 
+def get_app_data_dir() -> str:
+    """Get the AppData directory where the app is installed"""
+    if os.name == 'nt':
+        app_dir = os.path.join(os.environ['LOCALAPPDATA'], "Joshs_Overnight_Oats")
+    else:
+        app_dir = os.path.join(str(Path.home()), '.local', 'share', "Joshs_Overnight_Oats")
+    return app_dir
+
+
+def load_release_cache(cache_path: str) -> Dict[str, Any]:
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_release_cache(cache_path: str, cache: Dict[str, Any]):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def get_release_metadata(url: str = None, min_interval: float = MIN_CHECK_INTERVAL,
+                         cache_path: str = None) -> Dict[str, Any]:
+    """
+    Latest release JSON from `url`, cached per URL in the app data dir. Within min_interval
+    of the last check the cached copy is returned without any request; after that the server
+    is asked conditionally and a 304 just refreshes the check time.
+    """
+    url = url or RELEASES_URL
+    cache_path = cache_path or os.path.join(get_app_data_dir(), RELEASE_CACHE)
+    cache = load_release_cache(cache_path)
+    entry = cache.get(url)
+
+    if entry and time.time() - entry['checked_at'] < min_interval:
+        logging.debug("Using cached release metadata")
+        return entry['release']
+
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    logging.debug("Checking for updates...")
+    response = requests.get(url, headers=headers, timeout=UPDATE_TIMEOUT)
+    if response.status_code == 304 and entry:
+        logging.debug("Release metadata not modified")
+        entry['checked_at'] = time.time()
+    else:
+        response.raise_for_status()
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'checked_at': time.time(),
+            'release': response.json(),
+        }
+        cache[url] = entry
+
+    try:
+        save_release_cache(cache_path, cache)
+    except OSError as e:
+        logging.warning(f"Could not save release cache: {e}")
+    return entry['release']
+
+
+def fetch_latest_release(url: str = None, current: str = CURRENT_VERSION,
+                         min_interval: float = MIN_CHECK_INTERVAL,
+                         cache_path: str = None) -> Optional[Dict[str, Any]]:
+    """Return the latest release if it is newer than `current` and has assets, otherwise None"""
+    release = get_release_metadata(url, min_interval, cache_path)
+
+    latest_version = version.parse(release['tag_name'].lstrip('v'))
+    current_version = version.parse(current.lstrip('v'))
+
+    logging.debug(f"Current version: {current_version}, Latest version: {latest_version}")
+
+    if latest_version > current_version and release.get('assets'):
+        return release
+    return None
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_asset(release: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    return next((asset for asset in release.get('assets', []) if asset.get('name') == name), None)
+
+
+def archive_asset(release: Dict[str, Any], manifest: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """The full release zip: the one the manifest names, else the first asset that isn't the manifest"""
+    name = (manifest or {}).get('archive', {}).get('name')
+    asset = find_asset(release, name) if name else None
+    if asset:
+        return asset
+    for asset in release['assets']:
+        if asset.get('name') != MANIFEST_ASSET:
+            return asset
+    raise ValueError("Release has no update archive")
+
+
+def fetch_manifest(release: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    asset = find_asset(release, MANIFEST_ASSET)
+    if asset is None:
+        return None
+    response = requests.get(asset['browser_download_url'], timeout=UPDATE_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def expected_sha256(release: Dict[str, Any], asset: Dict[str, Any], manifest: Optional[Dict[str, Any]]) -> str:
+    """Published SHA-256 of the archive, from the release manifest or else GitHub's asset digest"""
+    archive = (manifest or {}).get('archive', {})
+    if archive.get('sha256') and archive.get('name') in (None, asset.get('name')):
+        return archive['sha256'].lower()
+    digest = asset.get('digest') or ''
+    if digest.startswith('sha256:'):
+        return digest.split(':', 1)[1].lower()
+    raise ValueError(f"No published SHA-256 for {asset.get('name', 'update archive')} in {release['tag_name']}")
+
+
+def download_file(url: str, dest: str, sha256: str, progress=None) -> str:
+    """
+    Stream url to dest, verifying it against sha256. Data goes to dest.<sha256>.part first
+    and an interrupted download resumes from there with an HTTP Range request, both on retry
+    and on the next update attempt. Asset names repeat across releases, so the partial is
+    named after the hash it should end up with and partials of other releases are deleted
+    rather than resumed. progress(done, total) is called as chunks arrive.
+    """
+    part_path = f"{dest}.{sha256}.part"
+    if os.path.exists(dest) and sha256_file(dest) == sha256:
+        logging.debug("Update archive already downloaded")
+        return dest
+
+    folder, name = os.path.split(dest)
+    for entry in os.listdir(folder or '.'):
+        stale = os.path.join(folder, entry)
+        if entry.startswith(name + '.') and entry.endswith('.part') and stale != part_path:
+            logging.debug(f"Discarding partial download of another release: {entry}")
+            os.remove(stale)
+
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        done = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': f'bytes={done}-'} if done else {}
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=UPDATE_TIMEOUT) as response:
+                if response.status_code == 416:
+                    # Range past the end: the partial file is already complete (or bogus, which the hash catches)
+                    total = done
+                else:
+                    response.raise_for_status()
+                    if done and response.status_code != 206:
+                        logging.debug("Server ignored the range request, restarting download")
+                        done = 0
+                    length = int(response.headers.get('Content-Length') or 0)
+                    total = done + length if length else None
+
+                    with open(part_path, 'ab' if done else 'wb') as f:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            logging.warning(f"Download interrupted at {done} bytes (attempt {attempt}/{DOWNLOAD_RETRIES}): {e}")
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+
+    actual = sha256_file(part_path)
+    if actual != sha256:
+        os.remove(part_path)
+        raise ValueError(f"Update archive failed verification (expected SHA-256 {sha256}, got {actual})")
+
+    os.replace(part_path, dest)
+    logging.debug(f"Download complete and verified: {dest}")
+    return dest
+
+
+def file_matches(path: str, meta: Dict[str, Any]) -> bool:
+    """Whether the file at path has the size and SHA-256 recorded in a manifest entry"""
+    try:
+        if os.path.getsize(path) != meta['size']:
+            return False
+    except OSError:
+        return False
+    return sha256_file(path) == meta['sha256']
+
+
+def plan_update(app_dir: str, files: Dict[str, Dict[str, Any]]):
+    """
+    Compare the installed tree with a release's file manifest. Returns the paths whose
+    content differs and the paths the previous release installed that this one drops.
+    Files the app didn't install (logs, user data) are never listed for removal.
+    """
+    changed = [rel for rel, meta in files.items()
+               if not file_matches(os.path.join(app_dir, *rel.split('/')), meta)]
+
+    installed_files = {}
+    installed_manifest = os.path.join(app_dir, MANIFEST_ASSET)
+    if os.path.exists(installed_manifest):
+        try:
+            with open(installed_manifest) as f:
+                installed_files = json.load(f).get('files', {})
+        except (OSError, ValueError):
+            logging.warning("Installed manifest unreadable, not removing any files")
+    removed = [rel for rel in installed_files if rel not in files]
+    return changed, removed
+
+
+def stage_files(zip_path: str, staged_dir: str, wanted, files: Optional[Dict[str, Dict[str, Any]]]):
+    """
+    Extract app/<path> for each wanted path into staged_dir, checking each against the
+    manifest hash. wanted=None stages the whole app/ folder (releases without a file manifest).
+    """
+    if os.path.exists(staged_dir):
+        shutil.rmtree(staged_dir)
+    os.makedirs(staged_dir)
+
+    with zipfile.ZipFile(zip_path) as archive:
+        if wanted is None:
+            wanted = [name[len('app/'):] for name in archive.namelist()
+                      if name.startswith('app/') and not name.endswith('/')]
+        for rel in wanted:
+            target = os.path.join(staged_dir, *rel.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            digest = hashlib.sha256()
+            with archive.open('app/' + rel) as src, open(target, 'wb') as dst:
+                for block in iter(lambda: src.read(1 << 20), b''):
+                    digest.update(block)
+                    dst.write(block)
+            if files and digest.hexdigest() != files[rel]['sha256']:
+                raise ValueError(f"{rel} in the update archive does not match the release manifest")
+    return wanted
+
+
+def move_file(src: str, dst: str):
+    """Rename src to dst, creating dst's folder. Same volume, so no data is copied."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    os.replace(src, dst)
+
+
+def create_snapshot(app_dir: str, staged, removed) -> str:
+    """
+    Start a snapshot for an update that replaces the staged paths and deletes the removed
+    ones. Only the journal is written here; activate_update moves the old files in.
+    """
+    root = os.path.join(app_dir, SNAPSHOTS_DIR)
+    os.makedirs(root, exist_ok=True)
+    snapshot_dir = tempfile.mkdtemp(prefix=f"{CURRENT_VERSION}-{time.strftime('%Y%m%d-%H%M%S')}-", dir=root)
+    new_dirs = set()
+    for rel in staged:
+        parts = rel.split('/')[:-1]
+        for depth in range(1, len(parts) + 1):
+            if not os.path.isdir(os.path.join(app_dir, *parts[:depth])):
+                new_dirs.add('/'.join(parts[:depth]))
+    journal = {
+        'staged': list(staged),
+        'removed': list(removed),
+        # Paths that existed before the update, i.e. the ones rollback has to bring back
+        'existing': [rel for rel in list(staged) + list(removed)
+                     if os.path.exists(os.path.join(app_dir, *rel.split('/')))],
+        # Folders the update creates, which rollback removes again once they are empty
+        'new_dirs': sorted(new_dirs),
+    }
+    with open(os.path.join(snapshot_dir, 'journal.json'), 'w') as f:
+        json.dump(journal, f)
+    return snapshot_dir
+
+
+def activate_update(app_dir: str, staged_dir: str, snapshot_dir: str):
+    """
+    Swap the staged files into the install. Current versions are renamed into the snapshot
+    first, then staged files are renamed into place, so the update costs only the changed
+    files and the running app keeps its open handles. Rolls back if any step fails.
+    """
+    with open(os.path.join(snapshot_dir, 'journal.json')) as f:
+        journal = json.load(f)
+    marker_path = os.path.join(app_dir, UPDATE_MARKER)
+    with open(marker_path, 'w') as f:
+        f.write(snapshot_dir)
+
+    try:
+        for rel in journal['existing']:
+            move_file(os.path.join(app_dir, *rel.split('/')), os.path.join(snapshot_dir, *rel.split('/')))
+        for rel in journal['staged']:
+            move_file(os.path.join(staged_dir, *rel.split('/')), os.path.join(app_dir, *rel.split('/')))
+    except Exception:
+        logging.exception("Activating update failed, rolling back")
+        rollback_snapshot(app_dir, snapshot_dir)
+        raise
+
+    os.remove(marker_path)
+
+
+def rollback_snapshot(app_dir: str, snapshot_dir: str):
+    """Undo a full or partial activate_update from its snapshot journal"""
+    with open(os.path.join(snapshot_dir, 'journal.json')) as f:
+        journal = json.load(f)
+    existing = set(journal['existing'])
+
+    for rel in journal['staged'] + journal['removed']:
+        target = os.path.join(app_dir, *rel.split('/'))
+        saved = os.path.join(snapshot_dir, *rel.split('/'))
+        if os.path.exists(saved):
+            move_file(saved, target)
+        elif rel not in existing and os.path.exists(target):
+            # Added by the update
+            os.remove(target)
+
+    # Deepest first, so a folder's new subfolders are gone before it is checked
+    for rel in sorted(journal.get('new_dirs', []), key=lambda rel: rel.count('/'), reverse=True):
+        try:
+            os.rmdir(os.path.join(app_dir, *rel.split('/')))
+        except OSError:
+            # Already gone, or holds files the update didn't install
+            pass
+
+    marker_path = os.path.join(app_dir, UPDATE_MARKER)
+    if os.path.exists(marker_path):
+        os.remove(marker_path)
+    logging.info(f"Rolled back to snapshot {os.path.basename(snapshot_dir)}")
+
+
+def prune_snapshots(app_dir: str, keep: int = 1, budget: float = SNAPSHOT_PRUNE_BUDGET):
+    """
+    Delete all but the newest `keep` snapshots, giving up after `budget` seconds. Snapshots
+    are renamed to *.trash before deletion, so a partly deleted one is never rolled back to
+    and the next call picks up where this one stopped.
+    """
+    root = os.path.join(app_dir, SNAPSHOTS_DIR)
+    if not os.path.isdir(root):
+        return
+    deadline = time.monotonic() + budget
+
+    snapshots = sorted((entry for entry in os.scandir(root) if entry.is_dir() and not entry.name.endswith('.trash')),
+                       key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in snapshots[keep:]:
+        os.replace(entry.path, entry.path + '.trash')
+
+    for entry in os.scandir(root):
+        if not entry.name.endswith('.trash'):
+            continue
+        for dirpath, dirnames, filenames in os.walk(entry.path, topdown=False):
+            for name in filenames:
+                if time.monotonic() > deadline:
+                    logging.debug("Snapshot cleanup out of time, continuing next launch")
+                    return
+                try:
+                    os.remove(os.path.join(dirpath, name))
+                except OSError:
+                    # Still in use, e.g. the previous exe right after an update
+                    pass
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
 class UpdaterThread(QThread):
-    update_found = pyqtSignal()
+    """Checks for a newer release without touching the install"""
+    update_found = pyqtSignal(dict)
     no_update_needed = pyqtSignal()
     error_occurred = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, url: str = None):
         super().__init__()
-        self.release_data: Optional[Dict[str, Any]] = None
+        self.url = url
 
     def run(self):
         try:
-            if self.check_for_updates():
-                self.update_found.emit()
-                self.perform_update()
-            else:
-                self.no_update_needed.emit()
+            prune_snapshots(get_app_data_dir())
+        except Exception:
+            logging.exception("Snapshot cleanup failed")
+
+        try:
+            release = fetch_latest_release(self.url)
         except Exception as e:
-            logging.exception("Error in update thread")
+            logging.error(f"Update check failed: {e}")
             self.error_occurred.emit(str(e))
             self.no_update_needed.emit()
+            return
+
+        if release:
+            self.update_found.emit(release)
+        else:
+            self.no_update_needed.emit()
+
+
+class InstallerThread(QThread):
+    """Downloads a release and hands over to the install script, which restarts the app"""
+    progress = pyqtSignal(str, int)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, release_data: Dict[str, Any]):
+        super().__init__()
+        self.release_data = release_data
 
-    def check_for_updates(self) -> bool:
+    def run(self):
         try:
-            logging.debug("Checking for updates...")
-            response = requests.get(
-                f"https://api.github.com/repos/{OWNER}/{REPO}/releases/latest",
-                timeout=UPDATE_TIMEOUT
-            )
-            response.raise_for_status()
-            release = response.json()
-
-            latest_version = version.parse(release['tag_name'].lstrip('v'))
-            current_version = version.parse(CURRENT_VERSION.lstrip('v'))
-
-            logging.debug(f"Current version: {current_version}, Latest version: {latest_version}")
-
-            if latest_version > current_version and release.get('assets'):
-                self.release_data = release
-                return True
-            return False
+            self.perform_update()
         except Exception as e:
-            logging.error(f"Update check failed: {e}")
-            return False
+            self.error_occurred.emit(str(e))
 
-    def get_app_data_dir(self) -> str:
-        """Get the AppData directory where the app is installed"""
-        if os.name == 'nt':
-            app_dir = os.path.join(os.environ['LOCALAPPDATA'], "Joshs_Overnight_Oats")
+    def report_download(self, done: int, total: Optional[int]):
+        if total:
+            self.progress.emit(f"Downloading update... {done / total:.0%}", int(done * 100 / total))
+        else:
+            self.progress.emit(f"Downloading update... {done // 1024} KB", 0)
+
+    def choose_archive(self, manifest: Optional[Dict[str, Any]], changed):
+        """The delta zip when it holds every changed file, otherwise the full release zip"""
+        delta = (manifest or {}).get('delta')
+        if delta and changed is not None and set(changed) <= set(delta['files']):
+            asset = find_asset(self.release_data, delta['name'])
+            if asset:
+                return asset, delta['sha256'].lower()
+        asset = archive_asset(self.release_data, manifest)
+        return asset, expected_sha256(self.release_data, asset, manifest)
+
+    def download_update(self, app_dir: str, temp_dir: str):
+        """
+        Download and verify only what this install is missing and stage it under temp_dir/staged.
+        Returns the staged paths and the installed paths the release drops. temp_dir is kept
+        between attempts.
+        """
+        os.makedirs(temp_dir, exist_ok=True)
+        manifest = fetch_manifest(self.release_data)
+        files = (manifest or {}).get('files')
+
+        if files is not None:
+            self.progress.emit("Comparing installed files...", 0)
+            changed, removed = plan_update(app_dir, files)
+            logging.info(f"{len(changed)} of {len(files)} files changed, {len(removed)} removed")
         else:
-            app_dir = os.path.join(str(Path.home()), '.local', 'share', "Joshs_Overnight_Oats")
-        return app_dir
+            changed, removed = None, []
+
+        asset, sha256 = self.choose_archive(manifest, changed)
+        download_url = asset['browser_download_url']
+        logging.debug(f"Downloading from: {download_url} ({asset.get('size', 'unknown')} bytes)")
+        self.progress.emit("Downloading update...", 0)
+        update_zip = download_file(download_url, os.path.join(temp_dir, asset.get('name') or 'update.zip'),
+                                   sha256, progress=self.report_download)
+
+        self.progress.emit("Verifying update...", 100)
+        staged_dir = os.path.join(temp_dir, 'staged')
+        staged = stage_files(update_zip, staged_dir, changed, files)
+        if manifest is not None and files is not None:
+            with open(os.path.join(staged_dir, MANIFEST_ASSET), 'w') as f:
+                json.dump(manifest, f)
+            staged.append(MANIFEST_ASSET)
+
+        self.progress.emit("Update verified", 100)
+        return staged, removed
 
     def perform_update(self):
-        try:
-            logging.info("Starting update process...")
-            if not self.release_data:
-                raise ValueError("No release data available")
-
-            app_dir = self.get_app_data_dir()
-            temp_dir = os.path.join(app_dir, 'temp_update')
-            backup_dir = os.path.join(app_dir, 'backup')
-
-            logging.debug(f"App directory: {app_dir}")
-            logging.debug(f"Temp directory: {temp_dir}")
-            logging.debug(f"Backup directory: {backup_dir}")
-
-            # Create backup before starting update
-            logging.info("Creating backup before update...")
-            if os.path.exists(backup_dir):
-                shutil.rmtree(backup_dir)
-            shutil.copytree(app_dir, backup_dir, ignore=shutil.ignore_patterns('temp_update', 'backup'))
-
-            # Create backup completion marker
-            with open(os.path.join(backup_dir, 'backup_complete'), 'w') as f:
-                f.write(str(time.time()))
-
-            # Create update marker
-            with open(os.path.join(app_dir, 'update_in_progress'), 'w') as f:
-                f.write(str(time.time()))
-
-            # Create temp directory
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            os.makedirs(temp_dir)
-
-            # Download update
-            download_url = self.release_data['assets'][0]['browser_download_url']
-            update_zip = os.path.join(temp_dir, 'update.zip')
-            logging.debug(f"Downloading from: {download_url}")
-
-            response = requests.get(download_url, timeout=UPDATE_TIMEOUT)
-            response.raise_for_status()
-
-            with open(update_zip, 'wb') as f:
-                f.write(response.content)
-            logging.debug("Download complete")
-
-            # Create batch script
-            batch_path = os.path.join(temp_dir, 'updater.bat')
-            batch_content = f'''@echo off
+        logging.info("Starting update process...")
+        if not self.release_data:
+            raise ValueError("No release data available")
+
+        app_dir = get_app_data_dir()
+        temp_dir = os.path.join(app_dir, 'temp_update')
+        staged_dir = os.path.join(temp_dir, 'staged')
+        logging.debug(f"App directory: {app_dir}")
+        logging.debug(f"Temp directory: {temp_dir}")
+
+        # Nothing in the install changes until the update is downloaded, verified and staged
+        staged, removed = self.download_update(app_dir, temp_dir)
+
+        self.progress.emit("Installing update...", 100)
+        snapshot_dir = create_snapshot(app_dir, staged, removed)
+        logging.info(f"Installing {len(staged)} files, snapshot in {snapshot_dir}")
+        activate_update(app_dir, staged_dir, snapshot_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+        # The install script only restarts the app once this process is gone
+        batch_path = os.path.join(app_dir, 'restart_after_update.bat')
+        batch_content = f'''@echo off
 title Installing Update - Josh's Overnight Oats
 cd /d "{app_dir}"
 
-echo Installing update...
-echo Please wait...
-
-rem Kill running process
+echo Restarting application...
 taskkill /F /IM "Joshs_Overnight_Oats.exe" >nul 2>&1
 timeout /t 2 /nobreak >nul
+start "" "Joshs_Overnight_Oats.exe"
+(goto) 2>nul & del "%~f0"
+'''
 
-rem Remove current files (except temp, backup and markers)
-for %%i in (*) do (
-    if not "%%i"=="temp_update" if not "%%i"=="backup" if not "%%i"=="update_in_progress" (
-        if exist "%%i" (
-            if /I not "%%~nxi"=="Joshs_Overnight_Oats.exe" (
-                del /F /Q "%%i" >nul 2>&1
-            )
+        with open(batch_path, 'w', encoding='utf-8') as f:
+            f.write(batch_content)
+
+        logging.info("Launching restart script")
+        subprocess.Popen(
+            ['cmd', '/c', batch_path],
+            creationflags=subprocess.CREATE_NEW_CONSOLE
         )
+        time.sleep(1)
+        logging.info("Restart script launched, exiting application")
+        os._exit(0)
+
+
+def recover_interrupted_update():
+    """Roll back an update whose activation never finished. Local disk only, so safe at startup."""
+    try:
+        app_dir = get_app_data_dir()
+        marker_path = os.path.join(app_dir, UPDATE_MARKER)
+        if not os.path.exists(marker_path):
+            return
+
+        logging.warning("Detected interrupted update, attempting recovery")
+        with open(marker_path) as f:
+            snapshot_dir = f.read().strip()
+        if os.path.exists(os.path.join(snapshot_dir, 'journal.json')):
+            rollback_snapshot(app_dir, snapshot_dir)
+            logging.info("Recovery completed successfully")
+        else:
+            os.remove(marker_path)
+    except Exception:
+        logging.exception("Error recovering interrupted update")
+
+
+# Threads started by start_background_check, kept referenced until they finish
+_running_threads = []
+
+
+def _keep_until_finished(thread: QThread):
+    _running_threads.append(thread)
+    thread.finished.connect(lambda: _running_threads.remove(thread))
+    thread.start()
+
+
+def prompt_restart_to_update(release: Dict[str, Any]):
+    """Offer to install a newer release; the install script restarts the app when done"""
+    answer = QMessageBox.question(
+        QApplication.activeWindow(),
+        "Update Available",
+        f"Version {release['tag_name']} is available (you have {CURRENT_VERSION}).\n\n"
+        "Restart now to update?",
+        QMessageBox.Yes | QMessageBox.No,
+        QMessageBox.Yes
     )
-)
-for /D %%i in (*) do (
-    if not "%%i"=="temp_update" if not "%%i"=="backup" (
-        rmdir /S /Q "%%i" >nul 2>&1
-    )
-)
+    if answer != QMessageBox.Yes:
+        logging.info(f"Update to {release['tag_name']} postponed")
+        return
 
-rem Extract update
-echo Extracting update...
-powershell -Command "Expand-Archive -Force '{update_zip}' '{app_dir}\\temp_extract'" >nul 2>&1
-
-rem Copy files from temp_extract/app
-xcopy /S /E /H /Y "temp_extract\\app\\*" "." >nul 2>&1
-
-rem Check if update was successful
-if exist "Joshs_Overnight_Oats.exe" (
-    echo Update completed successfully!
-    del /F /Q "update_in_progress" >nul 2>&1
-    rmdir /S /Q backup >nul 2>&1
-    rmdir /S /Q temp_update >nul 2>&1
-    rmdir /S /Q temp_extract >nul 2>&1
-    echo Starting application...
-    start "" "Joshs_Overnight_Oats.exe"
-) else (
-    echo Update failed - restoring previous version...
-    xcopy /S /E /H /Y "backup\\*" "." >nul 2>&1
-    del /F /Q "update_in_progress" >nul 2>&1
-    rmdir /S /Q backup >nul 2>&1
-    rmdir /S /Q temp_update >nul 2>&1
-    rmdir /S /Q temp_extract >nul 2>&1
-    start "" "Joshs_Overnight_Oats.exe"
-)
-exit'''
+    from update_window import UpdateWindow
+    window = UpdateWindow()
+    window.show()
 
-            with open(batch_path, 'w', encoding='utf-8') as f:
-                f.write(batch_content)
+    installer = InstallerThread(release)
+    installer.progress.connect(window.update_status)
+    installer.error_occurred.connect(lambda msg: (
+        window.close(), QMessageBox.warning(QApplication.activeWindow(), "Update Failed", msg)))
+    installer.window = window
+    _keep_until_finished(installer)
 
-            # Execute update script
-            logging.info("Launching update script")
-            subprocess.Popen(
-                ['cmd', '/c', batch_path],
-                creationflags=subprocess.CREATE_NEW_CONSOLE
-            )
-            time.sleep(1)
-            logging.info("Update script launched, exiting application")
-            os._exit(0)
 
-        except Exception as e:
-            # If anything fails during update prep, clean up and restore
-            logging.exception("Update failed")
-            marker_path = os.path.join(app_dir, 'update_in_progress')
-            if os.path.exists(marker_path):
-                os.remove(marker_path)
-            if os.path.exists(backup_dir) and os.path.exists(os.path.join(backup_dir, 'backup_complete')):
-                try:
-                    # Restore from backup
-                    for item in os.listdir(app_dir):
-                        if item != 'backup':
-                            item_path = os.path.join(app_dir, item)
-                            if os.path.isfile(item_path):
-                                os.remove(item_path)
-                            elif os.path.isdir(item_path):
-                                shutil.rmtree(item_path)
-
-                    # Copy backup files back
-                    for item in os.listdir(backup_dir):
-                        src = os.path.join(backup_dir, item)
-                        dst = os.path.join(app_dir, item)
-                        if os.path.isfile(src):
-                            shutil.copy2(src, dst)
-                        elif os.path.isdir(src):
-                            shutil.copytree(src, dst)
-                finally:
-                    # Clean up backup
-                    shutil.rmtree(backup_dir)
-            raise
-
-def check_and_update():
-    """Check for updates and handle the update process."""
-    try:
-        app = QApplication.instance()
-        if app is None:
-            app = QApplication(sys.argv)
-
-        # Check for interrupted update
-        app_dir = UpdaterThread().get_app_data_dir()
-        marker_path = os.path.join(app_dir, 'update_in_progress')
-        backup_dir = os.path.join(app_dir, 'backup')
-
-        if os.path.exists(marker_path):
-            logging.warning("Detected interrupted update, attempting recovery")
-            if os.path.exists(backup_dir) and os.path.exists(os.path.join(backup_dir, 'backup_complete')):
-                try:
-                    # Restore from backup
-                    for item in os.listdir(app_dir):
-                        if item != 'backup':
-                            item_path = os.path.join(app_dir, item)
-                            if os.path.isfile(item_path):
-                                os.remove(item_path)
-                            elif os.path.isdir(item_path):
-                                shutil.rmtree(item_path)
-
-                    # Copy backup files back
-                    for item in os.listdir(backup_dir):
-                        src = os.path.join(backup_dir, item)
-                        dst = os.path.join(app_dir, item)
-                        if os.path.isfile(src):
-                            shutil.copy2(src, dst)
-                        elif os.path.isdir(src):
-                            shutil.copytree(src, dst)
-
-                    logging.info("Recovery completed successfully")
-                finally:
-                    # Clean up markers and backup
-                    if os.path.exists(marker_path):
-                        os.remove(marker_path)
-                    if os.path.exists(backup_dir):
-                        shutil.rmtree(backup_dir)
-                return False
-
-        updater = UpdaterThread()
-        loop = QEventLoop()
-
-        updater.update_found.connect(lambda: None)
-        updater.no_update_needed.connect(loop.quit)
-        updater.error_occurred.connect(lambda msg: logging.error(f"Update error: {msg}"))
-
-        updater.start()
-        loop.exec_()
+def start_background_check(url: str = None) -> UpdaterThread:
+    """
+    Check for updates on a worker thread and prompt when one is found. Call once the UI
+    is up; a slow or offline network only delays the prompt, never the app.
+    """
+    updater = UpdaterThread(url)
+    updater.update_found.connect(prompt_restart_to_update)
+    updater.error_occurred.connect(lambda msg: logging.error(f"Update error: {msg}"))
+
+    # Don't let Qt tear down a thread that is still waiting on the network
+    app = QApplication.instance()
+    if app is not None:
+        app.aboutToQuit.connect(lambda: updater.wait(UPDATE_TIMEOUT * 1000))
+
+    _keep_until_finished(updater)
+    return updater
 
-        return False
-    except Exception as e:
-        logging.exception("Error in check_and_update")
-        return False
 
 if __name__ == "__main__":
-    check_and_update()
+    # Check against RELEASES_URL and print the result, e.g. with
+    # OVERNIGHT_OATS_RELEASES_URL=http://localhost:8000/latest.json. Always revalidates.
+    release = fetch_latest_release(sys.argv[1] if len(sys.argv) > 1 else None, min_interval=0)
+    print(f"Update available: {release['tag_name']}" if release else f"Up to date ({CURRENT_VERSION})")
@@ -0,0 +1,211 @@
+"""
+Throughput and memory benchmark for the pipelines.
+
+Generates a synthetic month (see synthetic_data.py) at each scale and runs every pipeline
+on it headlessly, each in its own process so peak memory is that pipeline's alone:
+
+    python benchmark.py --scales 1 10 100
+    python benchmark.py tips_reconcile royalties_process --scales 1 10 --steps
+
+Reports, per pipeline and scale: input rows and MB, seconds, rows/s, MB/s and peak
+memory. --steps also lists the slowest stages of each run, timed between the progress
+messages the pipeline emits. Generated data is kept in --data-dir and reused while its
+manifest matches.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from datetime import datetime
+
+from cli import PIPELINES, run_pipeline
+
+DEFAULT_SCALES = [1, 10, 100]
+
+
+def peak_memory():
+    """Peak resident memory of this process so far, in bytes"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize
+
+    # Linux keeps ru_maxrss across exec, so a child would report its parent's peak;
+    # VmHWM starts afresh with each program
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_child(manifest_path, pipeline, result_path, output_dir):
+    """Run one pipeline from a manifest in this process and write its timings to result_path"""
+    with open(manifest_path) as f:
+        entry = json.load(f)["pipelines"][pipeline]
+
+    args = argparse.Namespace(files=[], output_dir=output_dir, output_file=None,
+                              time_entries=None, payroll_dict=None, tips=None)
+    vars(args).update(entry["args"])
+    os.makedirs(output_dir, exist_ok=True)
+
+    steps = []
+    start = time.perf_counter()
+
+    def emit(event, message="", **fields):
+        steps.append((time.perf_counter() - start, message))
+
+    # Imports count toward the baseline, not the run
+    baseline = peak_memory()
+    try:
+        success, message, _ = run_pipeline(PIPELINES[pipeline][1](args), emit)
+    except Exception as e:
+        success, message = False, f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    # Each step lasts from its progress message until the next one
+    marks = steps + [(elapsed, None)]
+    result = {
+        "success": success,
+        "message": message,
+        "elapsed": elapsed,
+        "peak_memory": peak_memory(),
+        "baseline_memory": baseline,
+        "steps": [{"message": text, "elapsed": marks[i + 1][0] - at} for i, (at, text) in enumerate(steps)],
+    }
+    with open(result_path, "w") as f:
+        json.dump(result, f)
+    return 0 if success else 1
+
+
+def prepare_data(data_dir, scale, month, seed):
+    """Generate the month at this scale, or reuse it; returns (manifest path, seconds spent generating)"""
+    from synthetic_data import generate
+
+    folder = os.path.join(data_dir, f"scale_{scale:g}")
+    manifest_path = os.path.join(folder, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if (manifest["scale"], manifest["month"], manifest["seed"]) == (scale, month, seed):
+            return manifest_path, 0.0
+
+    start = time.perf_counter()
+    generate(folder, scale, month, seed)
+    return manifest_path, time.perf_counter() - start
+
+
+def benchmark(pipeline, manifest_path, output_dir, timeout):
+    """Run one pipeline in a child process and return its result dict"""
+    result_path = os.path.join(output_dir, f"{pipeline}.json")
+    if os.path.exists(result_path):
+        os.remove(result_path)
+    command = [sys.executable, os.path.abspath(__file__), "--child", manifest_path, pipeline,
+               result_path, os.path.join(output_dir, pipeline)]
+    try:
+        # Pipelines print as they go; only their errors are kept
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"success": False, "message": f"Timed out after {timeout}s"}
+
+    if not os.path.exists(result_path):
+        lines = completed.stderr.strip().splitlines()
+        return {"success": False, "message": lines[-1] if lines else f"Exited with code {completed.returncode}"}
+    with open(result_path) as f:
+        return json.load(f)
+
+
+def format_row(row):
+    mb = row["bytes"] / 1e6
+    if "elapsed" not in row:
+        return f"{row['pipeline']:20} {row['scale']:>6g} {row['rows']:>10} {mb:>9.1f} {'':>9} {'':>11} {'':>8} {'':>9}  {row['message']}"
+    seconds = max(row["elapsed"], 1e-9)
+    status = "ok" if row["success"] else f"FAILED: {row['message']}"
+    return (f"{row['pipeline']:20} {row['scale']:>6g} {row['rows']:>10} {mb:>9.1f} {seconds:>9.2f} "
+            f"{row['rows'] / seconds:>11,.0f} {mb / seconds:>8.2f} {row['peak_memory'] / 1e6:>9.0f}  {status}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time each pipeline on synthetic months of increasing size.")
+    parser.add_argument("pipelines", nargs="*", metavar="pipeline",
+                        help=f"pipelines to run (default: all of {', '.join(PIPELINES)})")
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES,
+                        help="multiples of a real month to run at (default: 1 10 100)")
+    parser.add_argument("--month", default="2024-09", help="month to generate, as YYYY-MM")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generated data")
+    parser.add_argument("--data-dir", default="benchmark_data", help="where generated inputs are kept")
+    parser.add_argument("--output-dir", help="where pipeline outputs and results go (default: <data-dir>/runs)")
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds before a run is abandoned")
+    parser.add_argument("--steps", action="store_true", help="show the slowest steps of each run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--child"]:
+        return run_child(*argv[1:5])
+
+    args = build_parser().parse_args(argv)
+    unknown = [name for name in args.pipelines if name not in PIPELINES]
+    if unknown:
+        print(f"Unknown pipelines: {', '.join(unknown)}")
+        return 2
+    pipelines = args.pipelines or list(PIPELINES)
+    runs_dir = args.output_dir or os.path.join(args.data_dir, "runs")
+
+    if not args.json:
+        print(f"{'pipeline':20} {'scale':>6} {'rows':>10} {'MB':>9} {'seconds':>9} "
+              f"{'rows/s':>11} {'MB/s':>8} {'peak MB':>9}  status")
+
+    failed = False
+    for scale in args.scales:
+        manifest_path, generated = prepare_data(args.data_dir, scale, args.month, args.seed)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if generated and not args.json:
+            print(f"{'(generate)':20} {scale:>6g} {'':>10} {'':>9} {generated:>9.2f}")
+
+        output_dir = os.path.join(runs_dir, f"scale_{scale:g}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(output_dir, exist_ok=True)
+        for pipeline in pipelines:
+            entry = manifest["pipelines"][pipeline]
+            row = {"pipeline": pipeline, "scale": scale, "rows": entry["rows"], "bytes": entry["bytes"],
+                   **benchmark(pipeline, manifest_path, output_dir, args.timeout)}
+            failed = failed or not row["success"]
+
+            if args.json:
+                print(json.dumps(row), flush=True)
+                continue
+            print(format_row(row), flush=True)
+            if args.steps and row.get("steps"):
+                for step in sorted(row["steps"], key=lambda s: s["elapsed"], reverse=True)[:5]:
+                    text = next(iter(str(step["message"]).strip().splitlines()), "")
+                    print(f"{'':27}{step['elapsed']:>9.2f}s  {text[:80]}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
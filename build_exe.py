@@ -8,19 +8,39 @@ import sys
 import shutil
 import platform
 import zipfile
+import json
+import hashlib
+import argparse
 from typing import List
 from pathlib import Path
 import PyInstaller.__main__
 
 # Constants
 APP_NAME = "Joshs_Overnight_Oats"
+# Uploaded with the zip on each release; auto_updater verifies downloads against it
+# and uses its per-file hashes to fetch only what changed
+MANIFEST_NAME = "manifest.json"
+DELTA_ZIP_NAME = f"{APP_NAME}_delta.zip"
 HIDDEN_IMPORTS = [
     'PyQt5', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets', 'PyQt5.sip',
-    'requests', 'auto_updater', 'future_projects', 'retro_style'
+    'requests', 'auto_updater', 'future_projects', 'retro_style',
+    # Feature windows imported lazily through main_window.WINDOW_REGISTRY
+    'ap_process', 'cnb_transfer_je', 'due_to_from_window', 'toast_reconcile_window', 'ap_reconcile',
+    'tips_reconcile', 'px_processor', 'grubhub_window', 'doordash_window', 'ubereats_window',
+    'royalties_window', 'payroll_window'
 ]
 
+def sha256_file(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 class BuildManager:
-    def __init__(self):
+    def __init__(self, base_manifest=None):
+        self.base_manifest = Path(base_manifest) if base_manifest else None
         self.script_dir = Path(os.path.dirname(os.path.abspath(__file__)))
         self.dist_dir = self.script_dir / 'dist'
         self.build_dir = self.script_dir / 'build'
@@ -276,6 +296,62 @@ if __name__ == '__main__':
             print(f"Error creating ZIP file: {e}")
             raise
 
+        self.write_release_manifest(zip_path)
+
+    def write_release_manifest(self, zip_path: Path):
+        """
+        Record the release zip and every installed file's size and SHA-256. With a base
+        manifest from the previous release, also build a delta zip of the files that changed.
+        """
+        app_dir = self.dist_dir / APP_NAME / 'app'
+        files = {}
+        for file_path in sorted(app_dir.rglob('*')):
+            if file_path.is_file():
+                files[file_path.relative_to(app_dir).as_posix()] = {
+                    'size': file_path.stat().st_size,
+                    'sha256': sha256_file(file_path),
+                }
+
+        manifest = {
+            'archive': {
+                'name': zip_path.name,
+                'size': zip_path.stat().st_size,
+                'sha256': sha256_file(zip_path),
+            },
+            'files': files,
+        }
+
+        if self.base_manifest:
+            manifest['delta'] = self.create_delta_zip(app_dir, files)
+
+        manifest_path = self.script_dir / MANIFEST_NAME
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        uploads = [zip_path.name] + ([DELTA_ZIP_NAME] if self.base_manifest else [])
+        print(f"Wrote {manifest_path} - upload it with {', '.join(uploads)}")
+
+    def create_delta_zip(self, app_dir: Path, files: dict) -> dict:
+        """Zip the files that differ from the base manifest, laid out like the full zip's app/ folder."""
+        with open(self.base_manifest) as f:
+            base_files = json.load(f).get('files', {})
+
+        changed = [rel for rel, meta in files.items() if base_files.get(rel, {}).get('sha256') != meta['sha256']]
+        delta_path = self.script_dir / DELTA_ZIP_NAME
+        with zipfile.ZipFile(delta_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for rel in changed:
+                zipf.write(app_dir / rel, f'app/{rel}')
+        print(f"Delta package: {len(changed)} of {len(files)} files changed, "
+              f"{delta_path.stat().st_size / 1024:.0f} KB")
+
+        return {
+            'name': DELTA_ZIP_NAME,
+            'size': delta_path.stat().st_size,
+            'sha256': sha256_file(delta_path),
+            'files': changed,
+        }
+
 if __name__ == "__main__":
-    builder = BuildManager()
+    parser = argparse.ArgumentParser(description=f"Build {APP_NAME}")
+    parser.add_argument('--base-manifest', help="manifest.json of the previous release, to also build a delta zip")
+    builder = BuildManager(parser.parse_args().base_manifest)
     builder.build()
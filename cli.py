@@ -0,0 +1,221 @@
+"""
+Headless runner for the accounting pipelines.
+
+Runs the same worker thread a window would start, but synchronously in this process
+and without a Qt event loop, printing progress to stdout as text or JSON lines:
+
+    python cli.py tips_reconcile Knock.xlsx itemized.csv ... --output-file out.xlsx --json
+    python cli.py --list
+
+Each run is an ordinary process, so several pipelines can run side by side.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+from datetime import datetime
+
+DOWNLOADS = os.path.join(os.path.expanduser('~'), 'Downloads')
+
+
+def build_ap_process(args):
+    from ap_process import APProcessThread
+    return APProcessThread(args.files, args.output_dir or DOWNLOADS)
+
+
+def build_cnb_transfer_je(args):
+    from cnb_transfer_je import TransferThread
+    return TransferThread(args.files, args.output_dir or DOWNLOADS)
+
+
+def build_due_to_from(args):
+    from due_to_from_window import AnalysisThread
+    if len(args.files) != 1:
+        raise ValueError("Due To/From analysis takes exactly one input file")
+    # Same dated subfolder the window creates
+    today = datetime.now().strftime('%m%d%Y')
+    output_subdir = os.path.join(args.output_dir or DOWNLOADS, f"Due_to_from_{today}")
+    os.makedirs(output_subdir, exist_ok=True)
+    return AnalysisThread(args.files[0], output_subdir)
+
+
+def build_toast_reconcile(args):
+    from toast_reconcile_window import ReconcileThread
+    return ReconcileThread(args.files, args.output_dir or DOWNLOADS)
+
+
+def build_ap_reconcile(args):
+    from ap_reconcile import ReconcileThread, categorize_reconcile_files
+    r365_file, ach_file, balance_file = categorize_reconcile_files(args.files)
+    if not (r365_file and ach_file and balance_file):
+        raise ValueError("AP reconciliation needs one balance CSV, one file starting with 'Ach' and one R365 CSV")
+    return ReconcileThread(r365_file, ach_file, balance_file, args.output_dir or DOWNLOADS)
+
+
+def build_tips_reconcile(args):
+    from tips_reconcile import TipsReconcileThread
+    current_date = datetime.now().strftime("%m%d%Y")
+    output_file = args.output_file or os.path.join(args.output_dir or DOWNLOADS,
+                                                   f"Tips_Reconciliation_{current_date}.xlsx")
+    return TipsReconcileThread(args.files, output_file)
+
+
+def build_px_giftcards(args):
+    from px_processor import ProcessThread
+    return ProcessThread(args.files, args.output_dir)
+
+
+def build_grubhub_process(args):
+    from grubhub_window import GrubHubProcessThread, categorize_grubhub_files
+    grubhub_file, order_files = categorize_grubhub_files(args.files)
+    if not grubhub_file:
+        raise ValueError("No GrubHub transaction file given")
+    return GrubHubProcessThread(grubhub_file, order_files, args.output_dir)
+
+
+def build_doordash_process(args):
+    from doordash_window import DoorDashProcessThread, categorize_doordash_files
+    doordash_files, toast_files = categorize_doordash_files(args.files)
+    if not doordash_files:
+        raise ValueError("No DoorDash transaction files given")
+    return DoorDashProcessThread(doordash_files, toast_files, args.output_dir)
+
+
+def build_ubereats_process(args):
+    from ubereats_window import UberEatsProcessThread
+    return UberEatsProcessThread(args.files, args.output_dir)
+
+
+def build_royalties_process(args):
+    from royalties_processor import RoyaltiesProcessThread
+    return RoyaltiesProcessThread(args.files, args.output_dir or DOWNLOADS)
+
+
+def build_payroll_automation(args):
+    from payroll_automation import PayrollAutomationThread
+    if not args.time_entries or not args.payroll_dict:
+        raise ValueError("Payroll automation needs --time-entries and --payroll-dict")
+    # Same timestamped folder the window creates
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_folder_path = os.path.join(args.output_dir or DOWNLOADS, f"Payroll_Automation_{timestamp}")
+    os.makedirs(output_folder_path, exist_ok=True)
+    return PayrollAutomationThread(
+        time_entries_path=args.time_entries,
+        payroll_dict_path=args.payroll_dict,
+        tips_path=args.tips,
+        output_dir=output_folder_path
+    )
+
+
+# Pipeline name (as in main_window.WINDOW_REGISTRY) -> (description, thread builder)
+PIPELINES = {
+    "ap_process": ("AP payment processing", build_ap_process),
+    "cnb_transfer_je": ("CNB transfer JE import", build_cnb_transfer_je),
+    "due_to_from": ("Due To/From analysis", build_due_to_from),
+    "toast_reconcile": ("Toast net sales reconciliation", build_toast_reconcile),
+    "ap_reconcile": ("AP reconciliation (R365, Ach and balance CSVs)", build_ap_reconcile),
+    "tips_reconcile": ("Tips reconciliation", build_tips_reconcile),
+    "px_giftcards": ("PX gift cards", build_px_giftcards),
+    "grubhub_process": ("GrubHub JE import", build_grubhub_process),
+    "doordash_process": ("DoorDash JE import", build_doordash_process),
+    "ubereats_process": ("UberEats JE import", build_ubereats_process),
+    "royalties_process": ("Royalties processor", build_royalties_process),
+    "payroll_automation": ("Payroll automation", build_payroll_automation),
+}
+
+
+class ProgressPrinter:
+    """Writes pipeline events to stdout, one line each, from whichever thread emits them"""
+
+    def __init__(self, pipeline, as_json=False, stream=None, label=False):
+        self.pipeline = pipeline
+        self.as_json = as_json
+        # Prefix text lines with the pipeline name when several share one stream
+        self.label = label
+        self.stream = stream or sys.stdout
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, event, **fields):
+        elapsed = round(time.perf_counter() - self.start, 3)
+        if self.as_json:
+            line = json.dumps({"event": event, "pipeline": self.pipeline, "elapsed": elapsed, **fields},
+                              default=str)
+        else:
+            text = fields.get("message", "")
+            if event == "finished":
+                text = f"{'OK' if fields['success'] else 'FAILED'}: {text}"
+            prefix = f"{self.pipeline}: " if self.label else ""
+            line = "\n".join(f"[{elapsed:8.2f}s] {prefix}{part}" for part in str(text).splitlines() or [""])
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def run_pipeline(thread, emit):
+    """
+    Run a pipeline thread's run() in the calling thread and return (success, message, extra).
+    Signals are connected directly, so progress from the pipeline's own worker pools is
+    delivered immediately and no event loop is needed. The pipelines' own print() output
+    goes to stderr, keeping stdout for emit (e.g. a clean --json stream).
+    """
+    from PyQt5.QtCore import Qt
+    result = {"success": False, "message": "Pipeline finished without reporting a result", "extra": []}
+
+    def finished(success, message, *extra):
+        result.update(success=success, message=message, extra=list(extra))
+
+    thread.update_signal.connect(lambda message: emit("progress", message=message), Qt.DirectConnection)
+    thread.finished_signal.connect(finished, Qt.DirectConnection)
+    with contextlib.redirect_stdout(sys.stderr):
+        thread.run()
+    return result["success"], result["message"], result["extra"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run a pipeline without the GUI.")
+    parser.add_argument("pipeline", nargs="?", choices=sorted(PIPELINES), metavar="pipeline",
+                        help="pipeline to run (see --list)")
+    parser.add_argument("files", nargs="*", help="input files, as they would be selected in the window")
+    parser.add_argument("--list", action="store_true", help="list the available pipelines")
+    parser.add_argument("--output-dir", help="output directory (default: ~/Downloads)")
+    parser.add_argument("--output-file", help="output workbook for tips_reconcile")
+    parser.add_argument("--time-entries", help="payroll_automation: Time Entries file")
+    parser.add_argument("--payroll-dict", help="payroll_automation: Payroll Dictionary file")
+    parser.add_argument("--tips", help="payroll_automation: optional Tips file")
+    parser.add_argument("--json", action="store_true", help="print progress as JSON lines")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list or not args.pipeline:
+        for name, (description, _) in PIPELINES.items():
+            print(f"{name:20} {description}")
+        return 0
+
+    emit = ProgressPrinter(args.pipeline, as_json=args.json)
+    description, build = PIPELINES[args.pipeline]
+    emit("started", message=f"Starting {description}", files=args.files)
+
+    try:
+        thread = build(args)
+        success, message, extra = run_pipeline(thread, emit)
+    except Exception as e:
+        success, message, extra = False, f"{type(e).__name__}: {e}", []
+
+    fields = {"success": success, "message": message}
+    if extra:
+        fields["extra"] = extra
+    emit("finished", **fields)
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
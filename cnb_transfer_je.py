@@ -2,9 +2,9 @@ import os
 import csv
 from datetime import datetime
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                             QFileDialog, QMessageBox, QTextEdit, QApplication)
+                             QFileDialog, QMessageBox, QApplication)
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 import sys
 from PyQt5.QtGui import QIcon
 
@@ -67,7 +67,7 @@ class CNBTransferJEWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -145,6 +145,10 @@ class CNBTransferJEWindow(RetroWindow):
         msg_box.setStandardButtons(QMessageBox.Ok)
         msg_box.exec_()
 
+JE_FIELDNAMES = ["JENumber", "Type", "DetailComment", "Reversal Date", "JEComment", "JELocation",
+                 "Account", "Debit", "Credit", "DetailLocation", "Date"]
+
+
 class TransferThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
@@ -310,106 +314,66 @@ class TransferThread(QThread):
 
         self.finished_signal.emit(success, message)
 
+    def cnb_company_record(self, company):
+        """(JE location, checking account, due to/from account, detail location) for a CNB company"""
+        return (self.cnb_je_location_dict.get(company, ""),
+                self.cnb_checking_account_dict.get(company, ""),
+                self.cnb_due_to_from_dict.get(company, ""),
+                self.cnb_detail_location_dict.get(company, ""))
+
     def transform_multiple_cnb_transfers(self, input_files, output_file):
         empty_detail_locations = set()
         empty_je_locations = set()
 
-        # Initialize the output file with headers
-        with open(output_file, 'w', newline='') as outfile:
-            fieldnames = ["JENumber", "Type", "DetailComment", "Reversal Date", "JEComment", "JELocation",
-                         "Account", "Debit", "Credit", "DetailLocation", "Date"]
-            writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
+        # Each company is looked up once, however many transfers it appears in
+        company_records = {}
+
+        def company_record(company):
+            record = company_records.get(company)
+            if record is None:
+                record = company_records[company] = self.cnb_company_record(company)
+                if not record[3]:
+                    empty_detail_locations.add(company)
+            return record
 
         je_counter = 1
-        current_date = datetime.now().strftime('%m%d%y')
-
-        # Process each input file and append to the same output file
-        for input_file in input_files:
-            self.update_signal.emit(f"Processing {os.path.basename(input_file)}...")
-
-            with open(input_file, 'r') as infile, open(output_file, 'a', newline='') as outfile:
-                reader = csv.DictReader(infile)
-                writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-
-                for row in reader:
-                    companies = row['From company ---> To company'].split(' ---> ')
-                    from_company = companies[0].strip()
-                    to_company = companies[1].strip()
-
-                    if from_company not in self.cnb_je_location_dict:
-                        empty_je_locations.add(from_company)
-
-                    amount = float(row['Amount'])
-                    je_number = f"Transfer {current_date}-{je_counter:02d}"
-                    je_location = self.cnb_je_location_dict.get(from_company, "")
-
-                    rows = [
-                        {
-                            "JENumber": je_number,
-                            "Type": "Standard",
-                            "DetailComment": "",
-                            "Reversal Date": "",
-                            "JEComment": "",
-                            "JELocation": je_location,
-                            "Account": self.cnb_checking_account_dict.get(from_company, ""),
-                            "Debit": "0",
-                            "Credit": f"{amount:.2f}",
-                            "DetailLocation": self.cnb_detail_location_dict.get(from_company, ""),
-                            "Date": datetime.now().strftime('%m/%d/%Y')
-                        },
-                        {
-                            "JENumber": je_number,
-                            "Type": "Standard",
-                            "DetailComment": "",
-                            "Reversal Date": "",
-                            "JEComment": "",
-                            "JELocation": je_location,
-                            "Account": self.cnb_due_to_from_dict.get(to_company, ""),
-                            "Debit": f"{amount:.2f}",
-                            "Credit": "0",
-                            "DetailLocation": self.cnb_detail_location_dict.get(from_company, ""),
-                            "Date": datetime.now().strftime('%m/%d/%Y')
-                        },
-                        {
-                            "JENumber": je_number,
-                            "Type": "Standard",
-                            "DetailComment": "",
-                            "Reversal Date": "",
-                            "JEComment": "",
-                            "JELocation": je_location,
-                            "Account": self.cnb_due_to_from_dict.get(from_company, ""),
-                            "Debit": "0",
-                            "Credit": f"{amount:.2f}",
-                            "DetailLocation": self.cnb_detail_location_dict.get(to_company, ""),
-                            "Date": datetime.now().strftime('%m/%d/%Y')
-                        },
-                        {
-                            "JENumber": je_number,
-                            "Type": "Standard",
-                            "DetailComment": "",
-                            "Reversal Date": "",
-                            "JEComment": "",
-                            "JELocation": je_location,
-                            "Account": self.cnb_checking_account_dict.get(to_company, ""),
-                            "Debit": f"{amount:.2f}",
-                            "Credit": "0",
-                            "DetailLocation": self.cnb_detail_location_dict.get(to_company, ""),
-                            "Date": datetime.now().strftime('%m/%d/%Y')
-                        }
-                    ]
-
-                    # Check for empty DetailLocations
-                    if not self.cnb_detail_location_dict.get(from_company, ""):
-                        empty_detail_locations.add(from_company)
-                    if not self.cnb_detail_location_dict.get(to_company, ""):
-                        empty_detail_locations.add(to_company)
-
-                    # Write all four rows
-                    for new_row in rows:
-                        writer.writerow(new_row)
-
-                    je_counter += 1
+        now = datetime.now()
+        current_date = now.strftime('%m%d%y')
+        je_date = now.strftime('%m/%d/%Y')
+
+        # Write every input file through one open output file
+        with open(output_file, 'w', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(JE_FIELDNAMES)
+
+            for input_file in input_files:
+                self.update_signal.emit(f"Processing {os.path.basename(input_file)}...")
+
+                je_lines = []
+                with open(input_file, 'r') as infile:
+                    for row in csv.DictReader(infile):
+                        companies = row['From company ---> To company'].split(' ---> ')
+                        from_company = companies[0].strip()
+                        to_company = companies[1].strip()
+
+                        je_location, from_checking, from_due_to_from, from_detail = company_record(from_company)
+                        _, to_checking, to_due_to_from, to_detail = company_record(to_company)
+                        # The JE location check only applies to the sending company
+                        if from_company not in self.cnb_je_location_dict:
+                            empty_je_locations.add(from_company)
+
+                        amount = f"{float(row['Amount']):.2f}"
+                        je_number = f"Transfer {current_date}-{je_counter:02d}"
+                        je_head = [je_number, "Standard", "", "", "", je_location]
+
+                        je_lines.append(je_head + [from_checking, "0", amount, from_detail, je_date])
+                        je_lines.append(je_head + [to_due_to_from, amount, "0", from_detail, je_date])
+                        je_lines.append(je_head + [from_due_to_from, "0", amount, to_detail, je_date])
+                        je_lines.append(je_head + [to_checking, amount, "0", to_detail, je_date])
+
+                        je_counter += 1
+
+                writer.writerows(je_lines)
 
         return empty_detail_locations, empty_je_locations
 
@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                           QFileDialog, QTextEdit, QMessageBox, QListWidget, QApplication)
+                           QFileDialog, QMessageBox, QListWidget, QApplication)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from datetime import datetime, timedelta
 import os
@@ -7,7 +7,8 @@ import csv
 import numpy as np
 from calendar import monthrange
 from collections import defaultdict
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
+from shared_inputs import load_toast_orders
 
 
 def get_deposit_date(order_date_str):
@@ -67,14 +68,12 @@ def preprocess_toast_data(toast_files):
 
     for file in toast_files:
         try:
-            # Try different encodings
+            # Shared parse of the Toast export (tries utf-8, cp1252, latin1)
             df = None
-            for encoding in ['utf-8', 'cp1252', 'latin1']:
-                try:
-                    df = pd.read_csv(file, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
+            try:
+                df = load_toast_orders(file)
+            except ValueError:
+                pass
 
             if df is None:
                 continue
@@ -699,14 +698,42 @@ def create_summary_journal_entries(journal_entries):
     return summary_entries
 
 
+def categorize_doordash_files(files):
+    """Split selected files into DoorDash transaction files and Toast Order files"""
+    doordash_files = []
+    toast_files = []
+    for file in files:
+        basename = os.path.basename(file)
+        if basename.startswith("Order"):
+            toast_files.append(file)
+        elif 'financials_detailed_transactions' in basename:
+            doordash_files.append(file)
+        else:
+            # Try to infer file type
+            try:
+                with open(file, 'r', encoding='utf-8') as f:
+                    header = f.readline()
+                    if 'DoorDash' in header or 'Store Name' in header:
+                        doordash_files.append(file)
+                    elif 'Dining Options' in header or 'Toast' in header:
+                        toast_files.append(file)
+                    else:
+                        # Default to DoorDash if can't determine
+                        doordash_files.append(file)
+            except:
+                # Default to DoorDash if can't read the file
+                doordash_files.append(file)
+    return doordash_files, toast_files
+
 class DoorDashProcessThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
 
-    def __init__(self, doordash_files, toast_files):
+    def __init__(self, doordash_files, toast_files, output_dir=None):
         super().__init__()
         self.doordash_files = doordash_files
         self.toast_files = toast_files
+        self.output_dir = output_dir
 
     def run(self):
         try:
@@ -765,8 +792,8 @@ class DoorDashProcessThread(QThread):
                 today = datetime.now()
                 date_range = f"{today.strftime('%m%d%Y')}"
 
-            # Get the downloads folder for output
-            downloads_path = os.path.join(os.path.expanduser('~'), 'Downloads')
+            # Save to Downloads unless an output directory was given
+            downloads_path = self.output_dir or os.path.join(os.path.expanduser('~'), 'Downloads')
 
             # Output filename with date range
             output_file = os.path.join(downloads_path, f'DoorDash_Payout_{date_range}.csv')
@@ -831,7 +858,7 @@ class DoorDashWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -850,32 +877,8 @@ class DoorDashWindow(RetroWindow):
             self, "Select All Files", "", "CSV Files (*.csv)"
         )
         if files:
-            # Clear previous files
-            self.doordash_files = []
-            self.toast_files = []
-
             # Split files by type
-            for file in files:
-                basename = os.path.basename(file)
-                if basename.startswith("Order"):
-                    self.toast_files.append(file)
-                elif 'financials_detailed_transactions' in basename:
-                    self.doordash_files.append(file)
-                else:
-                    # Try to infer file type
-                    try:
-                        with open(file, 'r', encoding='utf-8') as f:
-                            header = f.readline()
-                            if 'DoorDash' in header or 'Store Name' in header:
-                                self.doordash_files.append(file)
-                            elif 'Dining Options' in header or 'Toast' in header:
-                                self.toast_files.append(file)
-                            else:
-                                # Default to DoorDash if can't determine
-                                self.doordash_files.append(file)
-                    except:
-                        # Default to DoorDash if can't read the file
-                        self.doordash_files.append(file)
+            self.doordash_files, self.toast_files = categorize_doordash_files(files)
 
             # Update file list
             self.file_list.clear()
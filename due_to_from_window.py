@@ -1,10 +1,10 @@
 import os
 from datetime import datetime
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                            QFileDialog, QMessageBox, QTextEdit, QApplication, QDialog, QScrollArea, QWidget)
+                            QFileDialog, QMessageBox, QApplication, QDialog, QScrollArea, QWidget)
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QIcon, QPixmap
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 import sys
 
 
@@ -65,7 +65,7 @@ class DueToFromWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -0,0 +1,95 @@
+from openpyxl.cell import Cell
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+
+# Border specs are (left, right, top, bottom) side styles
+THIN_BOX = ('thin', 'thin', 'thin', 'thin')
+THICK_BOX = ('thick', 'thick', 'thick', 'thick')
+NO_BORDER = (None, None, None, None)
+
+ALIGNMENTS = {
+    'center': Alignment(horizontal='center'),
+    'left': Alignment(horizontal='left'),
+    'middle': Alignment(horizontal='center', vertical='center'),
+    'wrap': Alignment(wrap_text=True, vertical='center', horizontal='center'),
+}
+
+
+class StyleRegistry:
+    """
+    Named cell styles for one workbook. Every distinct combination of bold, fill,
+    border, alignment and number format is built and registered once, after which
+    cells only reference it by name.
+    """
+
+    def __init__(self, wb, font_name=None):
+        self.wb = wb
+        self.font_name = font_name
+        self._names = {}
+        self._fonts = {}
+        self._fills = {}
+        self._borders = {}
+
+    def style(self, name=None, bold=False, fill=None, border=NO_BORDER, align=None, number_format='General'):
+        """Return the name of the style with these attributes, registering it on first use"""
+        key = (bold, fill, border, align, number_format)
+        registered = self._names.get(key)
+        if registered:
+            return registered
+
+        named = NamedStyle(name=name or f"Style {len(self.wb.named_styles)}",
+                           font=self._font(bold),
+                           fill=self._fill(fill),
+                           border=self._border(border),
+                           alignment=ALIGNMENTS[align] if align else None,
+                           number_format=number_format,
+                           hidden=name is None)
+        self.wb.add_named_style(named)
+        self._names[key] = named.name
+        return named.name
+
+    def _font(self, bold):
+        if bold not in self._fonts:
+            if bold:
+                self._fonts[bold] = Font(name=self.font_name, bold=True)
+            else:
+                self._fonts[bold] = Font(name=self.font_name) if self.font_name else DEFAULT_FONT
+        return self._fonts[bold]
+
+    def _fill(self, color):
+        if color not in self._fills:
+            self._fills[color] = (PatternFill(start_color=color, end_color=color, fill_type='solid')
+                                  if color else PatternFill())
+        return self._fills[color]
+
+    def _border(self, spec):
+        if spec not in self._borders:
+            left, right, top, bottom = spec
+            self._borders[spec] = Border(left=Side(style=left), right=Side(style=right),
+                                         top=Side(style=top), bottom=Side(style=bottom))
+        return self._borders[spec]
+
+
+def style_range(ws, min_row, min_col, max_row, max_col, name):
+    """Apply a registered style to every cell of a rectangular range"""
+    if min_row > max_row or min_col > max_col:
+        return
+    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+        for cell in row:
+            cell.style = name
+
+
+def set_column_widths(ws, min_col, max_col, width):
+    for col in range(min_col, max_col + 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+
+def append_styled_row(ws, values, names):
+    """Append one row, creating each cell with its registered style so no later formatting pass is needed"""
+    cells = []
+    for value, name in zip(values, names):
+        cell = Cell(ws, value=value)
+        cell.style = name
+        cells.append(cell)
+    ws.append(cells)
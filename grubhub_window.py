@@ -1,9 +1,10 @@
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                           QFileDialog, QTextEdit, QMessageBox, QListWidget)
+                           QFileDialog, QMessageBox, QListWidget)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from datetime import datetime, timedelta
 import os
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
+from shared_inputs import load_toast_orders
 import calendar
 
 
@@ -67,16 +68,12 @@ def create_journal_entries(transactions_df, order_files=None):
             if not os.path.exists(file_path):
                 continue
 
-            # Try different encodings
+            # Shared parse of the Toast export, keeping only the columns used here
             orders_df = None
-            for encoding in ['utf-8', 'latin1']:
-                try:
-                    # Only read necessary columns
-                    orders_df = pd.read_csv(file_path, encoding=encoding,
-                                          usecols=['Location', 'Opened', 'Dining Options', 'Amount', 'Tax'])
-                    break
-                except Exception as e:
-                    continue
+            try:
+                orders_df = load_toast_orders(file_path)[['Location', 'Opened', 'Dining Options', 'Amount', 'Tax']]
+            except Exception as e:
+                pass
 
             if orders_df is None:
                 continue
@@ -510,15 +507,12 @@ def create_tip_adjustment_entries(transactions_df, order_files=None):
             if not os.path.exists(file_path):
                 continue
 
-            # Try different encodings
+            # Shared parse of the Toast export, keeping only the columns used here
             orders_df = None
-            for encoding in ['utf-8', 'latin1']:
-                try:
-                    orders_df = pd.read_csv(file_path, encoding=encoding,
-                                          usecols=['Location', 'Opened', 'Dining Options', 'Tip'])
-                    break
-                except Exception as e:
-                    continue
+            try:
+                orders_df = load_toast_orders(file_path)[['Location', 'Opened', 'Dining Options', 'Tip']]
+            except Exception as e:
+                pass
 
             if orders_df is None:
                 continue
@@ -647,14 +641,26 @@ def create_tip_adjustment_entries(transactions_df, order_files=None):
 
     return pd.DataFrame(tip_entries)
 
+def categorize_grubhub_files(files):
+    """Split selected files into the GrubHub transaction file and the Toast Order files"""
+    grubhub_file = None
+    order_files = []
+    for file in files:
+        if os.path.basename(file).startswith("Order"):
+            order_files.append(file)
+        else:
+            grubhub_file = file
+    return grubhub_file, order_files
+
 class GrubHubProcessThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
 
-    def __init__(self, input_file, order_files=None):
+    def __init__(self, input_file, order_files=None, output_dir=None):
         super().__init__()
         self.input_file = input_file
         self.order_files = order_files or []
+        self.output_dir = output_dir
 
     def run(self):
         import pandas as pd
@@ -698,8 +704,8 @@ class GrubHubProcessThread(QThread):
             combined_df = combined_df.sort_values(['JENumber', 'row_num'])
             combined_df = combined_df.drop('row_num', axis=1)
 
-            # Create output directory in Downloads
-            downloads_path = os.path.join(os.path.expanduser('~'), 'Downloads')
+            # Save to Downloads unless an output directory was given
+            downloads_path = self.output_dir or os.path.join(os.path.expanduser('~'), 'Downloads')
             today = datetime.now().strftime("%m%d%Y")
             output_file = os.path.join(downloads_path, f"GrubHub_JE_{today}.csv")
 
@@ -752,7 +758,7 @@ class GrubHubWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -773,12 +779,8 @@ class GrubHubWindow(RetroWindow):
         )
         if files:
             # Split files by type
-            self.order_files = []
-            for file in files:
-                if os.path.basename(file).startswith("Order"):
-                    self.order_files.append(file)
-                else:
-                    self.selected_file = file
+            grubhub_file, self.order_files = categorize_grubhub_files(files)
+            self.selected_file = grubhub_file or self.selected_file
 
             # Update file list
             self.file_list.clear()
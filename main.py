@@ -4,12 +4,11 @@ import sys
 import os
 from PyQt5.QtWidgets import (QApplication, QVBoxLayout, QPushButton, QMessageBox, QLabel)
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from pathlib import Path
 import logging
 import requests
 import auto_updater
-import time
 from retro_style import RetroWindow, RetroDialog
 
 # Constants
@@ -137,30 +136,24 @@ def main():
         # Setup logging
         setup_logging()
 
-        # Check for updates
-        splash.showMessage("Checking for updates...")
-        app.processEvents()
-        time.sleep(0.5)
-
-        should_exit = auto_updater.check_and_update()
-        if should_exit:
-            splash.showMessage("Update found! Starting update process...")
-            app.processEvents()
-            time.sleep(0.5)
-            logging.info("Exiting for update")
-            instance_manager.release_lock()
-            return
+        # Finish any update that was interrupted last time (local files only)
+        auto_updater.recover_interrupted_update()
 
         # Show login window
         login_window = LoginWindow()
         splash.showMessage("Loading application...")
         app.processEvents()
-        time.sleep(0.3)
 
         splash.finish(login_window)
         login_window.show()
 
+        # Check for updates in the background once the event loop is running
+        QTimer.singleShot(0, auto_updater.start_background_check)
+
         result = app.exec_()
+        # Which feature windows were opened this session and what their imports cost
+        from main_window import import_time_report
+        logging.info("Feature module import times:\n" + import_time_report())
         instance_manager.release_lock()
         sys.exit(result)
 
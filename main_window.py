@@ -2,22 +2,69 @@
 
 import sys
 import os
-from PyQt5.QtWidgets import QVBoxLayout, QPushButton, QLabel, QApplication, QWidget
+import time
+import logging
+import importlib
+from PyQt5.QtWidgets import QVBoxLayout, QPushButton, QLabel, QApplication, QWidget, QMessageBox
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
-from cnb_transfer_je import CNBTransferJEWindow
-from toast_reconcile_window import ToastReconcileWindow
 from retro_style import RetroWindow, create_retro_central_widget
-from due_to_from_window import DueToFromWindow
-from ap_process import APWindow
-from ap_reconcile import APReconcileWindow
-from tips_reconcile import TipsReconcileWindow
-from px_processor import PXGiftCardsWindow
-from grubhub_window import GrubHubWindow
-from doordash_window import DoorDashWindow
-from ubereats_window import UberEatsWindow
-from royalties_window import RoyaltiesWindow
-from payroll_window import PayrollWindow  # Import the new PayrollWindow
+
+# Feature windows by key: (module, window class). Modules are only imported when their
+# window is first opened, so the menu doesn't wait on every pipeline's dependencies.
+# Keep build_exe.HIDDEN_IMPORTS in sync, since PyInstaller can't see these imports.
+WINDOW_REGISTRY = {
+    "ap_process": ("ap_process", "APWindow"),
+    "cnb_transfer_je": ("cnb_transfer_je", "CNBTransferJEWindow"),
+    "due_to_from": ("due_to_from_window", "DueToFromWindow"),
+    "toast_reconcile": ("toast_reconcile_window", "ToastReconcileWindow"),
+    "ap_reconcile": ("ap_reconcile", "APReconcileWindow"),
+    "tips_reconcile": ("tips_reconcile", "TipsReconcileWindow"),
+    "px_giftcards": ("px_processor", "PXGiftCardsWindow"),
+    "grubhub_process": ("grubhub_window", "GrubHubWindow"),
+    "doordash_process": ("doordash_window", "DoorDashWindow"),
+    "ubereats_process": ("ubereats_window", "UberEatsWindow"),
+    "royalties_process": ("royalties_window", "RoyaltiesWindow"),
+    "payroll_automation": ("payroll_window", "PayrollWindow"),
+}
+
+# Seconds spent importing each feature module, in load order
+import_times = {}
+
+
+def load_window_class(key):
+    """Import the module behind a registered window on first use and return its window class"""
+    module_name, class_name = WINDOW_REGISTRY[key]
+    if module_name not in sys.modules:
+        start = time.perf_counter()
+        importlib.import_module(module_name)
+        import_times[module_name] = time.perf_counter() - start
+        logging.info(f"Imported {module_name} in {import_times[module_name]:.2f}s")
+    return getattr(sys.modules[module_name], class_name)
+
+
+def import_time_report():
+    """One line per feature module imported so far, slowest first"""
+    lines = [f"{module_name}: {seconds:.2f}s"
+             for module_name, seconds in sorted(import_times.items(), key=lambda item: -item[1])]
+    return "\n".join(lines) if lines else "No feature modules imported yet"
+
+
+class WindowOpenerMixin:
+    """Opens registered feature windows, keeping a reference so they aren't garbage collected"""
+
+    def open_window(self, key):
+        # The module is only imported now, so a missing dependency (e.g. win32com, or a hidden
+        # import left out of the frozen build) surfaces here instead of at startup
+        try:
+            window = load_window_class(key)()
+        except Exception as e:
+            module_name = WINDOW_REGISTRY[key][0]
+            logging.exception(f"Could not open {key} from {module_name}")
+            QMessageBox.critical(self, "Error", f"Could not load {module_name}:\n{type(e).__name__}: {e}")
+            return
+        self.open_windows[key] = window
+        window.show()
 
 def resource_path(relative_path):
     try:
@@ -26,10 +73,11 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-class AdditionalFunctionsWindow(RetroWindow):
+class AdditionalFunctionsWindow(WindowOpenerMixin, RetroWindow):
     def __init__(self, parent=None):
         super().__init__()
         self.parent = parent
+        self.open_windows = {}
         self.initUI()
 
         icon_path = resource_path(os.path.join('assets', 'icon.png'))
@@ -57,67 +105,23 @@ class AdditionalFunctionsWindow(RetroWindow):
         layout.addSpacing(20)
 
         # Create buttons
-        self.create_button("CNB TRANSFER JE IMPORT", self.open_cnb_transfer_je, layout)
-        self.create_button("DUE TO/FROM ANALYSIS", self.open_due_to_from, layout)
-        self.create_button("TOAST NET SALES RECONCILIATION", self.open_toast_reconcile, layout)
-        self.create_button("AP RECONCILIATION", self.open_ap_reconcile, layout)
-        self.create_button("TIPS RECONCILIATION", self.open_tips_reconcile, layout)
-        self.create_button("PX GIFT CARDS", self.open_px_giftcards, layout)
-        self.create_button("GRUBHUB JE IMPORT", self.open_grubhub_process, layout)
-        self.create_button("DOORDASH JE IMPORT", self.open_doordash_process, layout)
-        self.create_button("UBEREATS JE IMPORT", self.open_ubereats_process, layout)
-        self.create_button("ROYALTIES PROCESSOR", self.open_royalties_process, layout)
-        self.create_button("PAYROLL AUTOMATION", self.open_payroll_automation, layout)  # Added new button
-
-    def create_button(self, text, function, layout):
+        self.create_button("CNB TRANSFER JE IMPORT", "cnb_transfer_je", layout)
+        self.create_button("DUE TO/FROM ANALYSIS", "due_to_from", layout)
+        self.create_button("TOAST NET SALES RECONCILIATION", "toast_reconcile", layout)
+        self.create_button("AP RECONCILIATION", "ap_reconcile", layout)
+        self.create_button("TIPS RECONCILIATION", "tips_reconcile", layout)
+        self.create_button("PX GIFT CARDS", "px_giftcards", layout)
+        self.create_button("GRUBHUB JE IMPORT", "grubhub_process", layout)
+        self.create_button("DOORDASH JE IMPORT", "doordash_process", layout)
+        self.create_button("UBEREATS JE IMPORT", "ubereats_process", layout)
+        self.create_button("ROYALTIES PROCESSOR", "royalties_process", layout)
+        self.create_button("PAYROLL AUTOMATION", "payroll_automation", layout)
+
+    def create_button(self, text, window_key, layout):
         btn = QPushButton(text)
-        btn.clicked.connect(function)
+        btn.clicked.connect(lambda: self.open_window(window_key))
         layout.addWidget(btn)
 
-    def open_cnb_transfer_je(self):
-        self.cnb_transfer_je_window = CNBTransferJEWindow()
-        self.cnb_transfer_je_window.show()
-
-    def open_toast_reconcile(self):
-        self.toast_reconcile_window = ToastReconcileWindow()
-        self.toast_reconcile_window.show()
-
-    def open_due_to_from(self):
-        self.due_to_from_window = DueToFromWindow()
-        self.due_to_from_window.show()
-
-    def open_ap_reconcile(self):
-        self.ap_reconcile_window = APReconcileWindow()
-        self.ap_reconcile_window.show()
-
-    def open_tips_reconcile(self):
-        self.tips_reconcile_window = TipsReconcileWindow()
-        self.tips_reconcile_window.show()
-
-    def open_px_giftcards(self):
-        self.px_giftcards_window = PXGiftCardsWindow()
-        self.px_giftcards_window.show()
-
-    def open_grubhub_process(self):
-        self.grubhub_window = GrubHubWindow()
-        self.grubhub_window.show()
-
-    def open_doordash_process(self):
-        self.doordash_window = DoorDashWindow()
-        self.doordash_window.show()
-
-    def open_ubereats_process(self):
-        self.ubereats_window = UberEatsWindow()
-        self.ubereats_window.show()
-
-    def open_royalties_process(self):
-        self.royalties_window = RoyaltiesWindow()
-        self.royalties_window.show()
-
-    def open_payroll_automation(self):  # Added new function
-        self.payroll_window = PayrollWindow()
-        self.payroll_window.show()
-
     def center(self):
         frame_geometry = self.frameGeometry()
         center_point = QApplication.desktop().availableGeometry().center()
@@ -125,9 +129,10 @@ class AdditionalFunctionsWindow(RetroWindow):
         self.move(frame_geometry.topLeft())
 
 
-class MainWindow(RetroWindow):
+class MainWindow(WindowOpenerMixin, RetroWindow):
     def __init__(self, username=None, available_functions=None):
         super().__init__()
+        self.open_windows = {}
         self.username = username
         self.available_functions = available_functions or []
         self.initUI()
@@ -158,7 +163,7 @@ class MainWindow(RetroWindow):
 
         # Create AP Payments button
         ap_btn = QPushButton('AP PAYMENTS')
-        ap_btn.clicked.connect(self.open_ap_process)
+        ap_btn.clicked.connect(lambda: self.open_window("ap_process"))
         layout.addWidget(ap_btn)
 
         # Add more spacing
@@ -175,10 +180,6 @@ class MainWindow(RetroWindow):
         frame_geometry.moveCenter(center_point)
         self.move(frame_geometry.topLeft())
 
-    def open_ap_process(self):
-        self.ap_process_window = APWindow()
-        self.ap_process_window.show()
-
     def open_additional_functions(self):
         self.additional_functions_window = AdditionalFunctionsWindow(self)
         self.additional_functions_window.show()
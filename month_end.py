@@ -0,0 +1,386 @@
+"""
+Month-end close runner.
+
+Takes one folder holding the month's exports, routes each file to the pipelines that
+read it and runs them together as a dependency graph:
+
+    toast_orders ─┬─ doordash_process ─┐
+                  ├─ grubhub_process  ─┼─ royalties_process
+                  └─ ubereats_process ─┘
+    toast_reconcile, tips_reconcile, px_giftcards (independent)
+
+Each stage runs in its own worker process as soon as its inputs are ready, so stages
+don't take turns on one interpreter; with a core per concurrent stage the close takes
+about as long as its slowest chain. The summary reports the critical path next to the
+measured wall time and concurrency. Toast Order exports are parsed once in the
+toast_orders stage and handed to the delivery pipelines as pickled frames, and royalties
+picks up the DoorDash, GrubHub and UberEats JE files those pipelines produce.
+
+Files directly in the folder are routed by name; files in a subfolder named after a
+pipeline (e.g. <folder>/tips_reconcile/) go to that pipeline only, which then ignores the
+files directly in the folder.
+
+    python month_end.py "September close" --output-dir "September output" --json
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+from cli import PIPELINES, DOWNLOADS, ProgressPrinter, run_pipeline
+
+# Pipeline -> (file name prefixes, file name substrings) it reads, matched lower-case
+ROUTES = {
+    "toast_reconcile": (("order", "gl", "export", "group"), ()),
+    "tips_reconcile": (("order", "itemized_orders", "itemized_cancelled", "transaction", "metro_speedy",
+                        "billing", "gl", "relay_carrotexpress", "payroll", "relacion"), ()),
+    "royalties_process": (("groupoverview", "order", "gl", "profit", "tax"), ()),
+    "doordash_process": (("order",), ("financials_detailed_transactions",)),
+    "grubhub_process": (("order",), ("grubhub",)),
+    "ubereats_process": (("order",), ("uber", "payment details")),
+    "px_giftcards": ((), ("chase", "payout", "storedvalueredemption")),
+}
+
+# Read by several pipelines, so on their own they are no reason to run any of them
+SHARED_PREFIXES = ("order", "gl")
+
+# Delivery pipeline -> prefix of the JE file it writes, which royalties reads (case-sensitive,
+# as in royalties_processor). A prepared JE file in the folder only goes to royalties, and is
+# replaced by the freshly produced one when its delivery pipeline runs.
+JE_PREFIXES = {
+    "doordash_process": "DoorDash",
+    "grubhub_process": "GrubHub",
+    "ubereats_process": "UE",
+}
+
+TOAST_ORDERS_STAGE = "toast_orders"
+
+# Sent by a stage process after its last progress event
+FLUSHED = "flushed"
+
+
+def matches(filename, prefixes, substrings=()):
+    name = filename.lower()
+    return name.startswith(prefixes) or any(part in name for part in substrings)
+
+
+def classify_folder(folder):
+    """Return {pipeline: [files]} for every pipeline with at least one input of its own"""
+    routed = {name: [] for name in ROUTES}
+    triggered = set()
+    entries = sorted(os.listdir(folder))
+
+    own_folders = {entry for entry in entries if entry in ROUTES and os.path.isdir(os.path.join(folder, entry))}
+    for name in own_folders:
+        path = os.path.join(folder, name)
+        routed[name] = [os.path.join(path, f) for f in sorted(os.listdir(path))
+                        if os.path.isfile(os.path.join(path, f))]
+        if routed[name]:
+            triggered.add(name)
+
+    for entry in entries:
+        path = os.path.join(folder, entry)
+        if not os.path.isfile(path):
+            continue
+
+        if entry.startswith(tuple(JE_PREFIXES.values())):
+            if "royalties_process" not in own_folders:
+                routed["royalties_process"].append(path)
+            continue
+
+        for name, (prefixes, substrings) in ROUTES.items():
+            if name not in own_folders and matches(entry, prefixes, substrings):
+                routed[name].append(path)
+                if not matches(entry, SHARED_PREFIXES):
+                    triggered.add(name)
+
+    return {name: files for name, files in routed.items() if name in triggered}
+
+
+class ProgressRelay:
+    """Carries progress events from stage processes to this process's printers, in order"""
+
+    def __init__(self, emit_for, context):
+        self.emit_for = emit_for
+        self.queue = context.Queue()
+        self.flushed = {}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.forward, daemon=True)
+        self.thread.start()
+
+    def forward(self):
+        for name, event, fields in iter(self.queue.get, None):
+            if event == FLUSHED:
+                self.flushed_event(name).set()
+            else:
+                self.emit_for(name)(event, **fields)
+
+    def flushed_event(self, name):
+        with self.lock:
+            return self.flushed.setdefault(name, threading.Event())
+
+    def run(self, pool, name, function, *args):
+        """Run function(name, *args) in the pool; returns once its progress has been printed"""
+        result = pool.submit(function, name, *args).result()
+        self.flushed_event(name).wait()
+        return result
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+
+# Set in each stage process by init_stage_process
+_progress_queue = None
+
+
+def init_stage_process(progress_queue):
+    global _progress_queue
+    import shared_inputs
+    _progress_queue = progress_queue
+    # Progress goes through the queue; anything the pipelines print goes to stderr so it
+    # never mixes with the orchestrator's stdout (e.g. --json events)
+    sys.stdout = sys.stderr
+    # Stage processes only live for one close, so they keep every frame they are handed
+    shared_inputs.CACHE_BUDGET_BYTES = float("inf")
+
+
+def stage_emitter(name):
+    def emit(event, **fields):
+        _progress_queue.put((name, event, fields))
+    return emit
+
+
+def parse_order_files(name, order_files, frames_dir):
+    """Parse Toast Order files and pickle each frame into frames_dir, in the order given"""
+    from shared_inputs import load_toast_orders
+    try:
+        def parse(item):
+            index, path = item
+            frame = load_toast_orders(path)
+            pickle_path = os.path.join(frames_dir, f"{index}_{os.path.basename(path)}.pkl")
+            frame.to_pickle(pickle_path)
+            return pickle_path, len(frame)
+
+        with ThreadPoolExecutor(max_workers=min(len(order_files), 8)) as executor:
+            parsed = list(executor.map(parse, enumerate(order_files)))
+        rows = sum(count for _, count in parsed)
+        return True, f"Parsed {len(order_files)} Toast Order files ({rows} rows)", [path for path, _ in parsed]
+    finally:
+        _progress_queue.put((name, FLUSHED, {}))
+
+
+def run_pipeline_stage(name, inputs, stage_dir, shared_frames):
+    """
+    Run one pipeline in a stage process and return (success, message, outputs), where
+    outputs are the files it wrote to stage_dir. shared_frames maps Toast Order files to
+    frames already parsed by the toast_orders stage.
+    """
+    import pandas as pd
+    from shared_inputs import seed_cache, parse_toast_orders
+    emit = stage_emitter(name)
+    try:
+        for path, pickle_path in shared_frames.items():
+            seed_cache(parse_toast_orders, path, pd.read_pickle(pickle_path))
+
+        description, build = PIPELINES[name]
+        os.makedirs(stage_dir, exist_ok=True)
+        before = set(os.listdir(stage_dir))
+        args = argparse.Namespace(files=inputs, output_dir=stage_dir, output_file=None,
+                                  time_entries=None, payroll_dict=None, tips=None)
+        emit("started", message=f"Starting {description} with {len(inputs)} files", files=inputs)
+        success, message, _ = run_pipeline(build(args), emit)
+        outputs = [os.path.join(stage_dir, f) for f in sorted(set(os.listdir(stage_dir)) - before)
+                   if os.path.isfile(os.path.join(stage_dir, f))]
+        if name in JE_PREFIXES:
+            outputs = [f for f in outputs if os.path.basename(f).startswith(JE_PREFIXES[name])]
+        return success, message, outputs
+    finally:
+        _progress_queue.put((name, FLUSHED, {}))
+
+
+def build_stages(routed, output_dir, frames_dir, pool, relay):
+    """
+    Return {stage: (dependencies, run)} for the routed pipelines. run(results) gets the
+    results of the stages it depends on, does its work in the process pool and returns
+    (success, message, outputs).
+    """
+    stages = {}
+
+    order_files = sorted({f for name in JE_PREFIXES if name in routed for f in routed[name]
+                          if matches(os.path.basename(f), ("order",))})
+    if order_files:
+        def parse_orders(results):
+            return relay.run(pool, TOAST_ORDERS_STAGE, parse_order_files, order_files, frames_dir)
+        stages[TOAST_ORDERS_STAGE] = ([], parse_orders)
+
+    for name, files in routed.items():
+        deps = []
+        if name in JE_PREFIXES and order_files:
+            deps.append(TOAST_ORDERS_STAGE)
+        if name == "royalties_process":
+            deps.extend(d for d in JE_PREFIXES if d in routed)
+        stages[name] = (deps, make_pipeline_stage(name, files, deps, output_dir, order_files, pool, relay))
+
+    return stages
+
+
+def make_pipeline_stage(name, files, deps, output_dir, order_files, pool, relay):
+    stage_dir = os.path.join(output_dir, name)
+
+    def run(results):
+        inputs = list(files)
+        shared_frames = {}
+        for dep in deps:
+            if dep in JE_PREFIXES:
+                inputs = [f for f in inputs if not os.path.basename(f).startswith(JE_PREFIXES[dep])]
+                inputs.extend(results[dep]["outputs"])
+            elif dep == TOAST_ORDERS_STAGE:
+                frames = dict(zip(order_files, results[dep]["outputs"]))
+                shared_frames = {f: frames[f] for f in inputs if f in frames}
+        return relay.run(pool, name, run_pipeline_stage, inputs, stage_dir, shared_frames)
+
+    return run
+
+
+def run_stages(stages, workers, on_finished):
+    """
+    Run each stage once all of its dependencies have succeeded; stages downstream of a
+    failure are skipped. Returns {stage: result dict}.
+    """
+    results = {}
+    pending = dict(stages)
+    running = {}
+
+    def timed(name, run):
+        start = time.perf_counter()
+        try:
+            success, message, outputs = run(results)
+        except Exception as e:
+            success, message, outputs = False, f"{type(e).__name__}: {e}", []
+        return {"status": "ok" if success else "failed", "message": message, "outputs": outputs,
+                "elapsed": time.perf_counter() - start}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            progress = True
+            while progress:
+                progress = False
+                for name, (deps, run) in list(pending.items()):
+                    blocked = [d for d in deps if results.get(d, {}).get("status") in ("failed", "skipped")]
+                    if blocked:
+                        results[name] = {"status": "skipped", "message": f"Skipped, {', '.join(blocked)} did not succeed",
+                                         "outputs": [], "elapsed": 0.0}
+                        on_finished(name, results[name])
+                    elif all(d in results for d in deps):
+                        running[executor.submit(timed, name, run)] = name
+                    else:
+                        continue
+                    del pending[name]
+                    progress = True
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                on_finished(name, results[name])
+
+    return results
+
+
+def critical_path(stages, results):
+    """The chain of dependent stages with the largest total elapsed time, and that time"""
+    longest = {}
+
+    def path_to(name):
+        if name not in longest:
+            deps = [path_to(d) for d in stages[name][0]]
+            chain, total = max(deps, key=lambda item: item[1], default=([], 0.0))
+            longest[name] = (chain + [name], total + results[name]["elapsed"])
+        return longest[name]
+
+    return max((path_to(name) for name in stages), key=lambda item: item[1], default=([], 0.0))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the month-end pipelines on one input folder.")
+    parser.add_argument("folder", help="folder holding the month's input files")
+    parser.add_argument("--output-dir", help="output directory (default: ~/Downloads/Month_End_<date>)")
+    parser.add_argument("--workers", type=int, default=min(len(ROUTES) + 1, os.cpu_count() or 1),
+                        help="number of stages run at once, each in its own process")
+    parser.add_argument("--json", action="store_true", help="print progress as JSON lines")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output_dir = args.output_dir or os.path.join(DOWNLOADS, f"Month_End_{datetime.now().strftime('%m%d%Y')}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    lock = threading.Lock()
+    printers = {}
+
+    def emit_for(name):
+        if name not in printers:
+            printers[name] = ProgressPrinter(name, as_json=args.json, label=True)
+            # One lock for all printers so lines from concurrent stages never interleave
+            printers[name].lock = lock
+        return printers[name]
+
+    emit = emit_for("month_end")
+    routed = classify_folder(args.folder)
+    if not routed:
+        emit("finished", success=False, message=f"No pipeline inputs found in {args.folder}")
+        return 1
+    for name, files in routed.items():
+        emit("routed", message=f"{name}: {len(files)} files", stage=name, files=files)
+
+    def on_finished(name, result):
+        emit_for(name)("finished", success=result["status"] == "ok", status=result["status"],
+                       message=result["message"], outputs=result["outputs"],
+                       stage_elapsed=round(result["elapsed"], 3))
+
+    # Spawned rather than forked, as on Windows, since this process already runs threads
+    workers = max(args.workers, 1)
+    context = multiprocessing.get_context("spawn")
+    relay = ProgressRelay(emit_for, context)
+    frames_dir = tempfile.mkdtemp(prefix="month_end_frames_")
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_stage_process,
+                                 initargs=(relay.queue,)) as pool:
+            stages = build_stages(routed, output_dir, frames_dir, pool, relay)
+            results = run_stages(stages, workers, on_finished)
+    finally:
+        relay.close()
+        shutil.rmtree(frames_dir, ignore_errors=True)
+    wall = time.perf_counter() - start
+    chain, chain_time = critical_path(stages, results)
+    # How many stages were running at once on average
+    concurrency = sum(r["elapsed"] for r in results.values()) / wall if wall else 1.0
+
+    if args.json:
+        emit("summary", wall=round(wall, 3), critical_path=chain, critical_path_time=round(chain_time, 3),
+             concurrency=round(concurrency, 2),
+             stages={name: {"status": r["status"], "elapsed": round(r["elapsed"], 3)} for name, r in results.items()})
+    else:
+        lines = [f"{name:20} {r['status']:8} {r['elapsed']:8.2f}s" for name, r in results.items()]
+        lines.append(f"Critical path: {' -> '.join(chain)} ({chain_time:.2f}s), wall time {wall:.2f}s, "
+                     f"{concurrency:.1f} stages running on average")
+        lines.append(f"Output: {output_dir}")
+        emit("summary", message="\n".join(lines))
+
+    return 0 if all(r["status"] == "ok" for r in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
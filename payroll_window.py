@@ -3,10 +3,10 @@
 import os
 import sys
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                            QFileDialog, QMessageBox, QTextEdit, QApplication, QListWidget)
+                            QFileDialog, QMessageBox, QApplication, QListWidget)
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QIcon
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 from payroll_automation import PayrollAutomationThread
 from datetime import datetime
 
@@ -96,7 +96,7 @@ class PayrollWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -98,7 +98,7 @@ def save_special_stores_excel(df, raw_redemptions_df, output_path):
     details_df = raw_redemptions_df[
         (raw_redemptions_df['Store Name'].isin(special_stores)) &
         (raw_redemptions_df['Card Template'] == 'eGift')
-    ].copy()
+    ].drop(columns=['Dollars Redeemed Cents'], errors='ignore')
     details_df.to_excel(writer, index=False, sheet_name='Gift Card Details')
 
     # Get the workbook and worksheet
@@ -277,131 +277,42 @@ def get_month_year(date_str):
     """Get month and year in mmyyyy format."""
     return pd.to_datetime(date_str).strftime('%m%Y')
 
+def list_px_files(directory):
+    """Categorized PX input files in a directory"""
+    from px_loaders import categorize_px_files
+    return categorize_px_files([entry.path for entry in os.scandir(directory) if entry.is_file()])
+
 def load_chase_data(directory):
     """Load and filter Chase bank data."""
-    import pandas as pd
-    import os
-
-    # Update file detection to match actual filename pattern
-    chase_files = [f for f in os.listdir(directory) if 'Chase' in f and f.endswith('.CSV')]
-    if not chase_files:
+    from px_loaders import load_chase
+    chase_file = list_px_files(directory)[0]
+    if not chase_file:
         raise FileNotFoundError("No Chase CSV file found in the directory")
-
-    file_path = os.path.join(directory, chase_files[0])
-    print(f"\nReading Chase file: {file_path}")
-
-    try:
-        # Read CSV with explicit fixed column names and handling
-        chase_df = pd.read_csv(
-            file_path,
-            names=["Details", "Posting Date", "Description", "Amount", "Type", "Balance", "Check or Slip #"],
-            dtype={
-                "Details": str,
-                "Posting Date": str,
-                "Description": str,
-                "Amount": str,
-                "Type": str,
-                "Balance": str,
-                "Check or Slip #": str
-            },
-            skipinitialspace=True,
-            skiprows=1  # Skip the original header row since we're providing our own
-        )
-
-        print("\nInitial data shape:", chase_df.shape)
-        print("Initial columns:", chase_df.columns.tolist())
-        print("\nFirst few rows of raw data:")
-        print(chase_df.head())
-
-        # Filter for Paytronix transactions
-        filtered_df = chase_df[
-            chase_df['Description'].str.contains('ORIG CO NAME:Paytronix', case=False, na=False, regex=True)
-        ].copy()
-
-        # Convert Amount to float
-        filtered_df['Amount'] = pd.to_numeric(filtered_df['Amount'].str.strip(), errors='coerce')
-
-        print(f"\nFound {len(filtered_df)} Paytronix transactions")
-        print("\nFiltered data sample:")
-        print(filtered_df.head())
-
-        return filtered_df
-
-    except Exception as e:
-        print(f"\nError reading Chase file: {str(e)}")
-        print(f"File path: {file_path}")
-        print(f"Directory contents: {os.listdir(directory)}")
-        raise
+    return load_chase(chase_file)
 
 def load_paytronix_data(directory):
-    import pandas as pd
-    payout_files = [f for f in os.listdir(directory) if f.startswith('Payouts') and f.endswith('.csv')]
-    if not payout_files:
+    from px_loaders import load_payouts
+    payouts_file = list_px_files(directory)[1]
+    if not payouts_file:
         raise FileNotFoundError("No Paytronix Payout CSV file found in the directory")
-
-    # Read CSV specifying all columns as strings
-    px_df = pd.read_csv(
-        os.path.join(directory, payout_files[0]),
-        dtype={
-            'Unnamed: 0': str,
-            'Payout ID': str,
-            'Payout Status': str,
-            'Description': str,
-            'Payout Created Date': str,
-            'Payout Arrival Date': str,
-            'Gross': str,
-            'Fees': str,
-            'Total': str
-        }
-    )
-
-    # Convert date
-    px_df['Payout Created Date'] = pd.to_datetime(px_df['Payout Created Date']).dt.strftime('%m/%d/%Y')
-
-    # Clean currency values
-    for col in ['Gross', 'Fees', 'Total']:
-        # Ensure column is string type before using str accessor
-        px_df[col] = px_df[col].astype(str).str.replace('$', '').str.replace(',', '').astype(float)
-
-    return px_df
+    return load_payouts(payouts_file)
 
 def load_redemptions_data(directory):
     """Load PX redemptions data from multiple files, skipping the first row of each."""
-    import pandas as pd
-    redemption_files = [f for f in os.listdir(directory) if 'Stored' in f and f.endswith('.csv')]
+    from px_loaders import load_redemptions
+    redemption_files = list_px_files(directory)[2]
     if not redemption_files:
         raise FileNotFoundError("No Redemption CSV file found in the directory")
-
-    all_data = []
-    for file in redemption_files:
-        df = pd.read_csv(
-            os.path.join(directory, file),
-            skiprows=1,
-            dtype={'Store Name': str, 'Card Template': str, 'Dollars Redeemed': float, 'Date': str}
-        )
-        all_data.append(df)
-
-    # Combine all dataframes
-    combined_df = pd.concat(all_data, ignore_index=True)
-
-    # Ensure Date is properly formatted
-    combined_df['Date'] = pd.to_datetime(combined_df['Date']).dt.strftime('%m/%d/%Y')
-
-    return combined_df
+    return load_redemptions(redemption_files)
 
 def calculate_monthly_fee_percentages(px_df):
    """Calculate fee percentage for each month from payout data."""
    import pandas as pd
-   px_df['Month'] = pd.to_datetime(px_df['Payout Created Date']).dt.strftime('%m/%Y')
-   monthly_fees = {}
-
-   for month in px_df['Month'].unique():
-       month_data = px_df[px_df['Month'] == month]
-       total_fees = month_data['Fees'].sum()
-       total_gross = month_data['Gross'].sum()
-       monthly_fees[month] = total_fees / total_gross if total_gross != 0 else 0
+   month = pd.to_datetime(px_df['Payout Created Date']).dt.strftime('%m/%Y')
+   monthly = px_df.groupby(month, sort=False)[['Fees', 'Gross']].sum()
 
-   return monthly_fees
+   return {month: fees / gross if gross != 0 else 0
+           for month, fees, gross in zip(monthly.index, monthly['Fees'], monthly['Gross'])}
 
 
 SPECIAL_STORES = {
@@ -582,7 +493,7 @@ def create_redemption_entries(redemptions_df, fee_percentages):
 
    return pd.DataFrame(journal_entries)
 
-def create_payout_entries(chase_df, px_df, redemptions_df):
+def create_payout_entries(chase_df, px_df, redemptions_df, fee_percentages=None):
     """Create journal entries based on Chase, Paytronix data, and redemptions data."""
     import pandas as pd
     from datetime import datetime
@@ -590,8 +501,9 @@ def create_payout_entries(chase_df, px_df, redemptions_df):
     monthly_totals = {}  # Dictionary to store monthly totals
     grand_total = 0
 
-    # Calculate fee percentages
-    fee_percentages = calculate_monthly_fee_percentages(px_df)
+    # Calculate fee percentages unless the caller already has them
+    if fee_percentages is None:
+        fee_percentages = calculate_monthly_fee_percentages(px_df)
 
     # Process Paytronix deposits first
     px_daily = px_df.groupby('Payout Created Date').agg({
@@ -600,16 +512,24 @@ def create_payout_entries(chase_df, px_df, redemptions_df):
         'Total': 'sum'
     }).reset_index()
 
-    for posting_date in chase_df['Posting Date'].unique():
+    # Line up each Chase posting date (first deposit of the day) with that day's Paytronix payouts
+    deposits = chase_df.drop_duplicates('Posting Date')[['Posting Date', 'Amount']].merge(
+        px_daily, how='left', left_on='Posting Date', right_on='Payout Created Date', indicator=True)
+    posted = pd.to_datetime(deposits['Posting Date'], format='mixed')
+    month_names = posted.dt.strftime('%B')
+    je_numbers = 'PxDep-' + posted.dt.strftime('%m%Y')
+    last_days = (posted + pd.offsets.MonthEnd(0)).dt.strftime('%m/%d/%Y')
+    has_payout = deposits['_merge'] == 'both'
+
+    for (posting_date, chase_value, month_name, je_number, last_day_of_month,
+         matched, gross, fees, total) in zip(deposits['Posting Date'], deposits['Amount'], month_names,
+                                             je_numbers, last_days, has_payout,
+                                             deposits['Gross'], deposits['Fees'], deposits['Total']):
         # Keep original sign for determining debit/credit
-        raw_chase_amount = float(chase_df[chase_df['Posting Date'] == posting_date]['Amount'].iloc[0])
+        raw_chase_amount = float(chase_value)
         chase_amount = round(abs(raw_chase_amount), 2)
-        month_name = get_month_name(posting_date)
-        je_number = f"PxDep-{get_month_year(posting_date)}"
-        last_day_of_month = get_last_day_of_month(posting_date)
-        px_entry = px_daily[px_daily['Payout Created Date'] == posting_date]
 
-        if px_entry.empty:
+        if not matched:
             entries = [
                 {
                     'JENumber': je_number,
@@ -636,10 +556,10 @@ def create_payout_entries(chase_df, px_df, redemptions_df):
             ]
         else:
             # Keep original signs for Paytronix values
-            raw_px_gross = float(px_entry['Gross'].iloc[0])
+            raw_px_gross = float(gross)
             px_gross = round(abs(raw_px_gross), 2)
-            px_fees = round(abs(float(px_entry['Fees'].iloc[0])), 2)
-            px_total = round(abs(float(px_entry['Total'].iloc[0])), 2)
+            px_fees = round(abs(float(fees)), 2)
+            px_total = round(abs(float(total)), 2)
 
             entries = [
                 {
@@ -695,17 +615,19 @@ def create_payout_entries(chase_df, px_df, redemptions_df):
 
     # Calculate monthly transfer amounts based on eGift redemptions
     # Include ALL stores (including special stores) for the transfer calculation
-    redemptions_df['Date'] = pd.to_datetime(redemptions_df['Date'])
-    redemptions_df['month'] = redemptions_df['Date'].dt.strftime('%m/%Y')
+    egift = redemptions_df[redemptions_df['Card Template'] == 'eGift']
+    month = pd.to_datetime(egift['Date']).dt.strftime('%m/%Y').rename('month')
 
     # Group by store and month first, then calculate fees and net amounts
-    store_month_amounts = redemptions_df[
-        redemptions_df['Card Template'] == 'eGift'
-    ].groupby(['Store Name', 'month'])['Dollars Redeemed'].sum().abs().round(2)
+    store_month_amounts = egift.groupby([egift['Store Name'], month])['Dollars Redeemed'].sum().abs().round(2)
+
+    # Use today's date as the reference point for next business day
+    # Get the next business day for TRANSFER-PxDep entries based on today
+    next_business_day_str = get_next_business_day(datetime.now()).strftime('%m/%d/%Y')
+    transfer_comment = f"Deposited {next_business_day_str} // Manually transferred from Chase to CNB"
 
     # Calculate monthly totals by processing each store's amounts separately
-    for month in store_month_amounts.index.get_level_values('month').unique():
-        month_stores = store_month_amounts[store_month_amounts.index.get_level_values('month') == month]
+    for month, month_stores in store_month_amounts.groupby(level='month', sort=False):
         fee_pct = fee_percentages.get(month, 0)
 
         # Calculate fees and net amounts for each store separately
@@ -715,43 +637,33 @@ def create_payout_entries(chase_df, px_df, redemptions_df):
             net_amount = round(store_amount - fee_amount, 2)
             month_total += net_amount
 
-        month_date = pd.to_datetime(month, format='%m/%Y')
-        last_day = get_last_day_of_month(month_date)
-        month_name = get_month_name(month)
-
         monthly_totals[month] = round(month_total, 2)
         grand_total += round(month_total, 2)
 
-        # Use today's date as the reference point for next business day
-        today = datetime.now()
-
-        # Get the next business day for TRANSFER-PxDep entries based on today
-        next_business_day = get_next_business_day(today)
-        next_business_day_str = next_business_day.strftime('%m/%d/%Y')
-
         # Add transfer entries - use next business day for Date
+        je_number = f"TRANSFER-PxDep-{month.replace('/', '')}"
         transfer_entries = [
             {
-                'JENumber': f"TRANSFER-PxDep-{get_month_year(last_day)}",
+                'JENumber': je_number,
                 'Date': next_business_day_str,  # Use next business day
-                'JEComment': f"Deposited {next_business_day_str} // Manually transferred from Chase to CNB",
+                'JEComment': transfer_comment,
                 'JELocation': "Carrot Leadership LLC",
                 'Account': "Savings Chase Carrot Leadership LLC",
                 'Debit': 0,
                 'Credit': month_total,
                 'DetailLocation': "Carrot Leadership LLC",
-                'DetailComment': f"Deposited {next_business_day_str} // Manually transferred from Chase to CNB"
+                'DetailComment': transfer_comment
             },
             {
-                'JENumber': f"TRANSFER-PxDep-{get_month_year(last_day)}",
+                'JENumber': je_number,
                 'Date': next_business_day_str,  # Use next business day
-                'JEComment': f"Deposited {next_business_day_str} // Manually transferred from Chase to CNB",
+                'JEComment': transfer_comment,
                 'JELocation': "Carrot Leadership LLC",
                 'Account': "Checking Carrot Leadership LLC",
                 'Debit': month_total,
                 'Credit': 0,
                 'DetailLocation': "Carrot Leadership LLC",
-                'DetailComment': f"Deposited {next_business_day_str} // Manually transferred from Chase to CNB"
+                'DetailComment': transfer_comment
             }
         ]
         journal_entries.extend(transfer_entries)
@@ -872,7 +784,7 @@ def save_all_output_files(chase_df, px_df, redemptions_df, modified_dir):
     print(f"Created redemptions file: {redemption_filename}")
 
     # 3. Create payout entries - updated to include redemptions_df
-    payout_entries, monthly_totals, grand_total = create_payout_entries(chase_df, px_df, redemptions_df)
+    payout_entries, monthly_totals, grand_total = create_payout_entries(chase_df, px_df, redemptions_df, fee_percentages)
     payout_filename = f"PX_LeadershipPayouts_{month_range}.csv"
     payout_filepath = os.path.join(modified_dir, payout_filename)
     payout_entries.to_csv(payout_filepath, index=False)
@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from shared_inputs import cached_load
+
+
+# The Chase activity export has one more field per row than header names (a trailing
+# comma), so the columns are named explicitly instead of trusting the header row
+CHASE_COLUMNS = ["Details", "Posting Date", "Description", "Amount", "Type", "Balance",
+                 "Check or Slip #", "Trailing"]
+
+PAYOUT_DTYPES = {
+    'Unnamed: 0': str,
+    'Payout ID': str,
+    'Payout Status': str,
+    'Description': str,
+    'Payout Created Date': str,
+    'Payout Arrival Date': str,
+    'Gross': str,
+    'Fees': str,
+    'Total': str
+}
+
+REDEMPTION_DTYPES = {'Store Name': str, 'Card Template': str, 'Dollars Redeemed': str, 'Date': str}
+
+def categorize_px_files(files):
+    """Split selected files into the Chase export, the Paytronix payouts and the redemption exports"""
+    chase_file = None
+    payouts_file = None
+    redemption_files = []
+
+    for file in files:
+        filename = os.path.basename(file).lower()
+        if 'chase' in filename:
+            chase_file = file
+        elif 'payout' in filename:
+            payouts_file = file
+        elif 'storedvalueredemption' in filename:
+            redemption_files.append(file)
+
+    return chase_file, payouts_file, redemption_files
+
+
+def currency_to_cents(values):
+    """Convert a column of currency text such as '$1,234.56' to nullable integer cents"""
+    import pandas as pd
+    amounts = pd.to_numeric(values.astype(str).str.replace(r'[$,\s]', '', regex=True), errors='coerce')
+    return (amounts * 100).round().astype('Int64')
+
+
+def cents_to_dollars(cents):
+    return cents.astype('float64') / 100
+
+
+def parse_chase(path):
+    """Paytronix deposits from a Chase activity export, with Amount in dollars and Amount Cents"""
+    import pandas as pd
+    chase_df = pd.read_csv(path, header=None, skiprows=1, names=CHASE_COLUMNS, index_col=False,
+                           dtype=str, skipinitialspace=True)
+    chase_df = chase_df[
+        chase_df['Description'].str.contains('ORIG CO NAME:Paytronix', case=False, na=False)
+    ].drop(columns='Trailing')
+
+    chase_df['Amount Cents'] = currency_to_cents(chase_df['Amount'])
+    chase_df['Amount'] = cents_to_dollars(chase_df['Amount Cents'])
+    return chase_df
+
+
+def parse_payouts(path):
+    """Paytronix payouts with the created date as MM/DD/YYYY and Gross, Fees and Total in dollars and cents"""
+    import pandas as pd
+    px_df = pd.read_csv(path, dtype=PAYOUT_DTYPES)
+    px_df['Payout Created Date'] = pd.to_datetime(px_df['Payout Created Date']).dt.strftime('%m/%d/%Y')
+    for col in ['Gross', 'Fees', 'Total']:
+        px_df[f'{col} Cents'] = currency_to_cents(px_df[col])
+        px_df[col] = cents_to_dollars(px_df[f'{col} Cents'])
+    return px_df
+
+
+def parse_redemptions(path):
+    """One StoredValueRedemption export, skipping its title row"""
+    import pandas as pd
+    df = pd.read_csv(path, skiprows=1, dtype=REDEMPTION_DTYPES)
+    df['Dollars Redeemed Cents'] = currency_to_cents(df['Dollars Redeemed'])
+    df['Dollars Redeemed'] = cents_to_dollars(df['Dollars Redeemed Cents'])
+    df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%m/%d/%Y')
+    return df
+
+
+def load_chase(path):
+    return cached_load(parse_chase, path)
+
+
+def load_payouts(path):
+    return cached_load(parse_payouts, path)
+
+
+def load_redemptions(paths):
+    """All redemption exports, read concurrently and combined in the order given"""
+    import pandas as pd
+    with ThreadPoolExecutor(max_workers=min(len(paths), 8) or 1) as executor:
+        frames = list(executor.map(lambda path: cached_load(parse_redemptions, path), paths))
+    return pd.concat(frames, ignore_index=True)
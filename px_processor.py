@@ -3,16 +3,17 @@ import sys
 from datetime import datetime
 from pathlib import Path
 from PyQt5.QtWidgets import (QVBoxLayout, QPushButton, QLabel,
-                            QFileDialog, QMessageBox, QTextEdit, QApplication,
+                            QFileDialog, QMessageBox, QApplication,
                             QListWidget)
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QIcon
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 
 # Import all functions from your original code
 from px_functions import (process_special_stores, save_special_stores_excel,
                         calculate_monthly_fee_percentages, create_redemption_entries,
                         create_payout_entries, create_transfer_files, create_ap_invoices, create_achb_payment)
+from px_loaders import categorize_px_files, load_chase, load_payouts, load_redemptions
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -61,7 +62,7 @@ class PXGiftCardsWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -125,9 +126,6 @@ The program will:
 
     def update_console(self, message):
         self.console_output.append(message)
-        # Scroll to bottom
-        scrollbar = self.console_output.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
 
     def processing_finished(self, success, message):
         self.run_button.setEnabled(True)
@@ -141,25 +139,13 @@ class ProcessThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
 
-    def __init__(self, files):
+    def __init__(self, files, output_root=None):
         super().__init__()
         self.files = files
+        self.output_root = output_root
 
     def categorize_files(self):
-        chase_file = None
-        payouts_file = None
-        redemption_files = []
-
-        for file in self.files:
-            filename = os.path.basename(file).lower()
-            if 'chase' in filename:
-                chase_file = file
-            elif 'payout' in filename:
-                payouts_file = file
-            elif 'storedvalueredemption' in filename:
-                redemption_files.append(file)
-
-        return chase_file, payouts_file, redemption_files
+        return categorize_px_files(self.files)
 
     def run(self):
         import pandas as pd
@@ -175,67 +161,18 @@ class ProcessThread(QThread):
             if not redemption_files:
                 raise ValueError("No StoredValueRedemption CSV files found")
 
-            # Create output directory in Downloads
-            downloads_path = str(Path.home() / "Downloads")
+            # Create output directory in Downloads unless another root was given
+            downloads_path = self.output_root or str(Path.home() / "Downloads")
             today = datetime.now().strftime('%m%d%Y')
             output_dir = os.path.join(downloads_path, f"PX Gift Cards - {today}")
             os.makedirs(output_dir, exist_ok=True)
 
             self.update_signal.emit("Processing files...")
 
-            # Load Chase data with proper parsing
-            chase_df = pd.read_csv(
-                chase_file,
-                sep=',',
-                quotechar='"',
-                dtype=str,
-                skipinitialspace=True
-            )
-
-            # Look for Paytronix in the Posting Date column where it actually appears
-            chase_df = chase_df[
-                chase_df['Posting Date'].str.contains('ORIG CO NAME:Paytronix', case=False, na=False)
-            ].copy()
-
-            # Now realign the columns properly
-            chase_df['Amount'] = pd.to_numeric(chase_df['Description'].str.strip(), errors='coerce')
-            chase_df['Posting Date'] = chase_df['Details']  # Get the actual date
-
-            # Load Paytronix data
-            px_df = pd.read_csv(
-                payouts_file,
-                dtype={
-                    'Unnamed: 0': str,
-                    'Payout ID': str,
-                    'Payout Status': str,
-                    'Description': str,
-                    'Payout Created Date': str,
-                    'Payout Arrival Date': str,
-                    'Gross': str,
-                    'Fees': str,
-                    'Total': str
-                }
-            )
-
-            # Clean up Paytronix data
-            px_df['Payout Created Date'] = pd.to_datetime(px_df['Payout Created Date']).dt.strftime('%m/%d/%Y')
-            for col in ['Gross', 'Fees', 'Total']:
-                px_df[col] = pd.to_numeric(
-                    px_df[col].astype(str).str.replace('$', '').str.replace(',', ''),
-                    errors='coerce'
-                )
-
-            # Load redemptions data
-            all_redemptions = []
-            for file in redemption_files:
-                df = pd.read_csv(
-                    file,
-                    skiprows=1,
-                    dtype={'Store Name': str, 'Card Template': str, 'Dollars Redeemed': float, 'Date': str}
-                )
-                all_redemptions.append(df)
-            redemptions_df = pd.concat(all_redemptions, ignore_index=True)
-            redemptions_df['Date'] = pd.to_datetime(redemptions_df['Date']).dt.strftime('%m/%d/%Y')
+            # Load Chase deposits, Paytronix payouts and redemptions (redemption files in parallel)
+            chase_df = load_chase(chase_file)
+            px_df = load_payouts(payouts_file)
+            redemptions_df = load_redemptions(redemption_files)
 
             # Get date range
             date_range = pd.to_datetime(redemptions_df['Date'])
@@ -263,7 +200,7 @@ class ProcessThread(QThread):
             redemption_entries.to_csv(os.path.join(output_dir, redemption_filename), index=False)
 
             # 3. Create payout entries
-            payout_entries, monthly_totals, grand_total = create_payout_entries(chase_df, px_df, redemptions_df)
+            payout_entries, monthly_totals, grand_total = create_payout_entries(chase_df, px_df, redemptions_df, fee_percentages)
 
             if payout_entries.empty:
                 self.update_signal.emit("\nWARNING: No payout entries were created!")
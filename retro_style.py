@@ -1,13 +1,14 @@
 from PyQt5.QtWidgets import QWidget, QMainWindow
 from PyQt5.QtGui import QFont, QPalette, QColor
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtWidgets import QLabel, QDialog
+from PyQt5.QtWidgets import QLabel, QDialog, QPlainTextEdit
 from PyQt5.QtGui import QPainter, QPixmap, QTransform, QPen, QRadialGradient
-from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtCore import Qt, QRect, QRectF
 import logging
 from PyQt5.QtWidgets import QSplashScreen
 import os
-from PyQt5.QtGui import QLinearGradient
+from PyQt5.QtGui import QLinearGradient, QTextCursor
+from collections import deque
 
 def create_pixel_border(widget):
     top_border = QLabel(widget)
@@ -125,10 +126,31 @@ class ScanlineEffect(QWidget):
         self.setAttribute(Qt.WA_NoSystemBackground)
         self.setStyleSheet("background: transparent;")
         self.setAutoFillBackground(False)
+        # Scanlines and vignette pre-rendered for the current size
+        self.overlay = None
         self.show()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.overlay = None
+
     def paintEvent(self, event):
+        if self.overlay is None:
+            self.overlay = self.render_overlay()
         painter = QPainter(self)
+        painter.drawPixmap(QRectF(event.rect()), self.overlay, self.overlay_rect(event.rect()))
+
+    def overlay_rect(self, rect):
+        """Map a widget rect to the overlay pixmap, which is in device pixels"""
+        ratio = self.overlay.devicePixelRatio()
+        return QRectF(rect.x() * ratio, rect.y() * ratio, rect.width() * ratio, rect.height() * ratio)
+
+    def render_overlay(self):
+        ratio = self.devicePixelRatioF()
+        overlay = QPixmap(max(1, round(self.width() * ratio)), max(1, round(self.height() * ratio)))
+        overlay.setDevicePixelRatio(ratio)
+        overlay.fill(Qt.transparent)
+        painter = QPainter(overlay)
 
         # Draw scanlines more visibly
         width = self.width()
@@ -159,6 +181,68 @@ class ScanlineEffect(QWidget):
         painter.setBrush(gradient)
         painter.setPen(Qt.NoPen)
         painter.drawRect(0, 0, width, height)
+        painter.end()
+        return overlay
+
+class RetroConsole(QPlainTextEdit):
+    """
+    Read-only log console for pipeline windows. Messages are queued and written in one
+    batch per flush interval, only the last max_lines lines are kept, and the blinking
+    cursor is painted over the text instead of being part of it.
+    """
+
+    def __init__(self, parent=None, max_lines=5000, flush_interval=50, blink_interval=530):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+
+        # Lines waiting for the next flush; a burst beyond max_lines would be trimmed anyway
+        self.pending = deque(maxlen=max_lines)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.cursor_visible = True
+        self.blink_timer = QTimer(self)
+        self.blink_timer.timeout.connect(self._blink_cursor)
+        self.blink_timer.start(blink_interval)
+
+    def append(self, message):
+        self.pending.append(str(message))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if self.pending:
+            text = "\n".join(self.pending)
+            self.pending.clear()
+            # Keeps the view pinned to the bottom if it was already there
+            self.appendPlainText(text)
+
+    def clear(self):
+        self.pending.clear()
+        super().clear()
+
+    def toPlainText(self):
+        self.flush()
+        return super().toPlainText()
+
+    def _cursor_rect(self):
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        rect = self.cursorRect(cursor)
+        return QRect(rect.left(), rect.top(), self.fontMetrics().horizontalAdvance("█"), rect.height())
+
+    def _blink_cursor(self):
+        self.cursor_visible = not self.cursor_visible
+        self.viewport().update(self._cursor_rect())
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.cursor_visible:
+            painter = QPainter(self.viewport())
+            painter.fillRect(self._cursor_rect(), self.palette().color(QPalette.Text))
 
 class RetroDialog(QDialog):
     def __init__(self, *args, **kwargs):
@@ -204,10 +288,6 @@ class RetroWindow(QMainWindow):
         self.scanlines.setGeometry(0, 0, self.width(), self.height())
         self.scanlines.raise_() #to make visible over all other elements
 
-        # Then add other elements
-        if hasattr(self, 'console_output'):
-            self.setup_blinking_cursor()
-
         # Make sure scanlines are on top again after decorations
         if hasattr(self, 'scanlines'):
             self.scanlines.raise_()
@@ -379,7 +459,7 @@ class RetroWindow(QMainWindow):
                 border-style: inset;
                 padding: 12px 8px 8px 12px;
             }
-            QTextEdit, QListWidget {
+            QTextEdit, QPlainTextEdit, QListWidget {
                 background-color: #2A0A29;
                 color: #FFFFFF;
                 border: 2px solid #4B0082;
@@ -408,10 +488,7 @@ class RetroWindow(QMainWindow):
 
     def update_console(self, message):
         if hasattr(self, 'console_output'):
-            current_text = self.console_output.toPlainText()
-            if current_text.endswith("█") or current_text.endswith(" "):
-                current_text = current_text[:-1]
-            self.console_output.setPlainText(current_text + "\n" + message + "█")
+            self.console_output.append(message)
 
 def create_retro_central_widget(window):
     central_widget = QWidget(window)
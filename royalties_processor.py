@@ -1,12 +1,13 @@
 import csv
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 import re
 from pathlib import Path
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
+from excel_styles import StyleRegistry, THIN_BOX, style_range
 from PyQt5.QtCore import QThread, pyqtSignal
 
 LOCATION_DICT = {
@@ -42,6 +43,16 @@ CARROT_LOVE_LOCATIONS = ["North Beach", "Aventura (Miami Gardens)", "Coral Gable
 SOUTH_BEACH_LOCATIONS = ["South Beach"]
 PLANTATION_LOCATIONS = ["Plantation"]
 
+# P&L line items we use, matched as substrings of gaName3
+PROFIT_LOSS_LINE_ITEMS = {
+    'net_sales': 'Total Sales',
+    'uber_sales': 'Total UberEats Sales',
+    'delivery_fee': 'Delivery Fee Income',
+    'ez_catering': 'Ez catering',
+    'uber_discount': 'UberEats Discount',
+    'grubhub_sales': 'Total Grubhub Sales',
+}
+
 class RoyaltiesProcessThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
@@ -81,7 +92,8 @@ class RoyaltiesProcessThread(QThread):
             r365_sales_tax_data, r365_resort_tax_data = process_gl_data(gl_files)
 
             self.log_message("Processing profit and loss data...")
-            export_data = process_profit_loss_data(profit_loss_files)
+            profit_loss = parse_profit_loss(profit_loss_files)
+            export_data = process_profit_loss_data(profit_loss)
 
             self.log_message("Processing tax-exempt data...")
             tax_exempt_data = process_tax_exempt_data(tax_files)
@@ -92,13 +104,13 @@ class RoyaltiesProcessThread(QThread):
             self.log_message("Processing UberEats, GrubHub, and other delivery data...")
             uber_sales = process_uber_orders(order_files)
             grubhub_sales = process_grubhub_orders(order_files)
-            profit_metrics = get_profit_metrics(profit_loss_files)
+            profit_metrics = get_profit_metrics(profit_loss)
 
             # Process UE data
             ue_sales, ue_refunds, ue_discount, ue_sales_tax = process_ue_data(ue_files)
 
             # Add UE data to additional metrics
-            additional_metrics = get_additional_metrics(profit_loss_files, doordash_files, grubhub_files, order_files)
+            additional_metrics = get_additional_metrics(profit_loss, doordash_files, grubhub_files, order_files)
             additional_metrics['ue_sales'] = ue_sales
             additional_metrics['ue_refunds'] = ue_refunds
             additional_metrics['ue_discount'] = ue_discount
@@ -110,15 +122,19 @@ class RoyaltiesProcessThread(QThread):
             Path(output_dir).mkdir(parents=True, exist_ok=True)
 
             # Save reports
+            # Compute per-location metrics once; the summary and both invoice files render from them
+            self.log_message("Computing per-location royalties metrics...")
+            location_metrics = build_location_metrics(sales_data, uber_sales, grubhub_sales, profit_metrics, additional_metrics, export_data,
+                                                      tax_exempt_data, order_data, r365_sales_tax_data, r365_resort_tax_data)
+
             self.log_message("Generating royalties summary report...")
-            save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics, additional_metrics, export_data,
-                                 tax_exempt_data, order_data, r365_sales_tax_data, r365_resort_tax_data, earliest_date, latest_date, output_dir)
+            save_royalties_report(location_metrics, earliest_date, latest_date, output_dir)
 
             self.log_message("Generating AR invoices...")
-            ar_path = generate_ar_invoices(sales_data, uber_sales, profit_metrics, additional_metrics, export_data, r365_sales_tax_data, earliest_date, latest_date, output_dir)
+            ar_path = generate_ar_invoices(location_metrics, earliest_date, latest_date, output_dir)
 
             self.log_message("Generating AP invoices...")
-            ap_path = generate_ap_invoices(sales_data, uber_sales, profit_metrics, additional_metrics, export_data, r365_sales_tax_data, earliest_date, latest_date, output_dir)
+            ap_path = generate_ap_invoices(location_metrics, earliest_date, latest_date, output_dir)
 
             self.log_message("Adding Tax tab and reordering tabs...")
             royalties_path = add_tax_tab_and_reorder(sales_data, order_data, tax_exempt_data, profit_metrics, earliest_date, latest_date, output_dir)
@@ -236,9 +252,13 @@ def process_gl_data(gl_files):
     # Return both dictionaries
     return r365_sales_tax_by_location, r365_resort_tax_by_location
 
-def process_profit_loss_data(profit_loss_files):
-    profit_loss_by_location = defaultdict(float)
-    processed_locations = set()
+def parse_profit_loss(profit_loss_files):
+    """
+    Read the Profit & Loss exports once into a line item x location matrix.
+    The first value found for a location wins, matching the per-metric scans it replaces.
+    """
+    matrix = {item: defaultdict(float) for item in PROFIT_LOSS_LINE_ITEMS}
+    processed = {item: set() for item in PROFIT_LOSS_LINE_ITEMS}
 
     for file in profit_loss_files:
         rows = read_csv_with_encoding(file)
@@ -247,28 +267,33 @@ def process_profit_loss_data(profit_loss_files):
         ganame_index = headers.index('gaName3')
         location_index = headers.index('ColumnGroupLabel')
         value_index = headers.index('ValueDisplay3')
+        min_length = max(ganame_index, location_index, value_index) + 1
 
         for row in rows[4:]:  # Start after headers
-            if not row or len(row) <= max(ganame_index, location_index, value_index):
+            if len(row) < min_length:
                 continue
 
             ganame = row[ganame_index].strip()
-            location = row[location_index].strip()
-
-            # Skip if not "Total Sales" or location already processed
-            if 'Total Sales' not in ganame or location in processed_locations:
+            items = [item for item, label in PROFIT_LOSS_LINE_ITEMS.items() if label in ganame]
+            if not items:
                 continue
 
+            location = row[location_index].strip()
             try:
                 # Remove $ and , from value and convert to float
-                value_str = row[value_index].strip().replace('$', '').replace(',', '')
-                net_sales = float(value_str)
-                profit_loss_by_location[location] = net_sales
-                processed_locations.add(location)
-            except (ValueError, IndexError):
+                value = float(row[value_index].strip().replace('$', '').replace(',', ''))
+            except ValueError:
                 continue
 
-    return profit_loss_by_location
+            for item in items:
+                if location not in processed[item]:
+                    matrix[item][location] = value
+                    processed[item].add(location)
+
+    return matrix
+
+def process_profit_loss_data(profit_loss):
+    return profit_loss['net_sales']
 
 def process_uber_orders(order_files):
     uber_sales_by_location = defaultdict(float)
@@ -293,51 +318,8 @@ def process_uber_orders(order_files):
 
     return uber_sales_by_location
 
-def get_profit_metrics(profit_loss_files):
-    metrics = {
-        'uber_sales': defaultdict(float),
-        'delivery_fee': defaultdict(float),
-        'ez_catering': defaultdict(float),
-        'uber_discount': defaultdict(float)
-    }
-    processed_locations = {metric: set() for metric in metrics.keys()}
-
-    for file in profit_loss_files:
-        rows = read_csv_with_encoding(file)
-        headers = rows[3]
-
-        ganame_index = headers.index('gaName3')
-        location_index = headers.index('ColumnGroupLabel')
-        value_index = headers.index('ValueDisplay3')
-
-        for row in rows[4:]:
-            if not row:
-                continue
-
-            ganame = row[ganame_index].strip()
-            location = row[location_index].strip()
-
-            try:
-                value_str = row[value_index].strip().replace('$', '').replace(',', '')
-                value = float(value_str)
-
-                # Use "Total UberEats Sales" instead of "UberEats Sales"
-                if 'Total UberEats Sales' in ganame and location not in processed_locations['uber_sales']:
-                    metrics['uber_sales'][location] = value
-                    processed_locations['uber_sales'].add(location)
-                elif 'Delivery Fee Income' in ganame and location not in processed_locations['delivery_fee']:
-                    metrics['delivery_fee'][location] = value
-                    processed_locations['delivery_fee'].add(location)
-                elif 'Ez catering' in ganame and location not in processed_locations['ez_catering']:
-                    metrics['ez_catering'][location] = value
-                    processed_locations['ez_catering'].add(location)
-                elif 'UberEats Discount' in ganame and location not in processed_locations['uber_discount']:
-                    metrics['uber_discount'][location] = value
-                    processed_locations['uber_discount'].add(location)
-            except ValueError:
-                continue
-
-    return metrics
+def get_profit_metrics(profit_loss):
+    return {metric: profit_loss[metric] for metric in ['uber_sales', 'delivery_fee', 'ez_catering', 'uber_discount']}
 
 def process_grubhub_orders(order_files):
     """Process order files to get Grubhub orders total"""
@@ -533,42 +515,15 @@ def process_ue_data(ue_files):
 
     return ue_sales_by_location, ue_refunds_by_location, ue_discount_by_location, ue_sales_tax_by_location
 
-def get_additional_metrics(profit_loss_files, doordash_files, grubhub_files, order_files):
+def get_additional_metrics(profit_loss, doordash_files, grubhub_files, order_files):
     """Get additional metrics for New York locations"""
 
-    # Get metrics from profit loss files
+    # Only Grubhub sales come from the P&L; the rest come from the other files
     metrics = {
-        'grubhub_sales': defaultdict(float),
+        'grubhub_sales': profit_loss['grubhub_sales'],
         'doordash_sales': defaultdict(float),
         'third_parties': defaultdict(float)
     }
-    processed_locations = {metric: set() for metric in metrics.keys()}
-
-    for file in profit_loss_files:
-        rows = read_csv_with_encoding(file)
-        headers = rows[3]
-
-        ganame_index = headers.index('gaName3')
-        location_index = headers.index('ColumnGroupLabel')
-        value_index = headers.index('ValueDisplay3')
-
-        for row in rows[4:]:
-            if not row:
-                continue
-
-            ganame = row[ganame_index].strip()
-            location = row[location_index].strip()
-
-            try:
-                value_str = row[value_index].strip().replace('$', '').replace(',', '')
-                value = float(value_str)
-
-                if 'Total Grubhub Sales' in ganame and location not in processed_locations['grubhub_sales']:
-                    metrics['grubhub_sales'][location] = value
-                    processed_locations['grubhub_sales'].add(location)
-                # We'll get additional metrics from the other files instead
-            except ValueError:
-                continue
 
     # Get DoorDash sales, refunds, and discounts from DoorDash files
     doordash_sales, doordash_refunds, doordash_discounts = process_doordash_data(doordash_files)
@@ -626,7 +581,163 @@ def process_order_data_for_tax(order_files):
 
     return all_orders
 
-def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics, additional_metrics, export_data, tax_exempt_data, order_data, r365_sales_tax_data, r365_resort_tax_data, earliest_date, latest_date, output_dir):
+def summarize_order_taxes(order_data):
+    """Sum Toast order tax per location in one pass: (total tax, UberEats tax)"""
+    total_tax_by_location = defaultdict(float)
+    uber_tax_by_location = defaultdict(float)
+
+    for row in order_data:
+        location = row['Location']
+        tax = float(row['Tax'])
+        total_tax_by_location[location] += tax
+        if row['Dining Options'] in ['UberEats (Pickup)', 'Uber Eats - Delivery!']:
+            uber_tax_by_location[location] += tax
+
+    return total_tax_by_location, uber_tax_by_location
+
+def compute_location_metrics(location, toast_sales, inputs):
+    """
+    Compute every per-location figure used by the royalties summary and the AR/AP invoices.
+    Only reads from the shared inputs, so locations can be computed concurrently.
+    """
+    profit_metrics = inputs['profit_metrics']
+    additional_metrics = inputs['additional_metrics']
+    export_data = inputs['export_data']
+    r365_sales_tax_data = inputs['r365_sales_tax_data']
+    gl_location = LOCATION_DICT.get(location, location)
+
+    m = {'location': location, 'gl_location': gl_location, 'toast_sales': toast_sales}
+
+    m['uber_sales_toast'] = inputs['uber_sales'].get(location, 0)
+    m['uber_sales_r365'] = additional_metrics['ue_sales'].get(gl_location, 0)
+    m['uber_refunds'] = additional_metrics['ue_refunds'].get(gl_location, 0)
+    m['uber_discount'] = additional_metrics['ue_discount'].get(gl_location, 0)
+    m['ue_sales_tax'] = additional_metrics['ue_sales_tax'].get(gl_location, 0)
+    m['uber_sales_total'] = m['uber_sales_r365'] + m['uber_refunds'] + m['uber_discount']
+    m['ez_catering'] = profit_metrics['ez_catering'].get(gl_location, 0)
+    m['net_sales_pnl'] = export_data.get(gl_location, 0)
+
+    # Delivery partner figures (only reported for New York locations)
+    m['grubhub_toast'] = inputs['grubhub_sales'].get(location, 0)
+    m['grubhub_r365'] = additional_metrics['grubhub_sales'].get(gl_location, 0)
+    m['grubhub_delivery_fees'] = additional_metrics['grubhub_delivery_fees'].get(gl_location, 0)
+    m['grubhub_promotions'] = additional_metrics['grubhub_promotions'].get(gl_location, 0)
+    m['grubhub_refunds'] = additional_metrics['grubhub_refunds'].get(gl_location, 0)
+    m['grubhub_sales_total'] = m['grubhub_r365'] + m['grubhub_promotions'] + m['grubhub_refunds']
+    m['doordash_sales'] = additional_metrics['doordash_sales'].get(gl_location, 0)
+    m['doordash_refunds'] = additional_metrics['doordash_refunds'].get(gl_location, 0)
+    m['doordash_discounts'] = additional_metrics['doordash_discounts'].get(gl_location, 0)
+    m['third_parties'] = additional_metrics['third_parties'].get(location, 0)
+
+    # Delivery fee: Plantation includes the Plantation Walk payable, NY (except Bryant Park)
+    # displays it net of Grubhub delivery fees
+    delivery_fee = profit_metrics['delivery_fee'].get(gl_location, 0)
+    m['plantation_payable'] = 0
+    if location in PLANTATION_LOCATIONS:
+        m['plantation_payable'] = r365_sales_tax_data.get("Plantation_Payable", 0)
+        delivery_fee += m['plantation_payable']
+    m['delivery_fee'] = delivery_fee
+    if location in NEW_YORK_LOCATIONS and location != "Bryant Park":
+        m['delivery_fee_display'] = delivery_fee - m['grubhub_delivery_fees']
+    else:
+        m['delivery_fee_display'] = delivery_fee
+
+    # Leadership fees
+    m['cleadership_fee'] = round((m['net_sales_pnl'] - delivery_fee) * 0.02, 2)
+    m['leadership_fee'] = round(m['uber_sales_total'] * 0.01, 2) if location == "Midtown" else 0
+
+    # Royalties
+    if location in NEW_YORK_LOCATIONS:
+        doordash_total = m['doordash_sales'] + m['doordash_refunds'] + m['doordash_discounts']
+        m['sales_wo_3rd'] = (m['net_sales_pnl'] - delivery_fee - m['uber_sales_total'] - m['grubhub_sales_total']
+                             - doordash_total - m['third_parties'])
+        royalty_5_percent = m['sales_wo_3rd'] * 0.05
+        royalty_3_percent_uber = m['uber_sales_total'] * 0.03
+        royalty_3_percent_grubhub = m['grubhub_sales_total'] * 0.03
+        royalty_3_percent_third = (m['third_parties'] + m['doordash_sales'] + m['doordash_refunds'] + m['doordash_discounts']) * 0.03
+        m['total_royalty'] = round(royalty_5_percent + royalty_3_percent_uber + royalty_3_percent_grubhub + royalty_3_percent_third, 2)
+    else:
+        m['sales_wo_3rd'] = m['net_sales_pnl'] - delivery_fee - m['uber_sales_total'] - m['ez_catering']
+        royalty_5_percent = m['sales_wo_3rd'] * 0.05
+        royalty_3_percent_uber = m['uber_sales_total'] * 0.03
+        royalty_3_percent_ez = m['ez_catering'] * 0.03
+        m['total_royalty'] = round(royalty_5_percent + royalty_3_percent_uber + royalty_3_percent_ez, 2)
+
+    # Tax figures
+    m['non_taxable'] = inputs['tax_exempt_data'].get(location, 0)
+    if location in PLANTATION_LOCATIONS:
+        m['sales_reported'] = m['net_sales_pnl'] - m['uber_sales_total'] + m['non_taxable'] + m['plantation_payable']
+    elif location in NEW_YORK_LOCATIONS:
+        m['sales_reported'] = m['net_sales_pnl'] + m['non_taxable']
+    else:
+        m['sales_reported'] = m['net_sales_pnl'] - m['uber_sales_total'] + m['non_taxable']
+
+    if location in NEW_YORK_LOCATIONS:
+        m['tax_rate'] = 0.08875  # 8.875% for New York
+        m['tax_name'] = '8.875%'
+    else:
+        m['tax_rate'] = 0.07  # 7% for other locations
+        m['tax_name'] = '7%'
+    m['tax_amount'] = round(m['sales_reported'] * m['tax_rate'], 2)
+
+    m['total_tax'] = inputs['total_tax_by_location'].get(location, 0)
+    standard_uber_tax = -inputs['uber_tax_by_location'].get(location, 0)
+    if location in NEW_YORK_LOCATIONS:
+        m['tax_on_promotions'] = round((m['uber_refunds'] + m['uber_discount'] + m['grubhub_promotions']) * m['tax_rate'], 2)
+        m['uber_tax'] = m['tax_on_promotions']
+    else:
+        m['tax_on_promotions'] = 0
+        m['uber_tax'] = standard_uber_tax
+    m['tax_reported'] = m['total_tax'] + m['uber_tax']
+
+    m['r365_sales_tax_payable'] = r365_sales_tax_data.get(gl_location, 0)
+    m['r365_resort_tax_payable'] = inputs['r365_resort_tax_data'].get(gl_location, 0)
+
+    # Carrot Love FDOR figures are based on the P&L UberEats lines rather than the UE file
+    if location in CARROT_LOVE_LOCATIONS:
+        uber_sales_r365_pnl = profit_metrics['uber_sales'].get(gl_location, 0)
+        uber_discount_pnl = profit_metrics['uber_discount'].get(gl_location, 0)
+        uber_refunds_pnl = -abs(toast_sales + m['uber_sales_toast'] + uber_sales_r365_pnl +
+                                uber_discount_pnl - m['net_sales_pnl'])
+        m['fdor_uber_sales_total'] = uber_sales_r365_pnl + uber_refunds_pnl + uber_discount_pnl
+        m['fdor_sales_reported'] = m['net_sales_pnl'] - m['fdor_uber_sales_total']
+
+    return m
+
+def build_location_metrics(sales_data, uber_sales, grubhub_sales, profit_metrics, additional_metrics, export_data,
+                           tax_exempt_data, order_data, r365_sales_tax_data, r365_resort_tax_data):
+    """
+    Build the per-location metrics model shared by the royalties summary, AR invoices and AP invoices.
+    Returns a dict keyed by location in the same order as sales_data.
+    """
+    total_tax_by_location, uber_tax_by_location = summarize_order_taxes(order_data)
+    inputs = {
+        'uber_sales': uber_sales,
+        'grubhub_sales': grubhub_sales,
+        'profit_metrics': profit_metrics,
+        'additional_metrics': additional_metrics,
+        'export_data': export_data,
+        'tax_exempt_data': tax_exempt_data,
+        'r365_sales_tax_data': r365_sales_tax_data,
+        'r365_resort_tax_data': r365_resort_tax_data,
+        'total_tax_by_location': total_tax_by_location,
+        'uber_tax_by_location': uber_tax_by_location
+    }
+
+    locations = list(sales_data.items())
+    with ThreadPoolExecutor() as executor:
+        results = executor.map(lambda item: compute_location_metrics(item[0], item[1], inputs), locations)
+        location_metrics = {m['location']: m for m in results}
+
+    # North Beach reports the FDOR totals for all Carrot Love locations
+    if "North Beach" in location_metrics:
+        carrot_love_metrics = [m for m in location_metrics.values() if m['location'] in CARROT_LOVE_LOCATIONS]
+        location_metrics["North Beach"]['combined_non_taxable'] = sum(m['non_taxable'] for m in carrot_love_metrics)
+        location_metrics["North Beach"]['combined_sales_reported'] = sum(m['fdor_sales_reported'] for m in carrot_love_metrics)
+
+    return location_metrics
+
+def save_royalties_report(location_metrics, earliest_date, latest_date, output_dir):
     output_filename = f"Royalties_Summary_{earliest_date.strftime('%m%d%Y')}-{latest_date.strftime('%m%d%Y')}.xlsx"
     output_path = os.path.join(output_dir, output_filename)
 
@@ -634,136 +745,83 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
     wb.remove(wb.active)
 
     headers = ['Metric', 'Amount']
-    header_fill = PatternFill(start_color='CCCCCC', end_color='CCCCCC', fill_type='solid')
-    yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-
-    thin_border = Border(left=Side(style='thin'),
-                        right=Side(style='thin'),
-                        top=Side(style='thin'),
-                        bottom=Side(style='thin'))
 
     # Styles for positive and negative numbers
     positive_format = '#,##0.00'
     negative_format = '[Red]#,##0.00'
 
-    # Store FDOR tax values for Carrot Love locations
-    carrot_love_tax_data = {}
-    # Store Tax Reported values for Carrot Love locations
-    carrot_love_tax_reported = {}
-
-    # First pass to collect necessary data for Carrot Love locations
-    for location, toast_sales in sales_data.items():
-        if location in CARROT_LOVE_LOCATIONS:
-            gl_location = LOCATION_DICT.get(location, location)
-
-            # Calculate tax values needed for North Beach
-            non_taxable = tax_exempt_data.get(location, 0)
-            uber_sales_r365 = profit_metrics['uber_sales'].get(gl_location, 0)
-            uber_refunds = -abs(toast_sales + uber_sales.get(location, 0) + uber_sales_r365 +
-                            profit_metrics['uber_discount'].get(gl_location, 0) - export_data.get(gl_location, 0))
-            uber_discount = profit_metrics['uber_discount'].get(gl_location, 0)
-            uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-            net_sales_pnl = export_data.get(gl_location, 0)
-
-            # Calculate sales_reported as Net Sales PNL - UberEats total
-            sales_reported = net_sales_pnl - uber_sales_total
-            tax_seven_percent = round(sales_reported * 0.07, 2)
-
-            # Get Total Tax for this location
-            total_tax = sum(float(row['Tax']) for row in order_data if row['Location'] == location)
-
-            # Calculate UberEats Tax
-            uber_tax = -sum(float(row['Tax'])
-                        for row in order_data
-                        if row['Location'] == location
-                        and row['Dining Options'] in ['UberEats (Pickup)', 'Uber Eats - Delivery!'])
-
-            # Calculate Tax Reported
-            tax_reported = total_tax + uber_tax
-
-            carrot_love_tax_data[location] = {
-                'non_taxable': non_taxable,
-                'sales_reported': sales_reported,
-                'tax_seven_percent': tax_seven_percent,
-                'net_sales_pnl': net_sales_pnl,
-                'uber_sales_total': uber_sales_total
-            }
-
-            carrot_love_tax_reported[location] = tax_reported
-
-    # Calculate the sum of Tax Reported for all Carrot Love locations
-    all_carrot_love_tax_reported = sum(reported for location, reported in carrot_love_tax_reported.items())
+    # Every cell format is registered once on the workbook and referenced by name
+    styles = StyleRegistry(wb)
+    header_style = styles.style('Royalty Header', bold=True, fill='CCCCCC', border=THIN_BOX)
+    section_style = styles.style('Royalty Section', bold=True, fill='CCCCCC', border=THIN_BOX, align='center')
+    cell_style = styles.style('Royalty Cell', border=THIN_BOX)
+    bold_cell_style = styles.style('Royalty Bold Cell', bold=True, border=THIN_BOX)
+    amount_style = styles.style('Royalty Amount', border=THIN_BOX, number_format=positive_format)
+    negative_style = styles.style('Royalty Negative Amount', border=THIN_BOX, number_format=negative_format)
+    input_style = styles.style('Royalty Input', fill='FFFF00', border=THIN_BOX)
+    highlight_style = styles.style('Royalty Highlight', fill='FFFF00', border=THIN_BOX, number_format=positive_format)
+    total_style = styles.style('Royalty Total', bold=True, fill='FFFF00', border=THIN_BOX)
+    note_style = styles.style('Royalty Note', align='left')
+
+    def value_style(value):
+        # Formulas and blanks default to the positive format
+        if isinstance(value, (int, float)) and value < 0:
+            return negative_style
+        return amount_style
+
+    def write_section_header(ws, row, col, title):
+        ws.merge_cells(start_row=row, start_column=col, end_row=row, end_column=col + 1)
+        ws.cell(row=row, column=col, value=title).style = section_style
+        ws.cell(row=row, column=col + 1).style = cell_style
+
+    def write_rows(ws, start_row, col, rows):
+        for row_idx, (label, value) in enumerate(rows, start_row):
+            ws.cell(row=row_idx, column=col, value=label).style = cell_style
+            ws.cell(row=row_idx, column=col + 1, value=value).style = value_style(value)
 
     # Main processing loop for all locations
-    for location, toast_sales in sales_data.items():
+    for location, m in location_metrics.items():
         ws = wb.create_sheet(location)
-        gl_location = LOCATION_DICT.get(location, location)
 
         # Set headers for main table
         for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = header_fill
-            cell.border = thin_border
+            ws.cell(row=1, column=col, value=header).style = header_style
 
         # Get metrics
-        uber_sales_toast = uber_sales.get(location, 0)
-        uber_sales_r365 = additional_metrics['ue_sales'].get(gl_location, 0)
-        delivery_fee = profit_metrics['delivery_fee'].get(gl_location, 0)
-        ez_catering = profit_metrics['ez_catering'].get(gl_location, 0)
-        uber_discount = additional_metrics['ue_discount'].get(gl_location, 0)
-        net_sales_pnl = export_data.get(gl_location, 0)
-
-       # Get UberEats Refunds from UE file
-        uber_refunds = additional_metrics['ue_refunds'].get(gl_location, 0)
+        toast_sales = m['toast_sales']
+        uber_sales_toast = m['uber_sales_toast']
+        uber_sales_r365 = m['uber_sales_r365']
+        delivery_fee = m['delivery_fee']
+        ez_catering = m['ez_catering']
+        uber_discount = m['uber_discount']
+        uber_refunds = m['uber_refunds']
+        net_sales_pnl = m['net_sales_pnl']
+        plantation_payable = m['plantation_payable']
 
         # Special handling for New York locations
         if location in NEW_YORK_LOCATIONS:
-            # Get additional metrics for New York
-            grubhub_toast = grubhub_sales.get(location, 0)
-            grubhub_r365 = additional_metrics['grubhub_sales'].get(gl_location, 0)
-            doordash_sales = additional_metrics['doordash_sales'].get(gl_location, 0)
-            doordash_refunds = additional_metrics['doordash_refunds'].get(gl_location, 0)
-            doordash_discounts = additional_metrics['doordash_discounts'].get(gl_location, 0)
-            grubhub_refunds = additional_metrics['grubhub_refunds'].get(gl_location, 0)
-
-            # Get grubhub delivery fees and promotions
-            grubhub_delivery_fees = additional_metrics['grubhub_delivery_fees'].get(gl_location, 0)
-            grubhub_promotions = additional_metrics['grubhub_promotions'].get(gl_location, 0)
-            third_parties = additional_metrics['third_parties'].get(location, 0)
-
-            # For non-Bryant Park NY locations, calculate adjusted delivery fee
-            if location != "Bryant Park":
-                delivery_fee_display = delivery_fee - grubhub_delivery_fees
-            else:
-                delivery_fee_display = delivery_fee
-
             # Build main_data array with proper values
             main_data = [
                 ['Toast Net Sales', toast_sales],
                 ['UberEats Sales - Toast', uber_sales_toast],
                 ['UberEats Sales - R365', uber_sales_r365],
-                ['Delivery Fee Income', delivery_fee_display],
+                ['Delivery Fee Income', m['delivery_fee_display']],
                 ['Ez Catering', ez_catering],
                 ['UberEats Refunds', uber_refunds],
                 ['UberEats Discount', uber_discount],
-                ['Grubhub Toast', grubhub_toast],
-                ['Grubhub R365', grubhub_r365],
-                ['DoorDash Sales', doordash_sales],
-                ['DoorDash Discount', doordash_discounts],  # Add this line
-                ['DoorDash Refunds', doordash_refunds],
-                ['Grubhub Delivery Fees', grubhub_delivery_fees],
-                ['Grubhub Promotions', grubhub_promotions],
-                ['Grubhub Refunds', grubhub_refunds],
-                ['Third Parties', third_parties],
+                ['Grubhub Toast', m['grubhub_toast']],
+                ['Grubhub R365', m['grubhub_r365']],
+                ['DoorDash Sales', m['doordash_sales']],
+                ['DoorDash Discount', m['doordash_discounts']],  # Add this line
+                ['DoorDash Refunds', m['doordash_refunds']],
+                ['Grubhub Delivery Fees', m['grubhub_delivery_fees']],
+                ['Grubhub Promotions', m['grubhub_promotions']],
+                ['Grubhub Refunds', m['grubhub_refunds']],
+                ['Third Parties', m['third_parties']],
                 ['Net Sales PNL', net_sales_pnl]
             ]
         else:
-            # Special handling for Plantation - add Plantation Walk Payable to Delivery Fee
-            if location in PLANTATION_LOCATIONS:
-                plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
-                delivery_fee += plantation_payable  # Add plantation payable to delivery fee
-            # Standard data for non-New York locations
+            # Standard data for non-New York locations (Plantation's delivery fee includes the Plantation Walk payable)
             main_data = [
                 ['Toast Net Sales', toast_sales],
                 ['UberEats Sales - Toast', uber_sales_toast],
@@ -773,7 +831,6 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
 
             # Add Non-Grat Svc Charges for Plantation location
             if location in PLANTATION_LOCATIONS:
-                plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
                 # Insert right after Delivery Fee Income with negative value
                 main_data.append(['Non-Grat Svc Charges', -plantation_payable])
 
@@ -786,7 +843,6 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
 
             # Add Plantation Walk Payable for Plantation location (keeping this code as it was)
             if location in PLANTATION_LOCATIONS:
-                plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
                 # Insert before Net Sales PNL
                 main_data.append(['Plantation Walk Shops 1%', plantation_payable])
 
@@ -796,13 +852,8 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
         # Write main data with conditional formatting
         for row_idx, (metric, amount) in enumerate(main_data, 2):
             metric_cell = ws.cell(row=row_idx, column=1, value=metric)
-            metric_cell.border = thin_border
-            if metric == 'Net Sales PNL':
-                metric_cell.font = Font(bold=True)  # Bold "Net Sales PNL"
-
-            amount_cell = ws.cell(row=row_idx, column=2, value=amount)
-            amount_cell.border = thin_border
-            amount_cell.number_format = positive_format if amount >= 0 else negative_format
+            metric_cell.style = bold_cell_style if metric == 'Net Sales PNL' else cell_style  # Bold "Net Sales PNL"
+            ws.cell(row=row_idx, column=2, value=amount).style = value_style(amount)
 
         # Add leadership table - fixed position to align with the end of the main data table
         if location in ["Midtown", "Miami Shores"]:
@@ -816,10 +867,7 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
             leadership_row = len(main_data) + 1  # Position after main data
 
         for col, header in enumerate(leadership_headers, 3):
-            cell = ws.cell(row=leadership_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = header_fill
-            cell.border = thin_border
+            ws.cell(row=leadership_row, column=col, value=header).style = header_style
 
         # Calculate leadership values with updated formula
         if location in NEW_YORK_LOCATIONS and location != "Bryant Park":
@@ -835,65 +883,25 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
             # Standard formula for other locations
             leadership_cell = ws.cell(row=leadership_row + 1, column=3, value="=(B" + str(main_data[-1][0] == 'Net Sales PNL' and row_idx or row_idx-1) + "-B" + str(main_data[3][0] == 'Delivery Fee Income' and 5 or 4) + ")*0.02")
 
-        leadership_cell.number_format = positive_format
-        leadership_cell.border = thin_border
+        leadership_cell.style = amount_style
 
         if location in ["Midtown", "Miami Shores"]:
             next_leadership_cell = ws.cell(row=leadership_row + 1, column=4, value="=(B" + str(main_data[2][0] == 'UberEats Sales - R365' and 4 or 3) + "+B" + str(main_data[5][0] == 'UberEats Refunds' and 7 or 6) + "+B" + str(main_data[6][0] == 'UberEats Discount' and 8 or 7) + ")*0.01")
-            next_leadership_cell.number_format = positive_format
-            next_leadership_cell.border = thin_border
+            next_leadership_cell.style = amount_style
 
         # Base values for tax tables
-        non_taxable = tax_exempt_data.get(location, 0)
-        uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
+        non_taxable = m['non_taxable']
+        sales_reported = m['sales_reported']
+        tax_amount = m['tax_amount']
 
-        # Different sales_reported calculation based on location
-        if location in PLANTATION_LOCATIONS:
-            plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
-            sales_reported = net_sales_pnl - uber_sales_total + non_taxable + plantation_payable
-        elif location in NEW_YORK_LOCATIONS:
-            # Modified calculation for New York locations
-            sales_reported = net_sales_pnl + non_taxable
-        else:
-            sales_reported = net_sales_pnl - uber_sales_total + non_taxable
-
-        # Tax rate depends on location
-        if location in NEW_YORK_LOCATIONS:
-            tax_rate = 0.08875  # 8.875% for New York
-            tax_name = '8.875%'
-        else:
-            tax_rate = 0.07  # 7% for other locations
-            tax_name = '7%'
-
-        tax_amount = round(sales_reported * tax_rate, 2)
-
-        # Calculate values for Toast tax table
-        total_tax = sum(float(row['Tax']) for row in order_data if row['Location'] == location)
-
-        # Special handling for New York locations - calculate Tax on Promotions
-        if location in NEW_YORK_LOCATIONS:
-            # Get grubhub promotions value (using placeholder)
-            grubhub_promotions_value = additional_metrics['grubhub_promotions'].get(gl_location, 0)
-            tax_on_promotions = round((uber_refunds + uber_discount + grubhub_promotions_value) * tax_rate, 2)
-            uber_tax = tax_on_promotions  # For consistency in naming
-        else:
-            # Standard UberEats Sales Tax for non-NY locations
-            uber_tax = -sum(float(row['Tax'])
-                        for row in order_data
-                        if row['Location'] == location
-                        and row['Dining Options'] in ['UberEats (Pickup)', 'Uber Eats - Delivery!'])
-
-        tax_reported = total_tax + uber_tax
+        # Values for Toast tax table (uber_tax is the Tax on Promotions for New York locations)
+        total_tax = m['total_tax']
+        tax_on_promotions = m['tax_on_promotions']
+        uber_tax = m['uber_tax']
+        tax_reported = m['tax_reported']
 
         # Get R365 Sales Tax Payable for this location (or 0 if not found)
-        r365_sales_tax_payable = r365_sales_tax_data.get(gl_location, 0)
-
-        # For North Beach, calculate special Carrot Love value
-        carrot_love_sales_tax_payable = 0
-        if location == "North Beach":
-            # Sum the R365 Sales Tax Payable for all Carrot Love locations
-            carrot_love_r365_locations = [LOCATION_DICT.get(loc) for loc in CARROT_LOVE_LOCATIONS]
-            carrot_love_sales_tax_payable = sum(r365_sales_tax_data.get(loc, 0) for loc in carrot_love_r365_locations)
+        r365_sales_tax_payable = m['r365_sales_tax_payable']
 
         # Special handling for Carrot Love locations
         if location in CARROT_LOVE_LOCATIONS:
@@ -902,19 +910,10 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 fdor_row = 1
                 fdor_col = 6
 
-                ws.merge_cells(start_row=fdor_row, start_column=fdor_col,
-                              end_row=fdor_row, end_column=fdor_col + 1)
-                header_cell = ws.cell(row=fdor_row, column=fdor_col, value='SALES TAX - FDOR')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=fdor_row, column=fdor_col + 1).border = thin_border
-
-                # Correctly calculating combined_sales_reported
-                combined_non_taxable = sum(data['non_taxable'] for loc, data in carrot_love_tax_data.items())
-                combined_sales_reported = sum(data['net_sales_pnl'] - data['uber_sales_total']
-                                             for loc, data in carrot_love_tax_data.items())
+                write_section_header(ws, fdor_row, fdor_col, 'SALES TAX - FDOR')
+
+                combined_non_taxable = m['combined_non_taxable']
+                combined_sales_reported = m['combined_sales_reported']
                 combined_tax_seven_percent = round(combined_sales_reported * 0.07, 2)
 
                 fdor_data = [
@@ -923,23 +922,12 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                     ['7%', combined_tax_seven_percent]
                 ]
 
-                for row_idx, (label, value) in enumerate(fdor_data, fdor_row + 1):
-                    ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                    cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                    cell.border = thin_border
-                    cell.number_format = positive_format if value >= 0 else negative_format
+                write_rows(ws, fdor_row + 1, fdor_col, fdor_data)
 
                 # RESORT TAX table for North Beach
                 resort_row = fdor_row + len(fdor_data) + 1
 
-                ws.merge_cells(start_row=resort_row, start_column=fdor_col,
-                              end_row=resort_row, end_column=fdor_col + 1)
-                header_cell = ws.cell(row=resort_row, column=fdor_col, value='RESORT TAX')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=resort_row, column=fdor_col + 1).border = thin_border
+                write_section_header(ws, resort_row, fdor_col, 'RESORT TAX')
 
                 resort_non_taxable = non_taxable
                 resort_sales_reported = net_sales_pnl
@@ -951,39 +939,27 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                     ['2%', resort_tax_two_percent]
                 ]
 
-                for row_idx, (label, value) in enumerate(resort_data, resort_row + 1):
-                    ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                    cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                    cell.border = thin_border
-                    cell.number_format = positive_format if value >= 0 else negative_format
+                write_rows(ws, resort_row + 1, fdor_col, resort_data)
 
                 # Total Tax table
                 total_tax_row = resort_row + len(resort_data) + 1
 
                 total_tax_value = combined_tax_seven_percent + resort_tax_two_percent
 
-                ws.cell(row=total_tax_row, column=fdor_col, value='TOTAL TAX').border = thin_border
+                ws.cell(row=total_tax_row, column=fdor_col, value='TOTAL TAX').style = cell_style
                 cell = ws.cell(row=total_tax_row, column=fdor_col + 1, value="=G4+G8")  # Formula
-                cell.border = thin_border
-                cell.number_format = positive_format
+                cell.style = amount_style
 
                 # SALES TAX - Toast table for North Beach - with renamed 'Total Tax' to 'Total Tax Toast'
                 tax_toast_row = total_tax_row + 2
 
-                ws.merge_cells(start_row=tax_toast_row, start_column=fdor_col,
-                              end_row=tax_toast_row, end_column=fdor_col + 1)
-                header_cell = ws.cell(row=tax_toast_row, column=fdor_col, value='SALES TAX - Toast')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=tax_toast_row, column=fdor_col + 1).border = thin_border
+                write_section_header(ws, tax_toast_row, fdor_col, 'SALES TAX - Toast')
 
                 # For North Beach - calculate Total Tax Toast as just the tax from all orders for North Beach location
                 total_tax_toast = total_tax  # Just North Beach tax from Orders file
 
                 # Get UberEats Sales Tax directly from UE file
-                ue_sales_tax_value = additional_metrics['ue_sales_tax'].get(gl_location, 0)
+                ue_sales_tax_value = m['ue_sales_tax']
 
                 tax_toast_data = [
                     ['Total Tax Toast', total_tax_toast],
@@ -991,26 +967,12 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                     ['Tax Reported', "=G12+G13"]  # Formula referencing Total Tax Toast minus UberEats Sales Tax
                 ]
 
-                for row_idx, (label, value) in enumerate(tax_toast_data, tax_toast_row + 1):
-                    ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                    cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                    cell.border = thin_border
-                    if isinstance(value, (int, float)):  # Check if value is a number
-                        cell.number_format = positive_format if value >= 0 else negative_format
-                    else:  # It's a formula or other string
-                        cell.number_format = positive_format  # Default to positive format for formulas
+                write_rows(ws, tax_toast_row + 1, fdor_col, tax_toast_data)
 
                 # Add R365 table
                 r365_row = tax_toast_row + len(tax_toast_data) + 1
 
-                ws.merge_cells(start_row=r365_row, start_column=fdor_col,
-                              end_row=r365_row, end_column=fdor_col + 1)
-                header_cell = ws.cell(row=r365_row, column=fdor_col, value='R365')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=r365_row, column=fdor_col + 1).border = thin_border
+                write_section_header(ws, r365_row, fdor_col, 'R365')
 
                 r365_data = [
                     ['Sales Tax Payable', ""],
@@ -1018,35 +980,19 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                     ['Carrot Love TOTAL Sales Tax Payable', "=G17+G16+'Coral Gables'!G6+'Aventura (Miami Gardens)'!G6"]  # Update formula reference to account for new row
                 ]
 
-                for row_idx, (label, value) in enumerate(r365_data, r365_row + 1):
-                    ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                    cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                    cell.border = thin_border
-                    if isinstance(value, (int, float)):  # Check if value is a number
-                        cell.number_format = positive_format if value >= 0 else negative_format
-                    else:  # It's a formula or other string
-                        cell.number_format = positive_format  # Default to positive format for formulas
+                write_rows(ws, r365_row + 1, fdor_col, r365_data)
 
                 # Highlight Sales Tax Payable and Carrot Love Sales Tax Payable cells
-                ws.cell(row=r365_row + 1, column=fdor_col + 1).fill = yellow_fill
-                ws.cell(row=r365_row + 2, column=fdor_col + 1).fill = yellow_fill
-                ws.cell(row=r365_row + 3, column=fdor_col + 1).fill = yellow_fill
+                style_range(ws, r365_row + 1, fdor_col + 1, r365_row + 3, fdor_col + 1, highlight_style)
 
                 # Add note next to Sales Tax Payable
-                ws.cell(row=r365_row + 1, column=fdor_col + 2, value="<-- Enter Sales Tax Payable For North Beach").alignment = Alignment(horizontal='left')
-                ws.cell(row=r365_row + 2, column=fdor_col + 2, value="<-- Enter Resort Tax Payable For North Beach").alignment = Alignment(horizontal='left')
+                ws.cell(row=r365_row + 1, column=fdor_col + 2, value="<-- Enter Sales Tax Payable For North Beach").style = note_style
+                ws.cell(row=r365_row + 2, column=fdor_col + 2, value="<-- Enter Resort Tax Payable For North Beach").style = note_style
 
                 # Add 'Differences' table with updated calculations
                 diff_row = r365_row + len(r365_data) + 1
 
-                ws.merge_cells(start_row=diff_row, start_column=fdor_col,
-                              end_row=diff_row, end_column=fdor_col + 1)
-                header_cell = ws.cell(row=diff_row, column=fdor_col, value='Differences')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=diff_row, column=fdor_col + 1).border = thin_border
+                write_section_header(ws, diff_row, fdor_col, 'Differences')
 
                 diff_data = [
                     ['DIFFERENCE Toast - R365', "=G14-G16"],
@@ -1054,65 +1000,36 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                     ['DIFFERENCE Toast - Excel', "=G14-G9"]
                 ]
 
-                for row_idx, (label, value) in enumerate(diff_data, diff_row + 1):
-                    ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                    cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                    cell.border = thin_border
-                    if isinstance(value, (int, float)):  # Check if value is a number
-                        cell.number_format = positive_format if value >= 0 else negative_format
-                    else:  # It's a formula or other string
-                        cell.number_format = positive_format  # Default to positive format for formulas
+                write_rows(ws, diff_row + 1, fdor_col, diff_data)
 
                 # Highlight all three DIFFERENCE cells
-                ws.cell(row=diff_row + 1, column=fdor_col + 1).fill = yellow_fill
-                ws.cell(row=diff_row + 2, column=fdor_col + 1).fill = yellow_fill
-                ws.cell(row=diff_row + 3, column=fdor_col + 1).fill = yellow_fill  # Highlight the new DIFFERENCE Toast - Excel cell
+                style_range(ws, diff_row + 1, fdor_col + 1, diff_row + 3, fdor_col + 1, highlight_style)
 
                 # Add 'Carrot Love LLC' table
                 cl_row = diff_row + len(diff_data) + 1
 
-                ws.merge_cells(start_row=cl_row, start_column=fdor_col,
-                               end_row=cl_row, end_column=fdor_col + 1)
-                header_cell = ws.cell(row=cl_row, column=fdor_col, value='Carrot Love LLC')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=cl_row, column=fdor_col + 1).border = thin_border
+                write_section_header(ws, cl_row, fdor_col, 'Carrot Love LLC')
 
                 # Just one row with Tax Reported (combined from all 3 Carrot Love locations)
-                ws.cell(row=cl_row + 1, column=fdor_col, value='Tax Reported').border = thin_border
-                cell = ws.cell(row=cl_row + 1, column=fdor_col + 1, value="=G14+'Coral Gables'!G4+'Aventura (Miami Gardens)'!G4")
-                cell.border = thin_border
-                if isinstance(cell.value, (int, float)):
-                    cell.number_format = positive_format if cell.value >= 0 else negative_format
-                else:
-                    cell.number_format = positive_format  # Default to positive format for formulas
+                ws.cell(row=cl_row + 1, column=fdor_col, value='Tax Reported').style = cell_style
+                ws.cell(row=cl_row + 1, column=fdor_col + 1, value="=G14+'Coral Gables'!G4+'Aventura (Miami Gardens)'!G4").style = amount_style
 
                 # Add 15(d) value (1% of combined_sales_reported)
                 fifteen_d_row = cl_row + 2
                 fifteen_d_value = round(combined_sales_reported * 0.01, 2)
 
                 fifteen_d_cell = ws.cell(row=fifteen_d_row, column=fdor_col, value='15(d)')
-                fifteen_d_cell.border = thin_border
+                fifteen_d_cell.style = cell_style
 
                 value_cell = ws.cell(row=fifteen_d_row, column=fdor_col + 1, value="=G3*0.01")  # Formula: 1% of SALES REPORTED
-                value_cell.border = thin_border
-                value_cell.number_format = positive_format
+                value_cell.style = amount_style
 
             else:
                 # For Aventura and Coral Gables, just add SALES TAX - Toast table and R365 table
                 tax_toast_row = 1
                 tax_toast_col = 6
 
-                ws.merge_cells(start_row=tax_toast_row, start_column=tax_toast_col,
-                              end_row=tax_toast_row, end_column=tax_toast_col + 1)
-                header_cell = ws.cell(row=tax_toast_row, column=tax_toast_col, value='SALES TAX - Toast')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=tax_toast_row, column=tax_toast_col + 1).border = thin_border
+                write_section_header(ws, tax_toast_row, tax_toast_col, 'SALES TAX - Toast')
 
                 tax_toast_data = [
                     ['Total Tax Toast', total_tax],
@@ -1120,58 +1037,36 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                     ['Tax Reported', tax_reported]
                 ]
 
-                for row_idx, (label, value) in enumerate(tax_toast_data, tax_toast_row + 1):
-                    ws.cell(row=row_idx, column=tax_toast_col, value=label).border = thin_border
-                    cell = ws.cell(row=row_idx, column=tax_toast_col + 1, value=value)
-                    cell.border = thin_border
-                    cell.number_format = positive_format if value >= 0 else negative_format
+                write_rows(ws, tax_toast_row + 1, tax_toast_col, tax_toast_data)
 
                 # Add R365 table
                 r365_row = tax_toast_row + len(tax_toast_data) + 1
 
-                ws.merge_cells(start_row=r365_row, start_column=tax_toast_col,
-                              end_row=r365_row, end_column=tax_toast_col + 1)
-                header_cell = ws.cell(row=r365_row, column=tax_toast_col, value='R365')
-                header_cell.alignment = Alignment(horizontal='center')
-                header_cell.font = Font(bold=True)
-                header_cell.fill = header_fill
-                header_cell.border = thin_border
-                ws.cell(row=r365_row, column=tax_toast_col + 1).border = thin_border
+                write_section_header(ws, r365_row, tax_toast_col, 'R365')
 
                 # Just one row with Sales Tax Payable
-                ws.cell(row=r365_row + 1, column=tax_toast_col, value='Sales Tax Payable').border = thin_border
-                cell = ws.cell(row=r365_row + 1, column=tax_toast_col + 1, value="")  # Empty string
-                cell.border = thin_border
-                cell.fill = yellow_fill  # Highlight with yellow
+                ws.cell(row=r365_row + 1, column=tax_toast_col, value='Sales Tax Payable').style = cell_style
+                ws.cell(row=r365_row + 1, column=tax_toast_col + 1, value="").style = input_style  # Empty string, highlighted
 
                 # Add note next to Sales Tax Payable
-                ws.cell(row=r365_row + 1, column=tax_toast_col + 2, value=" <-- Enter Sales Tax Payable calculated from R365").alignment = Alignment(horizontal='left')
+                ws.cell(row=r365_row + 1, column=tax_toast_col + 2, value=" <-- Enter Sales Tax Payable calculated from R365").style = note_style
 
                 # Add DIFFERENCE calculation
                 difference_row = r365_row + 2
 
                 # Only add Toast - R365 difference
                 diff_toast_r365_cell = ws.cell(row=difference_row, column=tax_toast_col, value='DIFFERENCE Toast - R365')
-                diff_toast_r365_cell.border = thin_border
+                diff_toast_r365_cell.style = cell_style
 
                 value_cell = ws.cell(row=difference_row, column=tax_toast_col + 1, value="=G4-G6")  # Formula
-                value_cell.border = thin_border
-                value_cell.fill = yellow_fill  # Highlight with yellow
-                value_cell.number_format = positive_format  # Default to positive format for formulas
+                value_cell.style = highlight_style  # Highlight with yellow
 
         elif location in SOUTH_BEACH_LOCATIONS:
             # For South Beach, similar to North Beach but using its own values
             fdor_row = 1
             fdor_col = 6
 
-            ws.merge_cells(start_row=fdor_row, start_column=fdor_col,
-                          end_row=fdor_row, end_column=fdor_col + 1)
-            header_cell = ws.cell(row=fdor_row, column=fdor_col, value='SALES TAX - FDOR')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=fdor_row, column=fdor_col + 1).border = thin_border
+            write_section_header(ws, fdor_row, fdor_col, 'SALES TAX - FDOR')
 
             # Calculate the 7% value correctly for South Beach
             tax_seven_percent = round(sales_reported * 0.07, 2)
@@ -1181,23 +1076,12 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['SALES REPORTED', sales_reported],
                 ['7%', tax_seven_percent]
             ]
-            for row_idx, (label, value) in enumerate(fdor_data, fdor_row + 1):
-                ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, fdor_row + 1, fdor_col, fdor_data)
 
             # RESORT TAX table for South Beach
             resort_row = fdor_row + len(fdor_data) + 1
 
-            ws.merge_cells(start_row=resort_row, start_column=fdor_col,
-                          end_row=resort_row, end_column=fdor_col + 1)
-            header_cell = ws.cell(row=resort_row, column=fdor_col, value='RESORT TAX')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=resort_row, column=fdor_col + 1).border = thin_border
+            write_section_header(ws, resort_row, fdor_col, 'RESORT TAX')
 
             resort_non_taxable = non_taxable
             resort_sales_reported = net_sales_pnl
@@ -1209,33 +1093,21 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['2%', resort_tax_two_percent]
             ]
 
-            for row_idx, (label, value) in enumerate(resort_data, resort_row + 1):
-                ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, resort_row + 1, fdor_col, resort_data)
 
             # Total Tax table
             total_tax_row = resort_row + len(resort_data) + 1
 
             total_tax_value = tax_seven_percent + resort_tax_two_percent
 
-            ws.cell(row=total_tax_row, column=fdor_col, value='TOTAL TAX').border = thin_border
+            ws.cell(row=total_tax_row, column=fdor_col, value='TOTAL TAX').style = cell_style
             cell = ws.cell(row=total_tax_row, column=fdor_col + 1, value="=G4+G8")  # Formula
-            cell.border = thin_border
-            cell.number_format = positive_format
+            cell.style = amount_style
 
             # SALES TAX - Toast table for South Beach - with renamed Total Tax to Total Tax Toast
             tax_toast_row = total_tax_row + 2
 
-            ws.merge_cells(start_row=tax_toast_row, start_column=fdor_col,
-                          end_row=tax_toast_row, end_column=fdor_col + 1)
-            header_cell = ws.cell(row=tax_toast_row, column=fdor_col, value='SALES TAX - Toast')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=tax_toast_row, column=fdor_col + 1).border = thin_border
+            write_section_header(ws, tax_toast_row, fdor_col, 'SALES TAX - Toast')
 
             tax_toast_data = [
                 ['Total Tax Toast', total_tax],
@@ -1243,59 +1115,37 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['Tax Reported', tax_reported]
             ]
 
-            for row_idx, (label, value) in enumerate(tax_toast_data, tax_toast_row + 1):
-                ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, tax_toast_row + 1, fdor_col, tax_toast_data)
 
 
             # Get R365 Sales Tax Payable and Resort Tax Payable for South Beach
-            r365_sales_tax_payable = r365_sales_tax_data.get(gl_location, 0)
-            resort_tax_payable = r365_resort_tax_data.get(gl_location, 0)
+            resort_tax_payable = m['r365_resort_tax_payable']
             total_tax_payable = r365_sales_tax_payable + resort_tax_payable
 
             # Add R365 table with both tax values
             r365_row = tax_toast_row + len(tax_toast_data) + 1
 
-            ws.merge_cells(start_row=r365_row, start_column=fdor_col,
-                        end_row=r365_row, end_column=fdor_col + 1)
-            header_cell = ws.cell(row=r365_row, column=fdor_col, value='R365')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=r365_row, column=fdor_col + 1).border = thin_border
+            write_section_header(ws, r365_row, fdor_col, 'R365')
 
             # Set Sales Tax Payable value from GL
-            ws.cell(row=r365_row + 1, column=fdor_col, value='Sales Tax Payable').border = thin_border
+            ws.cell(row=r365_row + 1, column=fdor_col, value='Sales Tax Payable').style = cell_style
             sales_tax_cell = ws.cell(row=r365_row + 1, column=fdor_col + 1, value=r365_sales_tax_payable)
-            sales_tax_cell.border = thin_border
-            sales_tax_cell.number_format = positive_format if r365_sales_tax_payable >= 0 else negative_format
+            sales_tax_cell.style = value_style(r365_sales_tax_payable)
 
             # Add Resort Tax Payable row with value from GL
-            ws.cell(row=r365_row + 2, column=fdor_col, value='Resort Tax Payable').border = thin_border
+            ws.cell(row=r365_row + 2, column=fdor_col, value='Resort Tax Payable').style = cell_style
             resort_tax_cell = ws.cell(row=r365_row + 2, column=fdor_col + 1, value=resort_tax_payable)
-            resort_tax_cell.border = thin_border
-            resort_tax_cell.number_format = positive_format if resort_tax_payable >= 0 else negative_format
+            resort_tax_cell.style = value_style(resort_tax_payable)
 
             # Calculate Total Tax Payable as sum of both values
-            ws.cell(row=r365_row + 3, column=fdor_col, value='TOTAL Tax Payable').border = thin_border
+            ws.cell(row=r365_row + 3, column=fdor_col, value='TOTAL Tax Payable').style = cell_style
             total_tax_cell = ws.cell(row=r365_row + 3, column=fdor_col + 1, value=total_tax_payable)
-            total_tax_cell.border = thin_border
-            total_tax_cell.number_format = positive_format
+            total_tax_cell.style = amount_style
 
             # For the Differences table, use total_tax_payable instead of just sales tax
             diff_row = r365_row + 4
 
-            ws.merge_cells(start_row=diff_row, start_column=fdor_col,
-                        end_row=diff_row, end_column=fdor_col + 1)
-            header_cell = ws.cell(row=diff_row, column=fdor_col, value='Differences')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=diff_row, column=fdor_col + 1).border = thin_border
+            write_section_header(ws, diff_row, fdor_col, 'Differences')
 
             # Update difference calculations to use total_tax_payable
             diff_toast_r365 = tax_reported - total_tax_payable
@@ -1313,35 +1163,23 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['DIFFERENCE Toast - Excel', diff_toast_excel]
             ]
 
-            for row_idx, (label, value) in enumerate(diff_data, diff_row + 1):
-                ws.cell(row=row_idx, column=fdor_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=fdor_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, diff_row + 1, fdor_col, diff_data)
 
             # Add 15(d) value (1% of SALES REPORTED)
             fifteen_d_row = diff_row + len(diff_data) + 1
             fifteen_d_value = round(sales_reported * 0.01, 2)
 
             fifteen_d_cell = ws.cell(row=fifteen_d_row, column=fdor_col, value='15(d)')
-            fifteen_d_cell.border = thin_border
+            fifteen_d_cell.style = cell_style
 
             value_cell = ws.cell(row=fifteen_d_row, column=fdor_col + 1, value="=G3*0.01")  # Formula: 1% of SALES REPORTED
-            value_cell.border = thin_border
-            value_cell.number_format = positive_format
+            value_cell.style = amount_style
 
         elif location in NEW_YORK_LOCATIONS:
             # Special handling for New York locations
             tax_excel_row = 1
             tax_excel_col = 6  # Column F
-            ws.merge_cells(start_row=tax_excel_row, start_column=tax_excel_col,
-                            end_row=tax_excel_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=tax_excel_row, column=tax_excel_col, value='SALES TAX - Excel')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=tax_excel_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, tax_excel_row, tax_excel_col, 'SALES TAX - Excel')
 
             tax_excel_data = [
                 ['NON TAXABLE', non_taxable],
@@ -1349,23 +1187,12 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['8.875%', tax_amount]  # 8.875% for New York
             ]
 
-            for row_idx, (label, value) in enumerate(tax_excel_data, tax_excel_row + 1):
-                ws.cell(row=row_idx, column=tax_excel_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=tax_excel_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, tax_excel_row + 1, tax_excel_col, tax_excel_data)
 
             # Add Sales Tax - Toast table
             tax_toast_row = 6
 
-            ws.merge_cells(start_row=tax_toast_row, start_column=tax_excel_col,
-                            end_row=tax_toast_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=tax_toast_row, column=tax_excel_col, value='SALES TAX - Toast')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=tax_toast_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, tax_toast_row, tax_excel_col, 'SALES TAX - Toast')
 
             # For New York: renamed 'Total Tax' to 'Total Tax Toast'
             tax_toast_data = [
@@ -1374,41 +1201,22 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['Tax Reported', tax_reported]
             ]
 
-            for row_idx, (label, value) in enumerate(tax_toast_data, tax_toast_row + 1):
-                ws.cell(row=row_idx, column=tax_excel_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=tax_excel_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, tax_toast_row + 1, tax_excel_col, tax_toast_data)
 
             # Add R365 table
             r365_row = tax_toast_row + len(tax_toast_data) + 1
 
-            ws.merge_cells(start_row=r365_row, start_column=tax_excel_col,
-                            end_row=r365_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=r365_row, column=tax_excel_col, value='R365')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=r365_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, r365_row, tax_excel_col, 'R365')
 
             # Just one row with Sales Tax Payable
-            ws.cell(row=r365_row + 1, column=tax_excel_col, value='Sales Tax Payable').border = thin_border
+            ws.cell(row=r365_row + 1, column=tax_excel_col, value='Sales Tax Payable').style = cell_style
             cell = ws.cell(row=r365_row + 1, column=tax_excel_col + 1, value=r365_sales_tax_payable)
-            cell.border = thin_border
-            cell.number_format = positive_format if r365_sales_tax_payable >= 0 else negative_format
+            cell.style = value_style(r365_sales_tax_payable)
 
             # Add the differences table
             diff_row = r365_row + 2
 
-            ws.merge_cells(start_row=diff_row, start_column=tax_excel_col,
-                            end_row=diff_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=diff_row, column=tax_excel_col, value='Differences')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=diff_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, diff_row, tax_excel_col, 'Differences')
 
             # Calculate differences for the two rows
             diff_toast_r365 = tax_reported - r365_sales_tax_payable
@@ -1428,36 +1236,24 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['DIFFERENCE Toast - Excel', diff_toast_excel]
             ]
 
-            for row_idx, (label, value) in enumerate(diff_data, diff_row + 1):
-                ws.cell(row=row_idx, column=tax_excel_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=tax_excel_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, diff_row + 1, tax_excel_col, diff_data)
 
             # Add 15(d) value (1% of SALES REPORTED)
             fifteen_d_row = diff_row + len(diff_data) + 1
             fifteen_d_value = round(sales_reported * 0.01, 2)
 
             fifteen_d_cell = ws.cell(row=fifteen_d_row, column=tax_excel_col, value='15(d)')
-            fifteen_d_cell.border = thin_border
+            fifteen_d_cell.style = cell_style
 
             value_cell = ws.cell(row=fifteen_d_row, column=tax_excel_col + 1, value="=G3*0.01")  # Formula: 1% of SALES REPORTED
-            value_cell.border = thin_border
-            value_cell.number_format = positive_format
+            value_cell.style = amount_style
 
         else:  # Standard location handling for locations not in special groups
             # Add Sales Tax - Excel table
             tax_excel_row = 1
             tax_excel_col = 6  # Column F
 
-            ws.merge_cells(start_row=tax_excel_row, start_column=tax_excel_col,
-                            end_row=tax_excel_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=tax_excel_row, column=tax_excel_col, value='SALES TAX - Excel')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=tax_excel_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, tax_excel_row, tax_excel_col, 'SALES TAX - Excel')
 
             # For standard locations - fix tax calculation
             tax_excel_data = [
@@ -1466,28 +1262,17 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['7%', 0]  # Placeholder, will be calculated after
             ]
 
-            for row_idx, (label, value) in enumerate(tax_excel_data, tax_excel_row + 1):
-                ws.cell(row=row_idx, column=tax_excel_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=tax_excel_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, tax_excel_row + 1, tax_excel_col, tax_excel_data)
 
             # Calculate 7% based on NON TAXABLE + SALES REPORTED from this table
             tax_value = round((non_taxable + sales_reported) * 0.07, 2)
             tax_cell = ws.cell(row=tax_excel_row + 3, column=tax_excel_col + 1, value="=(G2+G3)*0.07")  # Formula
-            tax_cell.number_format = positive_format
+            tax_cell.style = amount_style
 
             # Add Sales Tax - Toast table
             tax_toast_row = 6
 
-            ws.merge_cells(start_row=tax_toast_row, start_column=tax_excel_col,
-                            end_row=tax_toast_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=tax_toast_row, column=tax_excel_col, value='SALES TAX - Toast')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=tax_toast_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, tax_toast_row, tax_excel_col, 'SALES TAX - Toast')
 
             # Renamed 'Total Tax' to 'Total Tax Toast'
             tax_toast_data = [
@@ -1496,41 +1281,22 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['Tax Reported', tax_reported]
             ]
 
-            for row_idx, (label, value) in enumerate(tax_toast_data, tax_toast_row + 1):
-                ws.cell(row=row_idx, column=tax_excel_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=tax_excel_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, tax_toast_row + 1, tax_excel_col, tax_toast_data)
 
 # Add R365 table
             r365_row = tax_toast_row + len(tax_toast_data) + 1
 
-            ws.merge_cells(start_row=r365_row, start_column=tax_excel_col,
-                            end_row=r365_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=r365_row, column=tax_excel_col, value='R365')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=r365_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, r365_row, tax_excel_col, 'R365')
 
             # Just one row with Sales Tax Payable
-            ws.cell(row=r365_row + 1, column=tax_excel_col, value='Sales Tax Payable').border = thin_border
+            ws.cell(row=r365_row + 1, column=tax_excel_col, value='Sales Tax Payable').style = cell_style
             cell = ws.cell(row=r365_row + 1, column=tax_excel_col + 1, value=r365_sales_tax_payable)
-            cell.border = thin_border
-            cell.number_format = positive_format if r365_sales_tax_payable >= 0 else negative_format
+            cell.style = value_style(r365_sales_tax_payable)
 
             # Add the differences table
             diff_row = r365_row + 2
 
-            ws.merge_cells(start_row=diff_row, start_column=tax_excel_col,
-                            end_row=diff_row, end_column=tax_excel_col + 1)
-            header_cell = ws.cell(row=diff_row, column=tax_excel_col, value='Differences')
-            header_cell.alignment = Alignment(horizontal='center')
-            header_cell.font = Font(bold=True)
-            header_cell.fill = header_fill
-            header_cell.border = thin_border
-            ws.cell(row=diff_row, column=tax_excel_col + 1).border = thin_border
+            write_section_header(ws, diff_row, tax_excel_col, 'Differences')
 
             # Calculate differences
             diff_toast_r365 = tax_reported - r365_sales_tax_payable
@@ -1550,22 +1316,17 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 ['DIFFERENCE Toast - Excel', diff_toast_excel]
             ]
 
-            for row_idx, (label, value) in enumerate(diff_data, diff_row + 1):
-                ws.cell(row=row_idx, column=tax_excel_col, value=label).border = thin_border
-                cell = ws.cell(row=row_idx, column=tax_excel_col + 1, value=value)
-                cell.border = thin_border
-                cell.number_format = positive_format if value >= 0 else negative_format
+            write_rows(ws, diff_row + 1, tax_excel_col, diff_data)
 
             # Add 15(d) value (1% of SALES REPORTED)
             fifteen_d_row = diff_row + len(diff_data) + 1
             fifteen_d_value = round(sales_reported * 0.01, 2)
 
             fifteen_d_cell = ws.cell(row=fifteen_d_row, column=tax_excel_col, value='15(d)')
-            fifteen_d_cell.border = thin_border
+            fifteen_d_cell.style = cell_style
 
             value_cell = ws.cell(row=fifteen_d_row, column=tax_excel_col + 1, value="=G3*0.01")  # Formula: 1% of SALES REPORTED
-            value_cell.border = thin_border
-            value_cell.number_format = positive_format
+            value_cell.style = amount_style
 
         # Add Royalty Fees section
         # Determine royalty_start_row more dynamically for New York locations
@@ -1590,70 +1351,15 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
             royalty_start_row = fifteen_d_row + 2
 
         ws.merge_cells(start_row=royalty_start_row, start_column=1, end_row=royalty_start_row, end_column=4)
-        header_cell = ws.cell(row=royalty_start_row, column=1, value='Royalty Fees')
-        header_cell.alignment = Alignment(horizontal='center')
-        header_cell.font = Font(bold=True)
-        header_cell.fill = header_fill
-        for col in range(1, 5):
-            ws.cell(row=royalty_start_row, column=col).border = thin_border
+        ws.cell(row=royalty_start_row, column=1, value='Royalty Fees').style = section_style
+        style_range(ws, royalty_start_row, 2, royalty_start_row, 4, cell_style)
 
         royalty_headers = ['Metric', 'Sales', 'Royalty Fee 5%', 'Royalty Fee 3%']
         for col, header in enumerate(royalty_headers, 1):
-            cell = ws.cell(row=royalty_start_row + 1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.border = thin_border
-
-        uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-
-        # Special handling for New York locations
-        if location in NEW_YORK_LOCATIONS:
-            # Get additional metrics for New York
-            grubhub_toast = grubhub_sales.get(location, 0)
-            grubhub_r365 = additional_metrics['grubhub_sales'].get(gl_location, 0)
-            doordash_sales = additional_metrics['doordash_sales'].get(gl_location, 0)
-            doordash_refunds = additional_metrics['doordash_refunds'].get(gl_location, 0)
-            doordash_discounts = additional_metrics['doordash_discounts'].get(gl_location, 0)
-            grubhub_refunds = additional_metrics['grubhub_refunds'].get(gl_location, 0)
-            grubhub_delivery_fees = additional_metrics['grubhub_delivery_fees'].get(gl_location, 0)
-            grubhub_promotions = additional_metrics['grubhub_promotions'].get(gl_location, 0)
-            third_parties = additional_metrics['third_parties'].get(location, 0)
-
-            main_data = [
-                ['Toast Net Sales', toast_sales],
-                ['UberEats Sales - Toast', uber_sales_toast],
-                ['UberEats Sales - R365', uber_sales_r365],
-                ['Delivery Fee Income', delivery_fee],
-                ['Ez Catering', ez_catering],
-                ['UberEats Refunds', uber_refunds],
-                ['UberEats Discount', uber_discount],
-                ['Grubhub Toast', grubhub_toast],
-                ['Grubhub R365', grubhub_r365],
-                ['DoorDash Sales', doordash_sales],  # Changed from 'DoorDash' to 'DoorDash Sales'
-                ['DoorDash Refunds', doordash_refunds],
-                ['Grubhub Delivery Fees', grubhub_delivery_fees],
-                ['Grubhub Promotions', grubhub_promotions],
-                ['Grubhub Refunds', grubhub_refunds],
-                ['Third Parties', third_parties],
-                ['Net Sales PNL', net_sales_pnl]
-            ]
+            ws.cell(row=royalty_start_row + 1, column=col, value=header).style = bold_cell_style
 
         # For NY locations, calculate the royalty section
         if location in NEW_YORK_LOCATIONS:
-            # Calculate Grubhub total for royalty
-            grubhub_r365 = additional_metrics['grubhub_sales'].get(gl_location, 0)
-            grubhub_promotions = additional_metrics['grubhub_promotions'].get(gl_location, 0)
-            grubhub_refunds = additional_metrics['grubhub_refunds'].get(gl_location, 0)
-            grubhub_sales_total = grubhub_r365 + grubhub_promotions + grubhub_refunds
-
-            # Calculate DoorDash total
-            doordash_sales = additional_metrics['doordash_sales'].get(gl_location, 0)
-            doordash_refunds = additional_metrics['doordash_refunds'].get(gl_location, 0)
-            doordash_total = doordash_sales + doordash_refunds
-            doordash_discounts = additional_metrics['doordash_discounts'].get(gl_location, 0)
-
-            # Get third parties
-            third_parties_value = additional_metrics['third_parties'].get(location, 0)
-
             # NEW APPROACH: Find indices by name instead of tuple matching
             # Find the index of the delivery fee row by searching for the correct first element
             delivery_fee_index = -1
@@ -1675,14 +1381,6 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
                 print(f"Warning: 'Grubhub Delivery Fees' not found in main_data for {location}")
                 grubhub_fees_index = 12  # Fallback to a reasonable guess
 
-            # Calculate formula references for Sales w/o 3rd Party deliveries
-            if location == "Bryant Park":
-                # For Bryant Park: Net Sales PNL - Delivery Fee - UberEats - Grubhub - Third Parties - DoorDash (including discounts)
-                sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - grubhub_sales_total - (doordash_sales + doordash_refunds + doordash_discounts) - third_parties
-            else:
-                # For other NY locations: delivery_fee already includes grubhub_delivery_fees, so DON'T subtract it again
-                sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - grubhub_sales_total - (doordash_sales + doordash_refunds + doordash_discounts) - third_parties
-
             # Now find the indices for the other values using the same approach
             uber_sales_r365_index = -1
             uber_refunds_index = -1
@@ -1756,30 +1454,19 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
         for row_idx, row_data in enumerate(royalty_data, royalty_start_row + 2):
             for col, value in enumerate(row_data, 1):
                 cell = ws.cell(row=row_idx, column=col, value=value)
-                cell.border = thin_border
-                if col in [2, 3, 4]:  # Amount columns
-                    if isinstance(value, (int, float)):
-                        cell.number_format = positive_format if value >= 0 else negative_format
-                    else:  # It's a formula or other string
-                        cell.number_format = positive_format  # Default to positive format for formulas
+                cell.style = value_style(value) if col in [2, 3, 4] else cell_style  # Amount columns
 
         # Add total royalty fees row with yellow highlight
         total_row = royalty_start_row + len(royalty_data) + 2
         ws.merge_cells(start_row=total_row, start_column=1, end_row=total_row, end_column=2)
 
-        total_cell = ws.cell(row=total_row, column=1, value='ROYALTY FEES')
-        total_cell.font = Font(bold=True)
-        total_cell.border = thin_border
-        total_cell.fill = yellow_fill
-        ws.cell(row=total_row, column=2).border = thin_border
-        ws.cell(row=total_row, column=2).fill = yellow_fill
+        ws.cell(row=total_row, column=1, value='ROYALTY FEES').style = total_style
+        ws.cell(row=total_row, column=2).style = input_style
 
         # The final royalty fee is the sum of 5% and 3% totals
         last_royalty_row = royalty_start_row + len(royalty_data) + 1
         amount_cell = ws.cell(row=total_row, column=3, value=f"=C{last_royalty_row}+D{last_royalty_row}")
-        amount_cell.number_format = positive_format
-        amount_cell.border = thin_border
-        amount_cell.fill = yellow_fill
+        amount_cell.style = highlight_style
 
         # Adjust column widths
         ws.column_dimensions['A'].width = 180 / 7  # Convert pixels to Excel width units
@@ -1791,7 +1478,7 @@ def save_royalties_report(sales_data, uber_sales, grubhub_sales, profit_metrics,
     wb.save(output_path)
 
 
-def generate_ar_invoices(sales_data, uber_sales, profit_metrics, additional_metrics, export_data, r365_sales_tax_data, earliest_date, latest_date, output_dir):
+def generate_ar_invoices(location_metrics, earliest_date, latest_date, output_dir):
     """
     Generate AR invoices for each location.
     Two invoices per location: one from Carrot Leadership LLC and one from Carrot Express Franchise System LLC
@@ -1855,9 +1542,7 @@ def generate_ar_invoices(sales_data, uber_sales, profit_metrics, additional_metr
     invoices = []
 
     # For each location, generate two invoices (three for Midtown)
-    for location, toast_sales in sales_data.items():
-        gl_location = LOCATION_DICT.get(location, location)
-
+    for location, m in location_metrics.items():
         # Skip locations that don't have royalty info calculated or West Boca
         if location not in LOCATION_DICT.keys() or location == "West Boca":
             continue
@@ -1865,93 +1550,13 @@ def generate_ar_invoices(sales_data, uber_sales, profit_metrics, additional_metr
         # Get vendor name - this should be the AP Location from the left side of the image
         vendor_name = VENDOR_NAME_DICT.get(location, location)  # Use the dictionary to get the vendor name
 
-        # Get necessary data for calculations
-        net_sales_pnl = export_data.get(gl_location, 0)
-        delivery_fee = profit_metrics['delivery_fee'].get(gl_location, 0)
-        uber_sales_r365 = additional_metrics['ue_sales'].get(gl_location, 0)
-        uber_refunds = additional_metrics['ue_refunds'].get(gl_location, 0)
-        uber_discount = additional_metrics['ue_discount'].get(gl_location, 0)
-        ez_catering = profit_metrics['ez_catering'].get(gl_location, 0)
-
-        # Calculate cleadership fee
-        if location in NEW_YORK_LOCATIONS and location != "Bryant Park":
-            # For NY locations, only subtract grubhub_delivery_fees once
-            # Don't subtract grubhub_delivery_fees if it's already included in delivery_fee
-            grubhub_delivery_fees = additional_metrics['grubhub_delivery_fees'].get(gl_location, 0)
-
-            # Check if we're using Bryant Park special case
-            delivery_fee_includes_grubhub = True  # Set to True as the delivery_fee likely already includes grubhub fees
-
-            if delivery_fee_includes_grubhub:
-                cleadership_fee = round((net_sales_pnl - delivery_fee) * 0.02, 2)
-            else:
-                cleadership_fee = round((net_sales_pnl - delivery_fee - grubhub_delivery_fees) * 0.02, 2)
-        elif location in PLANTATION_LOCATIONS:
-            # Special handling for Plantation - include plantation_payable in delivery fee
-            plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
-            cleadership_fee = round((net_sales_pnl - (delivery_fee + plantation_payable)) * 0.02, 2)
-        else:
-            # Standard calculation for all other locations
-            cleadership_fee = round((net_sales_pnl - delivery_fee) * 0.02, 2)
-
-        # Calculate leadership fee for Midtown only (not Miami Shores)
-        if location == "Midtown":
-            leadership_fee = round((uber_sales_r365 + uber_refunds + uber_discount) * 0.01, 2)
-        else:
-            leadership_fee = 0
+        # Fees come from the shared metrics model so they always match the royalties summary
+        cleadership_fee = m['cleadership_fee']
+        leadership_fee = m['leadership_fee']
+        total_royalty = m['total_royalty']
 
         # Create franchise invoice for all locations EXCEPT Midtown
         if location != "Midtown":
-            # Calculate royalty values based on location type
-            uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-
-            if location in NEW_YORK_LOCATIONS:
-                # New York location calculations
-                grubhub_r365 = additional_metrics['grubhub_sales'].get(gl_location, 0)
-                grubhub_promotions = additional_metrics['grubhub_promotions'].get(gl_location, 0)
-                grubhub_refunds = additional_metrics['grubhub_refunds'].get(gl_location, 0)
-                doordash_sales = additional_metrics['doordash_sales'].get(gl_location, 0)
-                doordash_refunds = additional_metrics['doordash_refunds'].get(gl_location, 0)
-                doordash_discounts = additional_metrics['doordash_discounts'].get(gl_location, 0)
-                third_parties = additional_metrics['third_parties'].get(location, 0)
-
-                # Calculate values matching the report exactly
-                uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-                grubhub_sales_total = grubhub_r365 + grubhub_promotions + grubhub_refunds
-
-                # For Bryant Park, we don't need to worry about grubhub_delivery_fees
-                if location == "Bryant Park":
-                    # For Bryant Park: Net Sales PNL - Delivery Fee - UberEats - Grubhub - Third Parties - DoorDash (including discounts)
-                    sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - grubhub_sales_total - (doordash_sales + doordash_refunds + doordash_discounts) - third_parties
-                else:
-                    # For other NY locations: delivery_fee already includes grubhub_delivery_fees, so DON'T subtract it again
-                    sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - grubhub_sales_total - (doordash_sales + doordash_refunds + doordash_discounts) - third_parties
-
-                # Calculate royalty components
-                royalty_5_percent = sales_wo_3rd * 0.05
-                royalty_3_percent_uber = uber_sales_total * 0.03
-                royalty_3_percent_grubhub = grubhub_sales_total * 0.03
-                royalty_3_percent_third = (third_parties + doordash_sales + doordash_refunds + doordash_discounts) * 0.03
-                total_royalty = round(royalty_5_percent + royalty_3_percent_uber + royalty_3_percent_grubhub + royalty_3_percent_third, 2)
-            else:
-                # Standard location calculations
-                uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-
-                # For Plantation, add plantation payable to delivery fee
-                if location in PLANTATION_LOCATIONS:
-                    plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
-                    delivery_fee += plantation_payable
-
-                # Calculate Sales w/o 3rd Party deliveries exactly as in royalties report
-                sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - ez_catering
-
-                # Calculate royalty components
-                royalty_5_percent = sales_wo_3rd * 0.05
-                royalty_3_percent_uber = uber_sales_total * 0.03
-                royalty_3_percent_ez = ez_catering * 0.03
-
-                total_royalty = round(royalty_5_percent + royalty_3_percent_uber + royalty_3_percent_ez, 2)
-
             # Create Carrot Express Franchise System LLC invoice
             cefs_invoice_num = f"AR-CEFS{date_suffix}-{cefs_counter:02d}"
             cefs_counter += 1
@@ -2033,7 +1638,7 @@ def generate_ar_invoices(sales_data, uber_sales, profit_metrics, additional_metr
 
     return output_path
 
-def generate_ap_invoices(sales_data, uber_sales, profit_metrics, additional_metrics, export_data, r365_sales_tax_data, earliest_date, latest_date, output_dir):
+def generate_ap_invoices(location_metrics, earliest_date, latest_date, output_dir):
     """
     Generate AP invoices based on AR invoices, with switched vendor/location and mapped account names.
     """
@@ -2067,100 +1672,19 @@ def generate_ap_invoices(sales_data, uber_sales, profit_metrics, additional_metr
     invoices = []
 
     # For each location, generate two invoices (three for Midtown)
-    for location, toast_sales in sales_data.items():
-        gl_location = LOCATION_DICT.get(location, location)
+    for location, m in location_metrics.items():
+        gl_location = m['gl_location']
 
         # Skip locations that don't have royalty info calculated or West Boca
         if location not in LOCATION_DICT.keys() or location == "West Boca":
             continue
 
-        # Get necessary data for calculations
-        net_sales_pnl = export_data.get(gl_location, 0)
-        delivery_fee = profit_metrics['delivery_fee'].get(gl_location, 0)
-        uber_sales_r365 = additional_metrics['ue_sales'].get(gl_location, 0)
-        uber_refunds = additional_metrics['ue_refunds'].get(gl_location, 0)
-        uber_discount = additional_metrics['ue_discount'].get(gl_location, 0)
-        ez_catering = profit_metrics['ez_catering'].get(gl_location, 0)
-
-        # Calculate cleadership fee
-        if location in NEW_YORK_LOCATIONS and location != "Bryant Park":
-            # For NY locations, only subtract grubhub_delivery_fees once
-            # Don't subtract grubhub_delivery_fees if it's already included in delivery_fee
-            grubhub_delivery_fees = additional_metrics['grubhub_delivery_fees'].get(gl_location, 0)
-
-            # Check if we're using Bryant Park special case
-            delivery_fee_includes_grubhub = True  # Set to True as the delivery_fee likely already includes grubhub fees
-
-            if delivery_fee_includes_grubhub:
-                cleadership_fee = round((net_sales_pnl - delivery_fee) * 0.02, 2)
-            else:
-                cleadership_fee = round((net_sales_pnl - delivery_fee - grubhub_delivery_fees) * 0.02, 2)
-        elif location in PLANTATION_LOCATIONS:
-            # Special handling for Plantation - include plantation_payable in delivery fee
-            plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
-            cleadership_fee = round((net_sales_pnl - (delivery_fee + plantation_payable)) * 0.02, 2)
-        else:
-            # Standard calculation for all other locations
-            cleadership_fee = round((net_sales_pnl - delivery_fee) * 0.02, 2)
-
-        # Calculate leadership fee for Midtown only (not Miami Shores)
-        if location == "Midtown":
-            leadership_fee = round((uber_sales_r365 + uber_refunds + uber_discount) * 0.01, 2)
-        else:
-            leadership_fee = 0
+        cleadership_fee = m['cleadership_fee']
+        leadership_fee = m['leadership_fee']
+        total_royalty = m['total_royalty']
 
         # Create franchise invoice for all locations EXCEPT Midtown
         if location != "Midtown":
-            # Calculate royalty values based on location type
-            uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-
-            if location in NEW_YORK_LOCATIONS:
-                # New York location calculations
-                grubhub_r365 = additional_metrics['grubhub_sales'].get(gl_location, 0)
-                grubhub_promotions = additional_metrics['grubhub_promotions'].get(gl_location, 0)
-                grubhub_refunds = additional_metrics['grubhub_refunds'].get(gl_location, 0)
-                doordash_sales = additional_metrics['doordash_sales'].get(gl_location, 0)
-                doordash_refunds = additional_metrics['doordash_refunds'].get(gl_location, 0)
-                doordash_discounts = additional_metrics['doordash_discounts'].get(gl_location, 0)
-                third_parties = additional_metrics['third_parties'].get(location, 0)
-
-                # Calculate values matching the report exactly
-                uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-                grubhub_sales_total = grubhub_r365 + grubhub_promotions + grubhub_refunds
-
-                # For Bryant Park, we don't need to worry about grubhub_delivery_fees
-                if location == "Bryant Park":
-                    # For Bryant Park: Net Sales PNL - Delivery Fee - UberEats - Grubhub - Third Parties - DoorDash (including discounts)
-                    sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - grubhub_sales_total - (doordash_sales + doordash_refunds + doordash_discounts) - third_parties
-                else:
-                    # For other NY locations: delivery_fee already includes grubhub_delivery_fees, so DON'T subtract it again
-                    sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - grubhub_sales_total - (doordash_sales + doordash_refunds + doordash_discounts) - third_parties
-
-                # Calculate royalty components
-                royalty_5_percent = sales_wo_3rd * 0.05
-                royalty_3_percent_uber = uber_sales_total * 0.03
-                royalty_3_percent_grubhub = grubhub_sales_total * 0.03
-                royalty_3_percent_third = (third_parties + doordash_sales + doordash_refunds + doordash_discounts) * 0.03
-                total_royalty = round(royalty_5_percent + royalty_3_percent_uber + royalty_3_percent_grubhub + royalty_3_percent_third, 2)
-            else:
-                # Standard location calculations
-                uber_sales_total = uber_sales_r365 + uber_refunds + uber_discount
-
-                # For Plantation, add plantation payable to delivery fee
-                if location in PLANTATION_LOCATIONS:
-                    plantation_payable = r365_sales_tax_data.get("Plantation_Payable", 0)
-                    delivery_fee += plantation_payable
-
-                # Calculate Sales w/o 3rd Party deliveries exactly as in royalties report
-                sales_wo_3rd = net_sales_pnl - delivery_fee - uber_sales_total - ez_catering
-
-                # Calculate royalty components
-                royalty_5_percent = sales_wo_3rd * 0.05
-                royalty_3_percent_uber = uber_sales_total * 0.03
-                royalty_3_percent_ez = ez_catering * 0.03
-
-                total_royalty = round(royalty_5_percent + royalty_3_percent_uber + royalty_3_percent_ez, 2)
-
             # Create AP invoice - using the same number as corresponding AR invoice
             cefs_invoice_num = f"AR-CEFS{date_suffix}-{cefs_counter:02d}"
             cefs_counter += 1
@@ -1,9 +1,9 @@
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                           QFileDialog, QTextEdit, QMessageBox, QListWidget)
+                           QFileDialog, QMessageBox, QListWidget)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from datetime import datetime
 import os
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 from royalties_processor import RoyaltiesProcessThread
 
 def resource_path(relative_path):
@@ -52,7 +52,7 @@ class RoyaltiesWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+# Parsed frames keyed by (loader function, file content hash), so re-runs skip unchanged
+# files and pipelines running in the same process parse a shared input (e.g. Toast Order
+# exports) once. Keyed on the function itself, not its name, so same-named loaders never
+# share frames.
+# Least recently used first; frames are evicted once their total size passes the budget, so
+# a long desktop session does not keep every run's inputs alive.
+_cache = OrderedDict()
+_cache_sizes = {}
+_cache_lock = threading.Lock()
+
+CACHE_BUDGET_BYTES = 512 * 1024 * 1024
+
+TOAST_ORDER_ENCODINGS = ['utf-8', 'cp1252', 'latin1']
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def frame_size(frame):
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def _evict(budget):
+    """Drop least recently used parsed frames until the cache fits the budget (lock held)"""
+    while sum(_cache_sizes.values()) > budget:
+        key = next(key for key in _cache if key in _cache_sizes)
+        del _cache[key]
+        del _cache_sizes[key]
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _cache_sizes.clear()
+
+
+def cached_load(loader, path):
+    """
+    Run loader(path) once per distinct file content and hand out copies of the result.
+    Concurrent callers asking for the same file wait for the first one's parse.
+    """
+    key = (loader, file_hash(path))
+    with _cache_lock:
+        pending = _cache.get(key)
+        owner = pending is None
+        if owner:
+            pending = _cache[key] = Future()
+        else:
+            _cache.move_to_end(key)
+
+    if owner:
+        try:
+            frame = loader(path)
+        except Exception as e:
+            with _cache_lock:
+                del _cache[key]
+            pending.set_exception(e)
+            raise
+        pending.set_result(frame)
+        with _cache_lock:
+            if key in _cache:
+                _cache_sizes[key] = frame_size(frame)
+                _evict(CACHE_BUDGET_BYTES)
+        return frame.copy()
+    return pending.result().copy()
+
+
+def seed_cache(loader, path, frame):
+    """Cache frame as loader's result for path, e.g. when another process already parsed it"""
+    key = (loader, file_hash(path))
+    done = Future()
+    done.set_result(frame)
+    with _cache_lock:
+        _cache[key] = done
+        _cache.move_to_end(key)
+        _cache_sizes[key] = frame_size(frame)
+        _evict(CACHE_BUDGET_BYTES)
+
+
+def parse_toast_orders(path):
+    """A Toast OrderDetails export with every column, trying each encoding in turn"""
+    import pandas as pd
+    for encoding in TOAST_ORDER_ENCODINGS:
+        try:
+            return pd.read_csv(path, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Unable to decode the file {path} with any of the provided encodings.")
+
+
+def load_toast_orders(path):
+    return cached_load(parse_toast_orders, path)
@@ -0,0 +1,863 @@
+"""
+Synthetic month-end inputs for benchmarking and smoke-testing the pipelines.
+
+Writes one month of every export the pipelines read, in the layouts they parse, at a
+multiple of a real month's volume:
+
+    python synthetic_data.py bench_data --scale 10 --month 2024-09
+
+Files read by the month-end pipelines go directly in the output folder with the names
+month_end.py routes on, so the folder can be run as a close as-is. Inputs for the other
+pipelines go in a subfolder named after the pipeline. manifest.json lists the arguments
+each pipeline runs with, plus its input rows and bytes.
+
+Locations, entities, vendors and account names come from the pipelines' own mappings,
+so every row lands in a location the pipelines recognise.
+"""
+
+import os
+import sys
+import json
+import argparse
+import calendar
+from datetime import date, timedelta
+
+# Volume of one real month at scale 1; per-day figures are per location
+MONTHLY_VOLUME = {
+    "toast_orders_per_day": 100,
+    "gl_entries_per_day": 1,
+    "due_to_from_entries": 8,
+    "doordash_orders_per_day": 15,
+    "grubhub_orders_per_day": 10,
+    "uber_orders_per_day": 12,
+    "knock_deliveries_per_day": 6,
+    "relay_deliveries_per_day": 8,
+    "metro_speedy_deliveries_per_day": 4,
+    "relacion_deliveries_per_day": 5,
+    "px_redemptions": 12000,
+    "px_payouts_per_day": 1,
+    "employees": 25,
+    "ap_payments": 1500,
+    "r365_payments": 4000,
+    "cnb_transfers": 300,
+}
+
+# Toast dining option -> share of orders
+DINING_OPTIONS = {
+    "Dine In": 30,
+    "Take Out": 20,
+    "Online Ordering (Dispatch) *": 6,
+    "Online Ordering (Delivery) *": 4,
+    "Google Online (Dispatch)": 2,
+    "Google Online Ordering": 2,
+    "Telephone - Delivery": 1,
+    "Olo Catering (Self-Delivery))": 1,
+    "EZ Cater (Delivery)": 1,
+    "Grubhub (Delivery)": 3,
+    "Grubhub (Takeout)": 2,
+    "DoorDash (Delivery)": 4,
+    "DoorDash (Pickup)": 2,
+    "UberEats (Pickup)": 3,
+    "Uber Eats - Delivery!": 5,
+    "Sharebite": 1,
+    "MealPal": 1,
+}
+
+# Dining options placed through OLO, which also appear in the Itemized Orders export
+OLO_MARKERS = ("Online", "Google", "Telephone", "Olo")
+
+TOAST_ORDER_COLUMNS = [
+    "Location", "Order Id", "Order #", "Checks", "Opened", "# of Guests", "Tab Names", "Server",
+    "Table", "Revenue Center", "Dining Area", "Service", "Dining Options", "Discount Amount",
+    "Amount", "Tax", "Tip", "Gratuity", "Total", "Voided", "Paid", "Closed",
+    "Duration (Opened to Paid)", "Order Source",
+]
+
+# R365 GL Account Detail report columns; due_to_from_analysis reads them by position
+GL_COLUMNS = [
+    "LocationName1", "ParentAccountName", "BegBalAmount2", "AccountName", "BegBalAmount", "TrxDate",
+    "TrxType", "TrxNumber", "TrxCompany", "LocationName", "Comment", "Comment1", "Debit", "Credit",
+    "Textbox17", "Credit1", "Textbox33", "Textbox49", "Textbox19", "Textbox21", "Textbox23",
+    "Textbox25", "Textbox27", "Textbox50",
+]
+
+# Parent account -> (share of daily sales it carries, side it posts to)
+GL_ACCOUNTS = {
+    "21250 - Employee Tips Payable": (0.03, "Credit"),
+    "21251 - Payable Delivery Tips": (0.01, "Credit"),
+    "23000 - Sales Tax Payable": (0.07, "Credit"),
+    "21200 - Payable Donation": (0.002, "Credit"),
+    "25050 - Gift Cards Outstanding": (0.01, "Credit"),
+    "73405 - Gift Cards": (0.004, "Debit"),
+}
+
+PROFIT_LOSS_EXTRA_LINES = ["Total Food Cost", "Total Labor Cost", "Total Operating Expenses", "Net Income"]
+
+JE_COLUMNS = ["JENumber", "Type", "Date", "ReversalDate", "JEComment", "JELocation", "Account",
+              "Debit", "Credit", "DetailLocation", "DetailComment"]
+
+# Prepared delivery JE files royalties reads when the delivery pipelines are not run
+DELIVERY_JE_ACCOUNTS = {
+    "DoorDash": ["DD Delivery", "DD Pickup", "Refunds", "Doordash Discount"],
+    "GrubHub": ["Delivery Fee Income", "GrubHub Discount", "Rewards", "Refunds"],
+    "UE": ["UE Pickup & Takeout", "UE Delivery", "Refunds", "UberEats Discount", "Sales Tax Payable"],
+}
+
+GRUBHUB_RESTAURANTS = {
+    "Lexington": "Carrot Express -  Lexington Avenue",
+    "Bryant Park": "Carrot Express Bryant Park - West 41st Street",
+    "Flatiron": "Carrot Express Flatiron - West 23rd Street",
+}
+
+FIRST_NAMES = ["Ana", "Luis", "Maria", "Jose", "Carla", "David", "Sofia", "Pedro", "Laura", "Diego",
+               "Elena", "Jorge", "Paula", "Mateo", "Lucia", "Andres", "Sara", "Felipe", "Julia", "Tomas"]
+LAST_NAMES = ["Garcia", "Rodriguez", "Martinez", "Lopez", "Gonzalez", "Perez", "Sanchez", "Ramirez",
+              "Torres", "Flores", "Rivera", "Gomez", "Diaz", "Reyes", "Cruz", "Morales", "Ortiz", "Vargas"]
+
+
+class SyntheticMonth:
+    """One month of synthetic inputs written under output_dir, tracking rows and files per pipeline"""
+
+    def __init__(self, output_dir, scale=1, month="2024-09", seed=0):
+        import numpy as np
+        from royalties_processor import LOCATION_DICT, NEW_YORK_LOCATIONS
+
+        self.output_dir = output_dir
+        self.scale = scale
+        self.rng = np.random.default_rng(seed)
+        year, month_number = (int(part) for part in month.split("-"))
+        self.days = [date(year, month_number, day)
+                     for day in range(1, calendar.monthrange(year, month_number)[1] + 1)]
+        self.tag = f"{year}_{month_number:02d}"
+        self.locations = list(LOCATION_DICT)
+        self.entities = dict(LOCATION_DICT)
+        self.ny_locations = list(NEW_YORK_LOCATIONS)
+        self.rows = {}
+        self.orders = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def count(self, key):
+        """Per-day or per-month volume for this scale, at least 1"""
+        return max(1, round(MONTHLY_VOLUME[key] * self.scale))
+
+    def path(self, name, pipeline=None):
+        folder = os.path.join(self.output_dir, pipeline) if pipeline else self.output_dir
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, name)
+
+    def write_csv(self, df, name, pipeline=None, preamble=(), encoding="utf-8"):
+        path = self.path(name, pipeline)
+        with open(path, "w", newline="", encoding=encoding) as f:
+            for line in preamble:
+                f.write(line + "\n")
+            df.to_csv(f, index=False)
+        self.rows[path] = len(df) + len(preamble)
+        return path
+
+    def names(self, n):
+        first = self.rng.choice(FIRST_NAMES, n)
+        last = self.rng.choice(LAST_NAMES, n)
+        return first, last
+
+    def amounts(self, low, high, n):
+        return self.rng.uniform(low, high, n).round(2)
+
+    def day_strings(self, index, fmt):
+        return [self.days[i].strftime(fmt) for i in index]
+
+    # Toast
+
+    def toast_orders(self):
+        """Toast OrderDetails export, shared by toast reconcile, tips, royalties and the delivery pipelines"""
+        import numpy as np
+        import pandas as pd
+
+        n = len(self.locations) * len(self.days) * self.count("toast_orders_per_day")
+        rng = self.rng
+        options = list(DINING_OPTIONS)
+        weights = np.array(list(DINING_OPTIONS.values()), dtype=float)
+        dining = rng.choice(options, n, p=weights / weights.sum())
+        day_index = rng.integers(0, len(self.days), n)
+        hours = rng.integers(8, 22, n)
+        minutes = rng.integers(0, 60, n)
+
+        # Toast writes dates without leading zeros, e.g. 9/5/24 1:07 PM
+        first_day = self.days[0]
+        opened = (pd.Series(first_day.month, index=range(n)).astype(str) + "/" +
+                  pd.Series(day_index + 1).astype(str) + "/" + first_day.strftime("%y") + " " +
+                  pd.Series(np.where(hours % 12 == 0, 12, hours % 12)).astype(str) + ":" +
+                  pd.Series(minutes).astype(str).str.zfill(2) + " " +
+                  pd.Series(np.where(hours < 12, "AM", "PM")))
+
+        delivery = pd.Series(dining).str.contains("Delivery|Dispatch|Uber Eats|Grubhub|DoorDash")
+        amount = self.amounts(6, 60, n)
+        tax = (amount * 0.07).round(2)
+        tip = np.where(delivery | (rng.random(n) < 0.3), rng.choice([0, 1.5, 2, 3, 4.25, 5.5], n), 0)
+        gratuity = np.where(rng.random(n) < 0.05, rng.choice([1, 2.5, 5], n), 0)
+        first, last = self.names(n)
+        servers = np.where(pd.Series(dining).str.contains("|".join(OLO_MARKERS)),
+                           rng.choice(["Default Online Ordering", "Online Ordering Online Ordering"], n),
+                           pd.Series(first) + " " + pd.Series(last))
+
+        orders = pd.DataFrame({
+            "Location": rng.choice(self.locations, n),
+            "Order Id": 400000000000 + np.arange(n),
+            "Order #": 100000 + np.arange(n),
+            "Checks": 1,
+            "Opened": opened,
+            "# of Guests": 1,
+            "Tab Names": (pd.Series(first) + " " + pd.Series(last)).str.lower(),
+            "Server": servers,
+            "Table": "",
+            "Revenue Center": "Front",
+            "Dining Area": "",
+            "Service": np.where(hours < 16, "Lunch", "Dinner"),
+            "Dining Options": dining,
+            "Discount Amount": 0,
+            "Amount": amount,
+            "Tax": tax,
+            "Tip": tip,
+            "Gratuity": gratuity,
+            "Total": (amount + tax + tip + gratuity).round(2),
+            "Voided": False,
+            "Paid": opened,
+            "Closed": opened,
+            "Duration (Opened to Paid)": "0:12:00",
+            "Order Source": np.where(pd.Series(dining).str.contains("|".join(OLO_MARKERS)), "Online", "In store"),
+        }, columns=TOAST_ORDER_COLUMNS)
+        orders["Day"] = day_index
+        self.orders = orders
+        return self.write_csv(orders.drop(columns="Day"), f"Order_Details_{self.tag}.csv")
+
+    def daily_sales(self):
+        return self.orders.groupby(["Location", "Day"], as_index=False)["Amount"].sum()
+
+    def toast_export(self):
+        """Daily net sales by location, as exported for the toast reconcile"""
+        sales = self.daily_sales()
+        sales["Date"] = self.day_strings(sales["Day"], "%m/%d/%Y")
+        sales = sales.rename(columns={"Amount": "NetSales"})[["Location", "Date", "NetSales"]]
+        sales["NetSales"] = sales["NetSales"].round(2)
+        return self.write_csv(sales, f"export_{self.tag}.csv")
+
+    def group_overview(self):
+        import pandas as pd
+        from royalties_processor import CARROT_LOVE_LOCATIONS
+        # Royalties lays out the Aventura and Coral Gables sheets below North Beach's tables,
+        # so it needs North Beach listed before the other Carrot Love stores
+        totals = self.orders.groupby("Location")["Amount"].sum()
+        totals = totals.reindex(sorted(totals.index, key=lambda location: location in CARROT_LOVE_LOCATIONS[1:]))
+        df = pd.DataFrame({"Location": totals.index, "Net Sales": [f"${value:,.2f}" for value in totals]})
+        start, end = self.days[0].strftime("%Y_%m_%d"), self.days[-1].strftime("%Y_%m_%d")
+        return self.write_csv(df, f"GroupOverview_{start}-{end}.csv")
+
+    def tax_exempt(self):
+        import pandas as pd
+        n = max(1, round(40 * self.scale))
+        df = pd.DataFrame({"Location": self.rng.choice(self.locations, n), "Amount": self.amounts(5, 300, n)})
+        return self.write_csv(df, f"Tax_Exempt_{self.tag}.csv")
+
+    # R365
+
+    def gl_detail(self):
+        """R365 GL Account Detail, with the accounts toast reconcile, tips, royalties and due to/from read"""
+        import numpy as np
+        import pandas as pd
+        from due_to_from_analysis import CNB_DICTIONARY
+
+        frames = []
+        sales = self.daily_sales()
+        per_day = self.count("gl_entries_per_day")
+
+        for location, entity in self.entities.items():
+            location_sales = sales[sales["Location"] == location]
+            accounts = dict(GL_ACCOUNTS)
+            if location == "Plantation":
+                accounts["25101 - Plantation Walk Payable (1%)"] = (0.01, "Credit")
+            if location == "South Beach":
+                accounts["23100 - Resort Tax Payable"] = (0.02, "Credit")
+            for account, (share, side) in accounts.items():
+                days = np.repeat(location_sales["Day"].to_numpy(), per_day)
+                values = np.repeat(location_sales["Amount"].to_numpy() * share / per_day, per_day)
+                frames.append(self.gl_account_rows(entity, location, account, days, values, side))
+
+        # Due To/From balances between entities; the counterparty books the opposite side,
+        # with the occasional mismatch for the discrepancy report
+        entities = CNB_DICTIONARY["location name"]
+        accounts = CNB_DICTIONARY["due to/from account"]
+        for i, entity in enumerate(entities):
+            for j in self.rng.choice(len(entities), 3, replace=False):
+                if i == j:
+                    continue
+                n = self.count("due_to_from_entries")
+                days = self.rng.integers(0, len(self.days), n)
+                values = self.amounts(-5000, 5000, n)
+                mirrored = values if self.rng.random() > 0.1 else values + self.amounts(1, 50, n)
+                frames.append(self.gl_account_rows(entity, entity, f"{14100 + j} - {accounts[j]}",
+                                                   days, values, None))
+                frames.append(self.gl_account_rows(entities[j], entities[j], f"{14100 + i} - {accounts[i]}",
+                                                   days, -mirrored, None))
+
+        gl = pd.concat(frames, ignore_index=True)[GL_COLUMNS]
+        preamble = ["Account Detail", "Carrot Express",
+                    f"{self.days[0]:%m/%d/%Y} - {self.days[-1]:%m/%d/%Y}"]
+        return self.write_csv(gl, f"GL_Detail_{self.tag}.csv", preamble=preamble)
+
+    def gl_account_rows(self, entity, location, account, days, values, side):
+        """
+        Transactions of one account at one entity, in date order, followed by the account's
+        total row. side is "Credit" or "Debit", or None to post positive values as debits.
+        """
+        import numpy as np
+        import pandas as pd
+
+        order = np.argsort(days, kind="stable")
+        days, values = days[order], np.round(values[order], 2)
+        if side == "Credit":
+            debit, credit = np.zeros(len(values)), values
+        elif side == "Debit":
+            debit, credit = values, np.zeros(len(values))
+        else:
+            debit, credit = np.where(values > 0, values, 0), np.where(values < 0, -values, 0)
+        balance = np.round(np.cumsum(credit - debit) if side == "Credit" else np.cumsum(debit - credit), 2)
+        total = balance[-1] if len(balance) else 0.0
+        n = len(values)
+
+        # Gift card lines only count toward the reconcile when the TrxNumber carries NJ
+        trx = np.where(self.rng.random(n) < 0.5, "NJ", "JE")
+        rows = pd.DataFrame({
+            "LocationName1": entity,
+            "ParentAccountName": account,
+            "BegBalAmount2": 0,
+            "AccountName": account,
+            "BegBalAmount": 0,
+            "TrxDate": self.day_strings(days, "%m/%d/%Y"),
+            "TrxType": "Journal Entry",
+            "TrxNumber": pd.Series(trx) + pd.Series(np.arange(n)).astype(str).str.zfill(6),
+            "TrxCompany": entity,
+            "LocationName": location,
+            "Comment": "",
+            "Comment1": "",
+            "Debit": debit,
+            "Credit": credit,
+            "Textbox17": balance,
+            "Credit1": round(float(credit.sum()), 2),
+            "Textbox33": balance,
+            "Textbox49": "",
+            "Textbox19": "", "Textbox21": "", "Textbox23": "", "Textbox25": "", "Textbox27": "",
+            "Textbox50": total,
+        })
+        account_name = account.split(" - ", 1)[-1]
+        total_row = pd.DataFrame([{"LocationName1": entity, "LocationName": location, "TrxDate": "",
+                                   "Textbox33": total, "Textbox49": f"Total {account_name}"}])
+        return pd.concat([rows, total_row], ignore_index=True)
+
+    def profit_loss(self):
+        import pandas as pd
+        from royalties_processor import PROFIT_LOSS_LINE_ITEMS
+
+        totals = self.orders.groupby("Location")["Amount"].sum()
+        rows = []
+        for location, entity in self.entities.items():
+            sales = float(totals.get(location, 0))
+            for line in list(PROFIT_LOSS_LINE_ITEMS.values()) + PROFIT_LOSS_EXTRA_LINES:
+                share = 1.0 if line == "Total Sales" else self.rng.uniform(0.01, 0.3)
+                rows.append({"gaName3": line, "ColumnGroupLabel": entity,
+                             "ValueDisplay3": f"${sales * share:,.2f}", "Textbox5": ""})
+        preamble = ["Profit and Loss", "Carrot Express", f"{self.days[0]:%m/%d/%Y} - {self.days[-1]:%m/%d/%Y}"]
+        return self.write_csv(pd.DataFrame(rows), f"profit_loss_{self.tag}.csv", preamble=preamble)
+
+    def delivery_je_files(self):
+        """JE imports as the delivery pipelines write them, for running royalties on its own"""
+        import pandas as pd
+        paths = []
+        for prefix, accounts in DELIVERY_JE_ACCOUNTS.items():
+            rows = []
+            for location, entity in self.entities.items():
+                for day in self.days:
+                    for account in accounts:
+                        rows.append({"JENumber": f"{prefix[:2].upper()}{day:%m%d%Y}", "Type": "Standard",
+                                     "Date": f"{day:%m/%d/%Y}", "ReversalDate": "",
+                                     "JEComment": f"{prefix} Orders {day:%m/%d/%Y}", "JELocation": entity,
+                                     "Account": account,
+                                     "Debit": round(float(self.rng.uniform(0, 40 * self.scale)), 2),
+                                     "Credit": round(float(self.rng.uniform(0, 400 * self.scale)), 2),
+                                     "DetailLocation": entity, "DetailComment": f"{prefix} {account}"})
+            paths.append(self.write_csv(pd.DataFrame(rows, columns=JE_COLUMNS), f"{prefix}_JE_{self.tag}.csv"))
+        return paths
+
+    # Delivery platforms
+
+    def platform_days(self, key, locations):
+        """Random (location, day index) pairs for one platform's orders"""
+        n = len(locations) * len(self.days) * self.count(key)
+        return self.rng.choice(locations, n), self.rng.integers(0, len(self.days), n)
+
+    def doordash(self):
+        import numpy as np
+        import pandas as pd
+
+        locations, days = self.platform_days("doordash_orders_per_day", self.ny_locations)
+        n = len(locations)
+        subtotal = self.amounts(10, 80, n)
+        fee_rows = self.rng.random(n) < 0.02
+        df = pd.DataFrame({
+            "Timestamp UTC Date": self.day_strings(days, "%Y-%m-%d"),
+            "Timestamp Local Date": self.day_strings(days, "%Y-%m-%d"),
+            "Business ID": 1234567,
+            "Store ID": 7654321,
+            "Store Name": [f"Carrot Express ({location})" for location in locations],
+            "Transaction Type": np.where(fee_rows, "FEE", "DELIVERY"),
+            "DoorDash Order ID": np.arange(n) + 900000000,
+            "Final Order Status": self.rng.choice(["Delivered", "Picked Up"], n, p=[0.7, 0.3]),
+            "Subtotal": np.where(fee_rows, 0, subtotal),
+            "Subtotal Tax Passed by DoorDash to Merchant": np.where(fee_rows, 0, (subtotal * 0.07).round(2)),
+            "Commission": np.where(fee_rows, 0, -(subtotal * 0.15).round(2)),
+            "Marketing Fees": np.where(self.rng.random(n) < 0.1, -2.0, 0),
+            "Merchant funded subtotal discount amount": np.where(self.rng.random(n) < 0.1, -3.0, 0),
+            "Error Charge": np.where(self.rng.random(n) < 0.01, -5.0, 0),
+            "Debit": np.where(fee_rows, self.amounts(1, 30, n), 0),
+            "Credit": 0,
+            "Net Total": (subtotal * 0.92).round(2),
+        })
+        start, end = self.days[0].strftime("%Y-%m-%d"), self.days[-1].strftime("%Y-%m-%d")
+        return self.write_csv(df, f"financials_detailed_transactions_us_{start}_{end}.csv")
+
+    def grubhub(self):
+        import numpy as np
+        import pandas as pd
+
+        locations, days = self.platform_days("grubhub_orders_per_day", list(GRUBHUB_RESTAURANTS))
+        n = len(locations)
+        subtotal = self.amounts(10, 70, n)
+        tax = (subtotal * 0.07).round(2)
+        delivery_fee = np.where(self.rng.random(n) < 0.6, 2.99, 0)
+        tip = self.rng.choice([0, 2, 3, 4.5], n)
+        commission = -(subtotal * 0.2).round(2)
+        processing = -(subtotal * 0.03).round(2)
+        promotion = np.where(self.rng.random(n) < 0.1, -3.0, 0)
+        rewards = np.where(self.rng.random(n) < 0.05, -2.0, 0)
+        df = pd.DataFrame({
+            "Date": self.day_strings(days, "%Y-%m-%d"),
+            "Order Number": np.arange(n) + 3000000,
+            "Restaurant": [GRUBHUB_RESTAURANTS[location] for location in locations],
+            "Transaction Type": "Prepaid Order",
+            "Fulfillment Type": self.rng.choice(["Self Delivery", "Pick-Up"], n, p=[0.6, 0.4]),
+            "Subtotal": subtotal,
+            "Delivery Fee": delivery_fee,
+            "Tax Fee": tax,
+            "Tip": tip,
+            "Commission": commission,
+            "Processing Fee": processing,
+            "Targeted Promotion": promotion,
+            "Rewards": rewards,
+            "Restaurant Total": (subtotal + delivery_fee + tax + tip + commission + processing +
+                                 promotion + rewards).round(2),
+        })
+        return self.write_csv(df, f"grubhub_transactions_{self.tag}.csv")
+
+    def uber(self):
+        import numpy as np
+        import pandas as pd
+        from uber_entries import LOCATION_MAPPING
+
+        stores = list(LOCATION_MAPPING)
+        locations, days = self.platform_days("uber_orders_per_day", stores)
+        n = len(locations)
+        order_dates = [self.days[i] for i in days]
+        # Weekly payouts land on the Monday after the Monday-Sunday order week
+        payout_dates = [d + timedelta(days=7 - d.weekday()) for d in order_dates]
+        sales = self.amounts(8, 70, n)
+        tax = (sales * 0.07).round(2)
+        refunded = self.rng.random(n) < 0.02
+        promotions = np.where(self.rng.random(n) < 0.1, -3.0, 0)
+        fee = -(sales * 0.25).round(2)
+        df = pd.DataFrame({
+            "Store Name": locations,
+            "Store ID": "a1b2c3",
+            "Order ID": [f"{k:08x}" for k in range(n)],
+            "Workflow ID": [f"w{k:08x}" for k in range(n)],
+            "Dining Mode": self.rng.choice(["Delivery - Partner Using Uber App", "Pickup"], n, p=[0.75, 0.25]),
+            "Payment Mode": "Card",
+            "Order Channel": "Uber Eats",
+            "Order Status": np.where(refunded, "Refund", "Completed"),
+            "Order Date": [f"{d:%Y-%m-%d}" for d in order_dates],
+            "Order Accept Time": "12:00",
+            "Sales (excl. tax)": sales,
+            "Tax on sales": tax,
+            "Sales (incl. tax)": (sales + tax).round(2),
+            "Refunds (excl tax)": np.where(refunded, -sales, 0),
+            "Tax on Refunds": np.where(refunded, -tax, 0),
+            "Price adjustments (excl. tax)": 0,
+            "Tax on price adjustments": 0,
+            "Promotions on items": promotions,
+            "Tax on Promotion on items": (promotions * 0.07).round(2),
+            "Marketing adjustment": 0,
+            "Other payments": 0,
+            "Marketplace fee": fee,
+            "Marketplace Facilitator Tax": -tax,
+            "Total payout ": (sales + promotions + fee).round(2),
+            "Payout Date": [f"{d:%Y-%m-%d}" for d in payout_dates],
+        })
+        return self.write_csv(df, f"Uber_Payment_Details_{self.tag}.csv", preamble=["Payment details report"])
+
+    # Tips (OLO, Knock, Relay, Metro Speedy, Relacion, tip payroll)
+
+    def olo(self):
+        """OLO Itemized Orders for the online Toast orders, plus the Transaction and Cancelled exports"""
+        import numpy as np
+        import pandas as pd
+        from tips_reconcile import TipsReconcileThread
+
+        store_names = {}
+        for store, location in TipsReconcileThread([], "").olo_mapping.items():
+            store_names.setdefault(location, store)
+
+        online = self.orders[self.orders["Dining Options"].str.contains("|".join(OLO_MARKERS))]
+        online = online[online["Location"].isin(list(store_names))]
+        n = len(online)
+        placed = pd.to_datetime(online["Opened"], format="%m/%d/%y %I:%M %p")
+        wanted = (placed + pd.Timedelta(minutes=40)).dt.strftime("%m/%d/%Y %I:%M %p")
+        itemized = pd.DataFrame({
+            "Order ID": online["Order #"].to_numpy(),
+            "Type": self.rng.choice(["Dispatch", "Delivery", "Pickup"], n),
+            "Store Name": online["Location"].map(store_names).to_numpy(),
+            "Time Wanted": np.where(self.rng.random(n) < 0.5, "Immediate", wanted),
+            "Time Placed": placed.dt.strftime("%m/%d/%Y %I:%M %p").to_numpy(),
+            "Tip": (online["Tip"] + np.where(self.rng.random(n) < 0.03, 0.5, 0)).to_numpy().round(2),
+        })
+        ids = itemized["Order ID"].to_numpy()
+        transactions = pd.DataFrame({"Order ID": ids,
+                                     "Transaction Type": self.rng.choice(["Sale", "RefundSale", "VoidSale"], n,
+                                                                         p=[0.96, 0.02, 0.02])})
+        cancelled = pd.DataFrame({"Order ID": ids[self.rng.random(n) < 0.01]})
+        return [self.write_csv(itemized, f"Itemized_Orders_{self.tag}.csv"),
+                self.write_csv(transactions, f"Transaction_{self.tag}.csv"),
+                self.write_csv(cancelled, f"Itemized_Cancelled_{self.tag}.csv")]
+
+    def delivery_rows(self, key, locations=1):
+        n = locations * len(self.days) * self.count(key)
+        days = self.rng.integers(0, len(self.days), n)
+        return n, days
+
+    def knock(self):
+        import pandas as pd
+        from tips_reconcile import TipsReconcileThread
+
+        paths = []
+        knock_names = list(TipsReconcileThread([], "").knock_mapping)[:4]
+        for name in knock_names:
+            n, days = self.delivery_rows("knock_deliveries_per_day")
+            data = pd.DataFrame({"Date": self.day_strings(sorted(days), "%m/%d/%Y") + ["TOTALS"],
+                                 "Tip": list(self.amounts(0, 8, n)) + [0], "Fee": 5.0})
+            path = self.path(f"Billing_{name.replace(' ', '_').lower()}_{self.tag}.xlsx")
+            with pd.ExcelWriter(path) as writer:
+                pd.DataFrame([[f"Carrot {name}"]]).to_excel(writer, index=False, header=False, startrow=0)
+                data.to_excel(writer, index=False, startrow=2)
+            self.rows[path] = n + 3
+            paths.append(path)
+        return paths
+
+    def relay(self):
+        import numpy as np
+        import pandas as pd
+        from tips_reconcile import TipsReconcileThread
+
+        paths = []
+        for key in TipsReconcileThread([], "").relay_mapping:
+            n, days = self.delivery_rows("relay_deliveries_per_day")
+            first, last = self.names(n)
+            orders = pd.DataFrame({
+                "ID": np.arange(1, n + 1),
+                "Time": [f"{self.days[d]:%m/%d/%Y} {h}:{m:02d}" for d, h, m in
+                         zip(days, self.rng.integers(11, 21, n), self.rng.integers(0, 60, n))],
+                "Status": np.where(self.rng.random(n) < 0.05, "VOIDED", "DELIVERED"),
+                "Consumer": pd.Series(first) + " " + pd.Series(last),
+                "Tip": self.rng.choice([1.5, 2, 3.25, 4], n),
+            })
+            path = self.path(f"relay_carrotexpress{key}_invoice_{self.tag}.xlsx")
+            with pd.ExcelWriter(path) as writer:
+                pd.DataFrame({"Invoice": [f"Relay {key}"], "Deliveries": [n]}).to_excel(
+                    writer, sheet_name="Summary", index=False)
+                orders.to_excel(writer, sheet_name="Orders", index=False)
+            self.rows[path] = n + 2
+            paths.append(path)
+        return paths
+
+    def metro_speedy(self):
+        import pandas as pd
+        n, days = self.delivery_rows("metro_speedy_deliveries_per_day")
+        path = self.path(f"Metro_Speedy_{self.tag}.xlsx")
+        pd.DataFrame({"Date": self.day_strings(sorted(days), "%m/%d/%Y"),
+                      "Tip": self.rng.choice([1.5, 2.25, 3.0], n), "Location": "Lexington"}).to_excel(path, index=False)
+        self.rows[path] = n + 1
+        return path
+
+    def relacion(self):
+        import pandas as pd
+        n, days = self.delivery_rows("relacion_deliveries_per_day")
+        path = self.path(f"Relacion para Carrot Express {self.tag}.xlsx")
+        detail = [["Fecha", "Tip"]] + [[self.days[d].strftime("%m/%d/%Y"), tip]
+                                       for d, tip in zip(sorted(days), self.rng.choice([2, 3, 4.5], n))]
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame(columns=["Resumen entregas Carrot South Beach"]).to_excel(
+                writer, sheet_name="Resumen", index=False)
+            pd.DataFrame(detail, columns=["Detalle", ""]).to_excel(writer, sheet_name="Detalle", index=False)
+        self.rows[path] = n + 2
+        return path
+
+    def tips_payroll(self):
+        """Tip distribution sheet: a location row, then indicator rows with the amount in column AZ"""
+        import pandas as pd
+        rows = []
+        for location in self.locations:
+            rows.append([location, "Empleado registro Toast"] + [""] * 51)
+            for indicator in ["Total Tips  DIA repartir", "Delivery"]:
+                row = [""] * 53
+                row[1] = indicator
+                row[51] = round(float(self.rng.uniform(100, 900) * self.scale), 2)
+                rows.append(row)
+        df = pd.DataFrame(rows, columns=[f"Column{k}" for k in range(53)])
+        return self.write_csv(df, f"Payroll_Tips_{self.tag}.csv")
+
+    # PX gift cards
+
+    def paytronix(self):
+        import numpy as np
+        import pandas as pd
+        from px_functions import STORE_TO_DETAIL_LOCATION
+
+        payout_days = [d for d in self.days for _ in range(self.count("px_payouts_per_day"))]
+        n = len(payout_days)
+        gross = self.amounts(50, 4000, n)
+        fees = (gross * 0.03).round(2)
+        payouts = pd.DataFrame({
+            "": np.arange(n), "Payout ID": [f"po_{k}" for k in range(n)], "Payout Status": "paid",
+            "Description": "STRIPE PAYOUT",
+            "Payout Created Date": [f"{d:%Y-%m-%d} 06:00:00" for d in payout_days],
+            "Payout Arrival Date": [f"{d + timedelta(days=2):%Y-%m-%d}" for d in payout_days],
+            "Gross": [f"${value:,.2f}" for value in gross], "Fees": [f"${value:,.2f}" for value in fees],
+            "Total": [f"${value:,.2f}" for value in gross - fees],
+        })
+        paths = [self.write_csv(payouts, f"Payouts_{self.tag}.csv")]
+
+        # Chase activity: one Paytronix deposit per payout plus unrelated debits; every row
+        # carries the trailing comma of the real export
+        path = self.path(f"Chase_Activity_{self.tag}.CSV")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write("Details,Posting Date,Description,Amount,Type,Balance,Check or Slip #\n")
+            for d, net in zip(payout_days, gross - fees):
+                f.write(f'CREDIT,{d:%m/%d/%Y},"ORIG CO NAME:Paytronix ORIG ID:1234 DESC DATE:{d:%y%m%d}",'
+                        f'{net:.2f},ACH_CREDIT,1000.00,,\n')
+                f.write(f'DEBIT,{d:%m/%d/%Y},"OTHER VENDOR PAYMENT",-{self.rng.uniform(1, 900):.2f},'
+                        f'ACH_DEBIT,1000.00,,\n')
+        self.rows[path] = 2 * n + 1
+        paths.append(path)
+
+        stores = list(STORE_TO_DETAIL_LOCATION)
+        n = self.count("px_redemptions")
+        days = self.rng.integers(0, len(self.days), n)
+        redemptions = pd.DataFrame({
+            "Store Name": self.rng.choice(stores, n),
+            "Card Template": self.rng.choice(["eGift", "Plastic"], n),
+            "Dollars Redeemed": -self.amounts(1, 60, n),
+            "Date": [f"{self.days[d]:%m/%d/%Y} 12:00 PM" for d in days],
+        })
+        paths.append(self.write_csv(redemptions, f"StoredValueRedemption_{self.tag}.csv",
+                                    preamble=["Stored Value Redemption Report"]))
+        return paths
+
+    # Payroll
+
+    def payroll(self):
+        """Toast time entries and the payroll dictionary, in the payroll_automation subfolder"""
+        import numpy as np
+        import pandas as pd
+
+        employees = []
+        for location in self.locations:
+            first, last = self.names(self.count("employees"))
+            employees += [(location, f"{l}, {f}") for f, l in dict.fromkeys(zip(first, last))]
+        rng = self.rng
+
+        entries = []
+        for location, employee in employees:
+            days = np.sort(rng.choice(len(self.days), min(len(self.days), 22), replace=False))
+            hours = rng.uniform(4, 10, len(days)).round(2)
+            for day, worked in zip(days, hours):
+                entries.append({"Location": location, "Employee": employee, "Job Title": "Line Cook",
+                                "In Date": f"{self.days[day]:%m/%d/%Y}", "Out Date": f"{self.days[day]:%m/%d/%Y}",
+                                "Total Hours": worked, "Unpaid Break Time": 0.5, "Paid Break Time": 0})
+        time_entries = self.write_csv(pd.DataFrame(entries), f"Time_Entries_{self.tag}.csv", "payroll_automation")
+
+        n = len(employees)
+        salaried = rng.random(n) < 0.1
+        dictionary = pd.DataFrame({
+            "Location": [location for location, _ in employees],
+            "Employee": [employee for _, employee in employees],
+            "Code": np.arange(n) + 1000,
+            "ADP Company Code": "C1X",
+            "ADP Employee Code": [f"{k:06d}" for k in range(n)],
+            "Wage Basis": np.where(salaried, "Salary", "Hourly"),
+            "Rate": np.where(salaried, 1500.0, rng.uniform(13, 22, n).round(2)),
+            "Tip Adjustment": 0,
+            "Bonus": np.where(rng.random(n) < 0.05, 100.0, 0),
+            "Wage Owed": 0,
+            "Reimbursements": 0,
+            "Comment": "",
+            "Recordatorio futuros": "",
+            "PAY?": np.where(rng.random(n) < 0.02, "No", "Yes"),
+            "Holiday Date": np.where(np.arange(n) == 0, f"{self.days[0]:%m/%d/%Y}", ""),
+        })
+        path = self.path(f"Payroll_Dictionary_{self.tag}.xlsx", "payroll_automation")
+        dictionary.to_excel(path, index=False)
+        self.rows[path] = n + 1
+        return time_entries, path
+
+    # AP and bank transfers
+
+    def ap_payments(self):
+        import pandas as pd
+        from vendor_resolver import load_vendor_mapping
+
+        vendors = list(load_vendor_mapping())
+        entities = ["Carrot Leadership LLC"] + list(self.entities.values())
+        n = self.count("ap_payments")
+        df = pd.DataFrame({
+            "Vendor": self.rng.choice(vendors, n),
+            "Inv. Date": self.day_strings(self.rng.integers(0, len(self.days), n), "%m/%d/%Y"),
+            "Invoice": [f"INV{k:06d}" for k in range(n)],
+            "Payment Date": f"{self.days[-1]:%m/%d/%Y}",
+            "Location": self.rng.choice(entities, n),
+            "Pay $": self.amounts(10, 5000, n),
+        })
+        return self.write_csv(df, f"AP_Payments_{self.tag}.csv", "ap_process")
+
+    def ap_reconcile(self):
+        """R365 payment export, the CNB ACH batch built from it, and the account balances"""
+        import pandas as pd
+        from collections import defaultdict
+        from ap_reconcile import ReconcileThread
+        from vendor_resolver import get_vendor_resolver
+
+        account_to_store = ReconcileThread("", "", "", "").account_to_store
+        resolver = get_vendor_resolver()
+        store_to_account = {}
+        for account, stores in account_to_store.items():
+            for store in stores if isinstance(stores, list) else [stores]:
+                store_to_account[store] = account
+        stores = list(store_to_account)
+        vendors = list(resolver.vendor_mapping)
+
+        n = self.count("r365_payments")
+        r365 = pd.DataFrame({
+            "Store": self.rng.choice(stores, n),
+            "Payment Type": self.rng.choice(["ACHB", "ACHB", "ACHB", "WIRE", "RENT", "XFR", "CHECK"], n),
+            "Vendor": self.rng.choice(vendors, n),
+            "Total": self.amounts(10, 3000, n),
+            "Invoice Number": [f"INV{k}" for k in range(n)],
+            "Approved Payment Date": self.rng.choice([f"{self.days[-1]:%m/%d/%Y}", f"Paid {self.days[-1]:%m/%d/%Y}", ""], n),
+        })
+        totals = defaultdict(lambda: defaultdict(float))
+        for store, payment_type, vendor, total in r365[["Store", "Payment Type", "Vendor", "Total"]].itertuples(index=False):
+            if payment_type == "ACHB":
+                totals[store_to_account[store]][resolver.ach_name(vendor)] += total
+        r365["Total"] = [f"${value:,.2f}" for value in r365["Total"]]
+        paths = [self.write_csv(r365, f"R365_Payments_{self.tag}.csv", "ap_reconcile", preamble=["R365 Export"])]
+
+        ach = []
+        for account, recipients in totals.items():
+            ach.append({"From Account": account, "Recipient Name": "", "Recipient Payment Amount": ""})
+            for recipient, amount in recipients.items():
+                # A few payments differ from R365 so the reconciliation has something to report
+                amount += self.rng.choice([0, 0, 0, 0, 5, -12.5])
+                ach.append({"From Account": "", "Recipient Name": recipient,
+                            "Recipient Payment Amount": f"${amount:,.2f}"})
+        paths.append(self.write_csv(pd.DataFrame(ach), f"Ach_Batch_{self.tag}.csv", "ap_reconcile"))
+
+        path = self.path(f"Balances_{self.tag}.csv", "ap_reconcile")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for account in account_to_store:
+                f.write(f'"Available Balance ${self.rng.uniform(0, 300000):,.2f}"\n"Current Balance $1.00"\n'
+                        f'"City National Bank of Florida {account}"\n')
+        self.rows[path] = 3 * len(account_to_store)
+        paths.append(path)
+        return paths
+
+    def cnb_transfers(self):
+        import pandas as pd
+        from cnb_transfer_je import TransferThread
+
+        companies = list(TransferThread([], "").cnb_je_location_dict)
+        n = self.count("cnb_transfers")
+        pairs = [self.rng.choice(companies, 2, replace=False) for _ in range(n)]
+        df = pd.DataFrame({"From company ---> To company": [f"{a} ---> {b}" for a, b in pairs],
+                           "Amount": self.amounts(1, 50000, n)})
+        return self.write_csv(df, f"CNB_Transfers_{self.tag}.csv", "cnb_transfer_je")
+
+
+def generate(output_dir, scale=1, month="2024-09", seed=0):
+    """
+    Write a synthetic month under output_dir and return its manifest:
+    {"scale", "month", "seed", "pipelines": {name: {"args": {...}, "rows": n, "bytes": n}}}
+    """
+    data = SyntheticMonth(output_dir, scale, month, seed)
+
+    orders = data.toast_orders()
+    gl = data.gl_detail()
+    export = data.toast_export()
+    group = data.group_overview()
+    tax_exempt = data.tax_exempt()
+    profit_loss = data.profit_loss()
+    delivery_je = data.delivery_je_files()
+    tips = data.olo() + data.knock() + data.relay() + [data.metro_speedy(), data.relacion(), data.tips_payroll()]
+    time_entries, payroll_dict = data.payroll()
+
+    pipelines = {
+        "toast_reconcile": {"files": [orders, gl, export, group]},
+        "tips_reconcile": {"files": [orders, gl] + tips},
+        "royalties_process": {"files": [group, orders, gl, profit_loss, tax_exempt] + delivery_je},
+        "doordash_process": {"files": [data.doordash(), orders]},
+        "grubhub_process": {"files": [data.grubhub(), orders]},
+        "ubereats_process": {"files": [data.uber(), orders]},
+        "px_giftcards": {"files": data.paytronix()},
+        "due_to_from": {"files": [gl]},
+        "payroll_automation": {"files": [], "time_entries": time_entries, "payroll_dict": payroll_dict},
+        "ap_process": {"files": [data.ap_payments()]},
+        "ap_reconcile": {"files": data.ap_reconcile()},
+        "cnb_transfer_je": {"files": [data.cnb_transfers()]},
+    }
+
+    manifest = {"scale": scale, "month": month, "seed": seed, "pipelines": {}}
+    for name, args in pipelines.items():
+        inputs = args["files"] + [path for key, path in args.items() if key != "files"]
+        manifest["pipelines"][name] = {
+            "args": args,
+            "rows": sum(data.rows[path] for path in inputs),
+            "bytes": sum(os.path.getsize(path) for path in inputs),
+        }
+
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Write one synthetic month of pipeline inputs.")
+    parser.add_argument("output_dir", help="folder to write the inputs to")
+    parser.add_argument("--scale", type=float, default=1, help="multiple of a real month's volume (default 1)")
+    parser.add_argument("--month", default="2024-09", help="month to generate, as YYYY-MM")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    manifest = generate(args.output_dir, args.scale, args.month, args.seed)
+    for name, entry in manifest["pipelines"].items():
+        print(f"{name:20} {entry['rows']:>10} rows {entry['bytes'] / 1e6:>10.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
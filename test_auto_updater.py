@@ -0,0 +1,209 @@
+import os
+import json
+import hashlib
+import socket
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+import auto_updater
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves the routes of its server (path -> (content type, body)), honouring
+    `Range: bytes=N-`. When server.cut_after is set, the next response stops after that
+    many bytes and drops the connection, like an interrupted download.
+    """
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.path not in self.server.routes:
+            self.send_error(404)
+            return
+        content_type, body = self.server.routes[self.path]
+        start = 0
+        if self.headers.get('Range', '').startswith('bytes='):
+            start = int(self.headers['Range'][len('bytes='):].split('-')[0])
+            if start >= len(body):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body) - start))
+        self.end_headers()
+
+        cut_after, self.server.cut_after = self.server.cut_after, None
+        if cut_after is None:
+            self.wfile.write(body[start:])
+        else:
+            self.wfile.write(body[start:start + cut_after])
+            self.wfile.flush()
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    """A local release endpoint; yields (server, base url)"""
+    server = HTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.routes = {}
+    server.requests = []
+    server.cut_after = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def serve_release(server, tag):
+    release = {'tag_name': tag, 'assets': [{'name': 'update.zip', 'browser_download_url': 'unused'}]}
+    server.routes['/latest.json'] = ('application/json', json.dumps(release).encode())
+
+
+def test_fetch_latest_release_up_to_date(stand_in, tmp_path):
+    server, base = stand_in
+    serve_release(server, auto_updater.CURRENT_VERSION)
+    assert auto_updater.fetch_latest_release(f"{base}/latest.json", min_interval=0,
+                                             cache_path=str(tmp_path / 'cache.json')) is None
+
+
+def test_fetch_latest_release_new_version(stand_in, tmp_path):
+    server, base = stand_in
+    serve_release(server, 'v99.0.0')
+    release = auto_updater.fetch_latest_release(f"{base}/latest.json", min_interval=0,
+                                                cache_path=str(tmp_path / 'cache.json'))
+    assert release['tag_name'] == 'v99.0.0'
+
+
+def test_fetch_latest_release_network_error(tmp_path):
+    # A port nothing listens on
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    with pytest.raises(requests.ConnectionError):
+        auto_updater.fetch_latest_release(f"http://127.0.0.1:{port}/latest.json", min_interval=0,
+                                          cache_path=str(tmp_path / 'cache.json'))
+
+
+ARCHIVE = bytes(range(256)) * 4096
+ARCHIVE_SHA256 = hashlib.sha256(ARCHIVE).hexdigest()
+
+
+def range_requests(server):
+    return [headers.get('Range') for path, headers in server.requests if path == '/update.zip']
+
+
+def test_download_file_resumes_interrupted_download(stand_in, tmp_path):
+    server, base = stand_in
+    server.routes['/update.zip'] = ('application/zip', ARCHIVE)
+    server.cut_after = len(ARCHIVE) // 3
+    dest = str(tmp_path / 'update.zip')
+
+    assert auto_updater.download_file(f"{base}/update.zip", dest, ARCHIVE_SHA256) == dest
+    with open(dest, 'rb') as f:
+        assert f.read() == ARCHIVE
+    # Resumed from the last whole chunk written before the connection dropped
+    first, resumed = range_requests(server)
+    assert first is None and resumed.startswith('bytes=') and resumed != 'bytes=0-'
+    assert os.listdir(tmp_path) == ['update.zip']
+
+
+def test_download_file_resumes_partial_from_earlier_attempt(stand_in, tmp_path):
+    server, base = stand_in
+    server.routes['/update.zip'] = ('application/zip', ARCHIVE)
+    dest = str(tmp_path / 'update.zip')
+    with open(f"{dest}.{ARCHIVE_SHA256}.part", 'wb') as f:
+        f.write(ARCHIVE[:1000])
+
+    auto_updater.download_file(f"{base}/update.zip", dest, ARCHIVE_SHA256)
+    assert range_requests(server) == ["bytes=1000-"]
+    with open(dest, 'rb') as f:
+        assert f.read() == ARCHIVE
+
+
+def test_download_file_discards_partial_of_another_release(stand_in, tmp_path):
+    server, base = stand_in
+    server.routes['/update.zip'] = ('application/zip', ARCHIVE)
+    dest = str(tmp_path / 'update.zip')
+    older = b'older release' * 100
+    for stale in (f"{dest}.{hashlib.sha256(older).hexdigest()}.part", f"{dest}.part"):
+        with open(stale, 'wb') as f:
+            f.write(older)
+
+    auto_updater.download_file(f"{base}/update.zip", dest, ARCHIVE_SHA256)
+    assert range_requests(server) == [None]
+    assert os.listdir(tmp_path) == ['update.zip']
+
+
+def test_download_file_rejects_wrong_hash(stand_in, tmp_path):
+    server, base = stand_in
+    server.routes['/update.zip'] = ('application/zip', ARCHIVE)
+    dest = str(tmp_path / 'update.zip')
+
+    with pytest.raises(ValueError):
+        auto_updater.download_file(f"{base}/update.zip", dest, hashlib.sha256(b'other').hexdigest())
+    assert os.listdir(tmp_path) == []
+
+
+def write_tree(root, files):
+    for rel, content in files.items():
+        path = os.path.join(root, *rel.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+def read_tree(root):
+    """{relative path: content} for files and {relative path: None} for empty folders"""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        if not dirnames and not filenames and dirpath != root:
+            tree[rel_dir] = None
+        for name in filenames:
+            with open(os.path.join(dirpath, name)) as f:
+                tree[name if rel_dir == '.' else f"{rel_dir}/{name}"] = f.read()
+    return tree
+
+
+def test_failed_activation_rolls_back_to_previous_tree(tmp_path):
+    app_dir, staged_dir = str(tmp_path / 'app'), str(tmp_path / 'staged')
+    before = {'app.exe': 'old exe', 'lib/core.py': 'old core', 'lib/dropped.py': 'dropped'}
+    write_tree(app_dir, before)
+    write_tree(staged_dir, {'app.exe': 'new exe', 'plugins/extra/new.py': 'new'})
+    # Listed as staged but never extracted, so activation fails after the new folders exist
+    staged = ['app.exe', 'plugins/extra/new.py', 'lib/missing.py']
+
+    snapshot_dir = auto_updater.create_snapshot(app_dir, staged, ['lib/dropped.py'])
+    with pytest.raises(OSError):
+        auto_updater.activate_update(app_dir, staged_dir, snapshot_dir)
+
+    after = read_tree(app_dir)
+    assert {rel: content for rel, content in after.items() if not rel.startswith('snapshots/')} == before
+    assert not os.path.exists(os.path.join(app_dir, auto_updater.UPDATE_MARKER))
+
+
+def test_rollback_after_activation_removes_added_folders(tmp_path):
+    app_dir, staged_dir = str(tmp_path / 'app'), str(tmp_path / 'staged')
+    before = {'app.exe': 'old exe', 'lib/core.py': 'old core'}
+    write_tree(app_dir, before)
+    write_tree(staged_dir, {'app.exe': 'new exe', 'lib/new/added.py': 'added'})
+    staged = ['app.exe', 'lib/new/added.py']
+
+    snapshot_dir = auto_updater.create_snapshot(app_dir, staged, [])
+    auto_updater.activate_update(app_dir, staged_dir, snapshot_dir)
+    assert read_tree(app_dir)['lib/new/added.py'] == 'added'
+
+    auto_updater.rollback_snapshot(app_dir, snapshot_dir)
+    after = read_tree(app_dir)
+    assert {rel: content for rel, content in after.items() if not rel.startswith('snapshots/')} == before
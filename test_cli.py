@@ -0,0 +1,26 @@
+import os
+import sys
+import json
+import subprocess
+
+from synthetic_data import SyntheticMonth
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_json_output_is_only_json_lines(tmp_path):
+    # UberEats prints its journal checks as it goes, which must not reach stdout
+    month = SyntheticMonth(str(tmp_path / "inputs"), scale=0.02)
+    files = [month.toast_orders(), month.uber()]
+    os.makedirs(tmp_path / "output")
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "cli.py"), "ubereats_process", *files,
+         "--output-dir", str(tmp_path / "output"), "--json"],
+        capture_output=True, text=True, cwd=ROOT, timeout=300,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"})
+
+    events = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert events[0]["event"] == "started"
+    assert events[-1]["event"] == "finished" and events[-1]["success"]
+    assert completed.stderr
@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import subprocess
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from month_end import classify_folder, run_stages, critical_path
+from synthetic_data import SyntheticMonth
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def stage(deps, success=True, outputs=(), seen=None, name=None):
+    def run(results):
+        if seen is not None:
+            seen.append(name)
+        return success, "done" if success else "broke", list(outputs)
+    return (deps, run)
+
+
+def test_run_stages_skips_everything_downstream_of_a_failure():
+    seen = []
+    stages = {
+        "parse": stage([], seen=seen, name="parse"),
+        "delivery": stage(["parse"], success=False, seen=seen, name="delivery"),
+        "other_delivery": stage(["parse"], seen=seen, name="other_delivery"),
+        "royalties": stage(["delivery", "other_delivery"], seen=seen, name="royalties"),
+        "report": stage(["royalties"], seen=seen, name="report"),
+        "independent": stage([], seen=seen, name="independent"),
+    }
+    finished = []
+    results = run_stages(stages, 2, lambda name, result: finished.append(name))
+
+    assert {name: r["status"] for name, r in results.items()} == {
+        "parse": "ok", "delivery": "failed", "other_delivery": "ok",
+        "royalties": "skipped", "report": "skipped", "independent": "ok",
+    }
+    assert "royalties" not in seen and "report" not in seen
+    assert sorted(finished) == sorted(stages)
+    assert "delivery" in results["royalties"]["message"]
+
+
+def test_run_stages_passes_dependency_results_and_catches_exceptions():
+    def royalties(results):
+        return True, "ok", results["delivery"]["outputs"] + ["royalties.xlsx"]
+
+    def broken(results):
+        raise KeyError("Location")
+
+    stages = {
+        "delivery": stage([], outputs=["DoorDash_JE.csv"]),
+        "royalties": (["delivery"], royalties),
+        "broken": ([], broken),
+    }
+    results = run_stages(stages, 1, lambda name, result: None)
+    assert results["royalties"]["outputs"] == ["DoorDash_JE.csv", "royalties.xlsx"]
+    assert results["broken"]["status"] == "failed"
+    assert results["broken"]["message"] == "KeyError: 'Location'"
+
+
+def test_critical_path_follows_the_slowest_chain():
+    stages = {
+        "toast_orders": ([], None),
+        "doordash_process": (["toast_orders"], None),
+        "ubereats_process": (["toast_orders"], None),
+        "royalties_process": (["doordash_process", "ubereats_process"], None),
+        "tips_reconcile": ([], None),
+    }
+    elapsed = {"toast_orders": 2, "doordash_process": 5, "ubereats_process": 30,
+               "royalties_process": 3, "tips_reconcile": 20}
+    results = {name: {"elapsed": seconds} for name, seconds in elapsed.items()}
+
+    chain, total = critical_path(stages, results)
+    assert chain == ["toast_orders", "ubereats_process", "royalties_process"]
+    assert total == 35
+
+
+def touch(folder, *names):
+    for name in names:
+        path = os.path.join(folder, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+
+
+def test_classify_folder_routes_by_name(tmp_path):
+    touch(str(tmp_path), "Order_Details.csv", "GL_Detail.csv", "GroupOverview_2024_09_01-2024_09_30.csv",
+          "profit_loss.csv", "financials_detailed_transactions_us.csv", "grubhub_transactions.csv",
+          "Uber_Payment_Details.csv", "Chase_Activity.CSV", "DoorDash_JE.csv", "notes.txt")
+    routed = {name: sorted(os.path.basename(f) for f in files) for name, files in classify_folder(str(tmp_path)).items()}
+
+    assert routed == {
+        "toast_reconcile": ["GL_Detail.csv", "GroupOverview_2024_09_01-2024_09_30.csv", "Order_Details.csv"],
+        "royalties_process": ["DoorDash_JE.csv", "GL_Detail.csv", "GroupOverview_2024_09_01-2024_09_30.csv",
+                              "Order_Details.csv", "profit_loss.csv"],
+        "doordash_process": ["Order_Details.csv", "financials_detailed_transactions_us.csv"],
+        "grubhub_process": ["Order_Details.csv", "grubhub_transactions.csv"],
+        "ubereats_process": ["Order_Details.csv", "Uber_Payment_Details.csv"],
+        "px_giftcards": ["Chase_Activity.CSV"],
+    }
+
+
+def test_classify_folder_shared_files_alone_run_nothing(tmp_path):
+    touch(str(tmp_path), "Order_Details.csv", "GL_Detail.csv")
+    assert classify_folder(str(tmp_path)) == {}
+
+
+def test_classify_folder_pipeline_subfolder_is_exclusive(tmp_path):
+    touch(str(tmp_path), "Order_Details.csv", "Itemized_Orders.csv", "tips_reconcile/Order_Details.csv",
+          "tips_reconcile/Billing_knock.xlsx")
+    routed = classify_folder(str(tmp_path))
+
+    assert sorted(os.path.relpath(f, tmp_path) for f in routed["tips_reconcile"]) == [
+        os.path.join("tips_reconcile", "Billing_knock.xlsx"), os.path.join("tips_reconcile", "Order_Details.csv")]
+    assert list(routed) == ["tips_reconcile"]
+
+
+def test_json_output_is_only_json_lines(tmp_path):
+    # Stage processes print journal checks as they go, which must not reach stdout
+    month = SyntheticMonth(str(tmp_path / "close"), scale=0.02)
+    month.toast_orders()
+    month.uber()
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "month_end.py"), str(tmp_path / "close"),
+         "--output-dir", str(tmp_path / "output"), "--workers", "2", "--json"],
+        capture_output=True, text=True, cwd=ROOT, timeout=600,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"})
+
+    events = [json.loads(line) for line in completed.stdout.splitlines()]
+    summary = events[-1]
+    assert summary["event"] == "summary"
+    assert summary["stages"]["toast_orders"]["status"] == "ok"
+    assert summary["stages"]["ubereats_process"]["status"] == "ok"
+    assert completed.stderr
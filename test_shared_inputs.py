@@ -0,0 +1,88 @@
+import shared_inputs
+from shared_inputs import cached_load, clear_cache, seed_cache
+
+
+def counting_loader(calls):
+    def parse_numbers(path):
+        import pandas as pd
+        calls.append(path)
+        return pd.read_csv(path)
+    return parse_numbers
+
+
+def test_cached_load_reparses_after_file_changes(tmp_path):
+    clear_cache()
+    calls = []
+    loader = counting_loader(calls)
+    path = tmp_path / "numbers.csv"
+
+    path.write_text("a\n1\n2\n")
+    assert cached_load(loader, str(path))["a"].tolist() == [1, 2]
+    assert cached_load(loader, str(path))["a"].tolist() == [1, 2]
+    assert len(calls) == 1
+
+    path.write_text("a\n1\n2\n3\n")
+    assert cached_load(loader, str(path))["a"].tolist() == [1, 2, 3]
+    assert len(calls) == 2
+
+
+def test_cached_load_hands_out_copies(tmp_path):
+    clear_cache()
+    loader = counting_loader([])
+    path = tmp_path / "numbers.csv"
+    path.write_text("a\n1\n")
+
+    cached_load(loader, str(path))["a"] = 99
+    assert cached_load(loader, str(path))["a"].tolist() == [1]
+
+
+def test_cached_load_evicts_least_recently_used(tmp_path, monkeypatch):
+    clear_cache()
+    calls = []
+    loader = counting_loader(calls)
+    paths = []
+    for name in ("first", "second", "third"):
+        path = tmp_path / f"{name}.csv"
+        path.write_text(f"{name}\n" + "1\n" * 100)
+        paths.append(str(path))
+
+    size = shared_inputs.frame_size(cached_load(loader, paths[0]))
+    monkeypatch.setattr(shared_inputs, "CACHE_BUDGET_BYTES", 2 * size)
+    cached_load(loader, paths[1])
+    cached_load(loader, paths[0])
+    cached_load(loader, paths[2])
+    assert len(calls) == 3
+
+    # second was least recently used, so it went to make room for third
+    cached_load(loader, paths[0])
+    assert len(calls) == 3
+    cached_load(loader, paths[1])
+    assert len(calls) == 4
+
+
+def test_seeded_frame_is_served_without_parsing(tmp_path):
+    import pandas as pd
+    clear_cache()
+    calls = []
+    loader = counting_loader(calls)
+    path = tmp_path / "numbers.csv"
+    path.write_text("a\n1\n")
+
+    seed_cache(loader, str(path), pd.DataFrame({"a": [7]}))
+    assert cached_load(loader, str(path))["a"].tolist() == [7]
+    assert calls == []
+
+
+def test_loaders_with_the_same_name_do_not_share_frames(tmp_path):
+    clear_cache()
+    path = tmp_path / "numbers.csv"
+    path.write_text("a\n1\n")
+
+    def loader_returning(value):
+        def parse_numbers(path):
+            import pandas as pd
+            return pd.DataFrame({"a": [value]})
+        return parse_numbers
+
+    assert cached_load(loader_returning(1), str(path))["a"].tolist() == [1]
+    assert cached_load(loader_returning(2), str(path))["a"].tolist() == [2]
@@ -1,12 +1,14 @@
 import os
 import sys
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from PyQt5.QtWidgets import (QVBoxLayout, QPushButton, QLabel,
-                            QFileDialog, QMessageBox, QTextEdit, QApplication, QListWidget)
+                            QFileDialog, QMessageBox, QApplication, QListWidget)
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QIcon
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 
 
 
@@ -59,7 +61,7 @@ class TipsReconcileWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
@@ -184,6 +186,7 @@ class TipsReconcileThread(QThread):
         super().__init__()
         self.input_files = input_files
         self.output_file = output_file  # Store the full file path
+        self._olo_orders = None
 
         self.knock_mapping = {
             "Express Coral Glabes": "Coral Gables",
@@ -300,10 +303,82 @@ class TipsReconcileThread(QThread):
         except Exception as e:
             raise ValueError(f"Error reading file {filename}: {str(e)}")
 
+    def load_olo_orders(self):
+        """
+        Read the OLO itemized, transaction and cancelled exports once, keeping only the
+        columns the reconciliation uses. Order IDs are read as text so every file agrees
+        on them, and each order's business date is resolved in one vectorized pass.
+
+        Returns:
+            dict with 'orders' (every itemized row), 'active' (refunded, voided and
+            cancelled orders removed), 'refunded_ids' and 'cancelled_ids'
+        """
+        if self._olo_orders is not None:
+            return self._olo_orders
+
+        import pandas as pd
+        itemized_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('itemized_orders')]
+        transaction_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('transaction')]
+        cancelled_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('itemized_cancelled')]
+
+        text_columns = ['Order ID', 'Type', 'Store Name', 'Time Placed', 'Time Wanted']
+        orders = self.safe_read_file(itemized_files[0], read_function='csv',
+                                     usecols=text_columns + ['Tip'],
+                                     dtype=dict.fromkeys(text_columns, str))
+        trans_df = self.safe_read_file(transaction_files[0], read_function='csv',
+                                       usecols=['Order ID', 'Transaction Type'],
+                                       dtype={'Order ID': str})
+
+        cancelled_ids = set()
+        if cancelled_files:
+            cancelled_df = self.safe_read_file(cancelled_files[0], read_function='csv',
+                                               usecols=['Order ID'], dtype={'Order ID': str})
+            cancelled_ids = set(cancelled_df['Order ID'])
+
+        refunded_ids = set(trans_df.loc[
+            trans_df['Transaction Type'].isin(['RefundSale', 'VoidSale']), 'Order ID'
+        ])
+
+        # Immediate orders belong to the day they were placed, scheduled ones to the day wanted
+        immediate = orders['Time Wanted'].str.contains('Immediate', na=False)
+        order_time = pd.to_datetime(orders['Time Wanted'].mask(immediate, orders['Time Placed']), format='mixed')
+        orders['Order Date'] = order_time.dt.normalize()
+        orders['Date'] = order_time.dt.strftime('%m/%d/%Y')
+
+        active = orders[~orders['Order ID'].isin(refunded_ids | cancelled_ids)]
+
+        self._olo_orders = {
+            'orders': orders,
+            'active': active,
+            'refunded_ids': refunded_ids,
+            'cancelled_ids': cancelled_ids
+        }
+        return self._olo_orders
+
+    def load_sources(self, loaders):
+        """
+        Run independent source loaders in a thread pool, reporting how long each took.
+
+        Args:
+            loaders: dict of source name -> zero-argument callable
+
+        Returns:
+            dict of source name -> loader result. The first failing source, in the
+            order given, raises its error.
+        """
+        def timed(name, loader):
+            start = time.perf_counter()
+            result = loader()
+            self.update_signal.emit(f"Loaded {name} data in {time.perf_counter() - start:.2f}s")
+            return result
+
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = {name: executor.submit(timed, name, loader) for name, loader in loaders.items()}
+            return {name: future.result() for name, future in futures.items()}
+
     def run(self):
         import pandas as pd
         import openpyxl
-        from openpyxl.utils.dataframe import dataframe_to_rows
         try:
             self.update_signal.emit("Starting reconciliation process...")
 
@@ -318,15 +393,23 @@ class TipsReconcileThread(QThread):
                  toast_metro_speedy_tips, toast_new_company_tips,
                  total_delivery, employee_tips) = self.read_toast_file(base_directory)
 
-            knock_data = self.read_knock_files(base_directory, date_range, self.knock_mapping) if date_range else {}
-            olo_data = self.read_olo_file(base_directory, self.olo_mapping, date_range) if date_range else {}
-            r365_emp_tips, r365_del_tips = self.read_gl_file(base_directory, self.gl_mapping)
-            relay_data = self.read_relay_file(base_directory, self.relay_mapping, date_range) if date_range else pd.DataFrame()
-            metro_speedy_data = self.read_metro_speedy_file(base_directory, date_range) if date_range else pd.DataFrame()
-            new_company_data = self.read_new_company_file(base_directory, date_range) if date_range else pd.DataFrame()
-
-            # Initialize payroll variables
-            payroll_emp_tips, payroll_del_tips = self.read_payroll_file(base_directory)
+            # The remaining sources only depend on the Toast date range, so read them concurrently
+            sources = self.load_sources({
+                'Knock': lambda: self.read_knock_files(base_directory, date_range, self.knock_mapping) if date_range else {},
+                'OLO': lambda: self.read_olo_file(base_directory, self.olo_mapping, date_range) if date_range else {},
+                'GL': lambda: self.read_gl_file(base_directory, self.gl_mapping),
+                'Relay': lambda: self.read_relay_file(base_directory, self.relay_mapping, date_range) if date_range else pd.DataFrame(),
+                'Metro Speedy': lambda: self.read_metro_speedy_file(base_directory, date_range) if date_range else pd.DataFrame(),
+                'Relacion': lambda: self.read_new_company_file(base_directory, date_range) if date_range else pd.DataFrame(),
+                'Payroll': lambda: self.read_payroll_file(base_directory)
+            })
+            knock_data = sources['Knock']
+            olo_data = sources['OLO']
+            r365_emp_tips, r365_del_tips = sources['GL']
+            relay_data = sources['Relay']
+            metro_speedy_data = sources['Metro Speedy']
+            new_company_data = sources['Relacion']
+            payroll_emp_tips, payroll_del_tips = sources['Payroll']
 
             # Create summary file with new company data
             summary = self.create_summary_file(
@@ -350,24 +433,14 @@ class TipsReconcileThread(QThread):
             ws_discrepancy = wb.active
             ws_discrepancy.title = 'Tips Discrepancy'
 
-            # Write discrepancy data to sheet
-            for r_idx, row in enumerate(dataframe_to_rows(discrepancy, index=False), 1):
-                for c_idx, value in enumerate(row, 1):
-                    ws_discrepancy.cell(row=r_idx, column=c_idx, value=value)
-
-            # Format discrepancy sheet
-            self.format_discrepancy_excel(discrepancy, self.output_file, ws_discrepancy)
+            # Write and format the discrepancy sheet in one pass
+            self.write_discrepancy_sheet(discrepancy, ws_discrepancy)
 
             # Setup Summary sheet
             ws_summary = wb.create_sheet('Tips Summary')
 
-            # Write summary data to sheet
-            for r_idx, row in enumerate(dataframe_to_rows(summary, index=False), 1):
-                for c_idx, value in enumerate(row, 1):
-                    ws_summary.cell(row=r_idx, column=c_idx, value=value)
-
-            # Format summary sheet
-            self.format_summary_excel(summary, self.output_file, ws_summary)
+            # Write and format the summary sheet in one pass
+            self.write_summary_sheet(summary, ws_summary)
 
             # Save the workbook
             wb.save(self.output_file)
@@ -442,30 +515,13 @@ class TipsReconcileThread(QThread):
                 f"Missing files:\n   - {missing_files_str}"
             )
 
-        # Read OLO files with error tracking
-        olo_df = self.safe_read_file(itemized_files[0], read_function='csv')
-        trans_df = self.safe_read_file(transaction_files[0], read_function='csv')
-
-        # Get cancelled orders if file exists
-        cancelled_order_ids = set()
-        if cancelled_files:
-            cancelled_df = self.safe_read_file(cancelled_files[0], read_function='csv')
-            cancelled_order_ids = set(cancelled_df['Order ID'].astype(str))
-
-        # Get all Order IDs that have RefundSale or VoidSale
-        refund_void_orders = trans_df[
-            trans_df['Transaction Type'].isin(['RefundSale', 'VoidSale'])
-        ]['Order ID'].unique()
-
-        # Filter out refunded/voided orders from the itemized data
-        olo_df = olo_df[~olo_df['Order ID'].isin(refund_void_orders)]
-        # Also filter out cancelled orders
-        olo_df = olo_df[~olo_df['Order ID'].astype(str).isin(cancelled_order_ids)]
+        # Read OLO files once; refunded, voided and cancelled orders are already removed
+        olo_orders = self.load_olo_orders()
+        olo_df = olo_orders['active']
+        cancelled_order_ids = olo_orders['cancelled_ids']
 
-        # Create a mapping of Order ID to Type for Google orders
-        google_order_types = olo_df[['Order ID', 'Type']].drop_duplicates()
-        google_order_types['Order ID'] = google_order_types['Order ID'].astype(str)
-        google_delivery_orders = set(google_order_types[google_order_types['Type'].isin(['Delivery', 'Dispatch'])]['Order ID'])
+        # Order IDs of Google delivery orders
+        google_delivery_orders = set(olo_df.loc[olo_df['Type'].isin(['Delivery', 'Dispatch']), 'Order ID'])
 
         # Process toast files
         all_toast_data = []
@@ -715,27 +771,12 @@ class TipsReconcileThread(QThread):
         # Find required files
         itemized_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('itemized_orders')]
         transaction_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('transaction')]
-        cancelled_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('itemized_cancelled')]
 
         if not itemized_files or not transaction_files:
             raise ValueError("Required OLO files (Itemized or Transaction) not found")
 
-        # Read files with error tracking
-        df = self.safe_read_file(itemized_files[0], read_function='csv')
-        trans_df = self.safe_read_file(transaction_files[0], read_function='csv')
-
-        # Get cancelled orders if file exists
-        cancelled_order_ids = set()
-        if cancelled_files:
-            cancelled_df = self.safe_read_file(cancelled_files[0], read_function='csv')
-            cancelled_order_ids = set(cancelled_df['Order ID'].astype(str))
-
-        # Filter out refunded/voided/cancelled orders
-        refund_void_orders = trans_df[
-            trans_df['Transaction Type'].isin(['RefundSale', 'VoidSale'])
-        ]['Order ID'].unique()
-        df = df[~df['Order ID'].isin(refund_void_orders)]
-        df = df[~df['Order ID'].astype(str).isin(cancelled_order_ids)]
+        # Refunded/voided/cancelled orders are already filtered out by the shared loader
+        df = self.load_olo_orders()['active']
 
         # Filter for Dispatch and Delivery orders
         df = df[df['Type'].isin(['Dispatch', 'Delivery'])]
@@ -744,14 +785,7 @@ class TipsReconcileThread(QThread):
         ny_locations = ['Bryant Park', 'Lexington', 'Flatiron']
         new_company_locations = ['South Beach']
 
-        def get_date(row):
-            if 'Immediate' in str(row['Time Wanted']):
-                return pd.to_datetime(row['Time Placed']).strftime('%m/%d/%Y')
-            return pd.to_datetime(row['Time Wanted']).strftime('%m/%d/%Y')
-
-        df['Date'] = df.apply(get_date, axis=1)
-        df['DateForFilter'] = pd.to_datetime(df['Date'])
-        df = df[(df['DateForFilter'] >= start_date) & (df['DateForFilter'] <= end_date)]
+        df = df[(df['Order Date'] >= start_date) & (df['Order Date'] <= end_date)].copy()
         df['Location'] = df['Store Name'].map(location_mapping)
 
         # Create masks for filtering
@@ -1057,6 +1091,7 @@ class TipsReconcileThread(QThread):
                                     metro_speedy_data, new_company_data):
         import pandas as pd
         import re
+        from bisect import bisect_left, bisect_right
         # Get the components from olo_data dictionary
         olo_payable = olo_data['delivery_tips']
         ny_employee_tips = olo_data['ny_employee_tips']
@@ -1075,7 +1110,6 @@ class TipsReconcileThread(QThread):
         relay_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('relay_carrotexpress')]
         itemized_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('itemized_orders')]
         transaction_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('transaction')]
-        cancelled_files = [f for f in self.input_files if os.path.basename(f).lower().startswith('itemized_cancelled')]
 
         if not toast_files:
             raise ValueError("Toast file not found")
@@ -1111,33 +1145,22 @@ class TipsReconcileThread(QThread):
         # Process OLO refunds and cancellations
         refund_cancelled_orders_dict = {}
         if itemized_files and transaction_files:
-            olo_df = pd.read_csv(itemized_files[0])
-            trans_df = pd.read_csv(transaction_files[0])
-
-            # Get cancelled orders from cancelled file
-            cancelled_orders_info = {}
-            if cancelled_files:
-                cancelled_df = pd.read_csv(cancelled_files[0])
-                # Create a mapping of Order ID to status "Cancelled"
-                for _, row in cancelled_df.iterrows():
-                    cancelled_orders_info[str(row['Order ID'])] = "Cancelled"
-
-            # Get refunded orders from transaction file
-            refunded_orders_info = {}
-            for _, row in trans_df[trans_df['Transaction Type'].isin(['RefundSale', 'VoidSale'])].iterrows():
-                refunded_orders_info[str(row['Order ID'])] = "Refunded/Adjusted"
+            olo_orders = self.load_olo_orders()
+            olo_df = olo_orders['orders']
+            cancelled_orders_info = olo_orders['cancelled_ids']
+            refunded_orders_info = olo_orders['refunded_ids']
 
             # Combine all problematic orders
-            problematic_orders = set(cancelled_orders_info.keys()).union(set(refunded_orders_info.keys()))
+            problematic_orders = cancelled_orders_info | refunded_orders_info
 
             # Create a filtered DataFrame with problematic orders, excluding Pickup orders
             filtered_problematic_df = olo_df[
-                (olo_df['Order ID'].astype(str).isin(problematic_orders)) &
+                (olo_df['Order ID'].isin(problematic_orders)) &
                 (olo_df['Type'] != 'Pickup')
-            ]
+            ].copy()
 
-            # Group orders by location and date
-            filtered_problematic_df['Date'] = pd.to_datetime(filtered_problematic_df['Time Placed']).dt.strftime('%m/%d/%Y')
+            # Group orders by location and the date they were placed
+            filtered_problematic_df['Date'] = pd.to_datetime(filtered_problematic_df['Time Placed'], format='mixed').dt.strftime('%m/%d/%Y')
 
             for _, row in filtered_problematic_df.iterrows():
                 location = self.olo_mapping.get(row['Store Name'])
@@ -1283,75 +1306,83 @@ class TipsReconcileThread(QThread):
                             else:
                                 incorrect_orders_dict[(location, date)] = [f"#{order}" for order in incorrect_orders]
 
-        def find_matching_tip_orders(row, toast_df):
+        # Toast tips per (location, date) as integer cents, sorted for binary search;
+        # the stable sort keeps equal tips in their original order
+        toast_tip_orders = toast_df.loc[toast_df['Tip'].notna(), ['Location', 'Date', 'Tip', 'Order #']].copy()
+        toast_tip_orders['Cents'] = (toast_tip_orders['Tip'] * 100).round().astype('int64')
+        toast_tip_orders['Order #'] = toast_tip_orders['Order #'].astype(str)
+        toast_tip_orders = toast_tip_orders.sort_values('Cents', kind='stable')
+        tip_index = {
+            key: (group['Cents'].tolist(), group['Order #'].tolist())
+            for key, group in toast_tip_orders.groupby(['Location', 'Date'], sort=False)
+        }
+
+        def find_matching_tip_orders(row):
             knock_diff = abs(row['Toast Knock Delivery Tips'] - row['Knock Payable Delivery Tips'])
             if knock_diff > 0.01:
-                location_date_orders = toast_df[
-                    (toast_df['Location'] == row['Location']) &
-                    (toast_df['Date'] == row['Date']) &
-                    (abs(toast_df['Tip'] - knock_diff) < 0.01)
-                ]['Order #'].astype(str).tolist()
-
-                if location_date_orders:
-                    return ', '.join([f"#{order}" for order in location_date_orders])
+                cents, orders = tip_index.get((row['Location'], row['Date']), ([], []))
+                # Within the one-cent tolerance means the same cent amount
+                target = round(knock_diff * 100)
+                start = bisect_left(cents, target)
+                end = bisect_right(cents, target, start)
+
+                if end > start:
+                    return ', '.join([f"#{order}" for order in orders[start:end]])
             return ''
 
-        # Start with OLO and knock tips merge
-        discrepancy = pd.merge(olo_tips, knock_tips, on=['Location', 'Date'], how='outer').fillna(0)
-        discrepancy = pd.merge(discrepancy, toast_relay_tips, on=['Location', 'Date'], how='outer').fillna(0)
-        discrepancy = pd.merge(discrepancy, toast_metro_speedy_tips, on=['Location', 'Date'], how='outer').fillna(0)
-        discrepancy = pd.merge(discrepancy, toast_new_company_tips, on=['Location', 'Date'], how='outer').fillna(0)
-
         # Handle New Company tips based on Relacion file availability
-        new_company_tips = pd.DataFrame()
-
+        new_company_tips = []
         for location in new_company_locations:
             if location in new_company_locations_with_data:
-                location_data = new_company_data[new_company_data['Location'] == location].copy()
-                location_data = location_data.rename(columns={'Tip': 'New Company Delivery Tips'})
+                new_company_tips.append(new_company_data[new_company_data['Location'] == location])
             else:
-                location_data = olo_payable[olo_payable['Location'] == location].copy()
-                location_data = location_data.rename(columns={'Tip': 'New Company Delivery Tips'})
+                new_company_tips.append(olo_payable[olo_payable['Location'] == location])
 
-            if new_company_tips.empty:
-                new_company_tips = location_data
-            else:
-                new_company_tips = pd.concat([new_company_tips, location_data])
-
-        # Add New Company payable tips
-        discrepancy = pd.merge(discrepancy, new_company_tips, on=['Location', 'Date'], how='outer').fillna(0)
-
-        # Then add OLO payable tips
-        olo_payable = olo_payable.rename(columns={'Tip': 'OLO Payable Delivery Tips'})
-        discrepancy = pd.merge(discrepancy, olo_payable, on=['Location', 'Date'], how='outer').fillna(0)
-
-        # Set OLO Payable Delivery Tips to 0 for new company locations
-        discrepancy.loc[discrepancy['Location'].isin(new_company_locations), 'OLO Payable Delivery Tips'] = 0
-
-        # Set Toast OLO Delivery Tips to 0 for new company locations
-        discrepancy.loc[discrepancy['Location'].isin(new_company_locations), 'Toast OLO Delivery Tips'] = 0
-
-        # Add knock payable tips
-        knock_df = pd.DataFrame([
-            {'Location': loc, 'Date': date, 'Knock Payable Delivery Tips': tip}
+        knock_payable_rows = [
+            (loc, date, 'Knock Payable Delivery Tips', tip)
             for loc, date_tips in knock_payable.items()
             for date, tip in date_tips.items()
-        ])
-        if not knock_df.empty:
-            discrepancy = pd.merge(discrepancy, knock_df, on=['Location', 'Date'], how='outer').fillna(0)
-        else:
-            discrepancy['Knock Payable Delivery Tips'] = 0
-
-        # Add relay payable tips
-        relay_payable = relay_payable.rename(columns={'Tip': 'Relay Payable Delivery Tips'})
-        discrepancy = pd.merge(discrepancy, relay_payable, on=['Location', 'Date'], how='outer').fillna(0)
+        ]
 
-        # Add Metro Speedy payable tips
-        if not metro_speedy_data.empty:
-            metro_speedy_data = metro_speedy_data.rename(columns={'Tip': 'Metro Speedy Payable Delivery Tips'})
-            discrepancy = pd.merge(discrepancy, metro_speedy_data, on=['Location', 'Date'], how='outer').fillna(0)
+        # Every tip source as (frame, tip column, output column); Toast frames already carry their output column
+        tip_sources = [
+            (olo_tips, 'Toast OLO Delivery Tips', 'Toast OLO Delivery Tips'),
+            (knock_tips, 'Toast Knock Delivery Tips', 'Toast Knock Delivery Tips'),
+            (toast_relay_tips, 'Toast Relay Delivery Tips', 'Toast Relay Delivery Tips'),
+            (toast_metro_speedy_tips, 'Toast Metro Speedy Delivery Tips', 'Toast Metro Speedy Delivery Tips'),
+            (toast_new_company_tips, 'Toast New Company Delivery Tips', 'Toast New Company Delivery Tips'),
+            *[(frame, 'Tip', 'New Company Delivery Tips') for frame in new_company_tips],
+            (olo_payable, 'Tip', 'OLO Payable Delivery Tips'),
+            (relay_payable, 'Tip', 'Relay Payable Delivery Tips'),
+            (metro_speedy_data, 'Tip', 'Metro Speedy Payable Delivery Tips')
+        ]
+        tip_columns = list(dict.fromkeys(column for _, _, column in tip_sources))
+        tip_columns.append('Knock Payable Delivery Tips')
+
+        # Normalize to long (Location, Date, Source, Tip) rows, concatenate once and pivot once
+        long_frames = [
+            pd.DataFrame({'Location': frame['Location'].to_numpy(), 'Date': frame['Date'].to_numpy(),
+                          'Source': column, 'Tip': frame[tip_column].to_numpy()})
+            for frame, tip_column, column in tip_sources
+            if not frame.empty
+        ]
+        if knock_payable_rows:
+            long_frames.append(pd.DataFrame(knock_payable_rows, columns=['Location', 'Date', 'Source', 'Tip']))
+
+        if long_frames:
+            long_tips = pd.concat(long_frames, ignore_index=True)
+            long_tips['Tip'] = pd.to_numeric(long_tips['Tip']).fillna(0)
+            # A repeated (Location, Date) within one source keeps its first tip
+            discrepancy = long_tips.pivot_table(index=['Location', 'Date'], columns='Source', values='Tip',
+                                                aggfunc='first', fill_value=0)
+            discrepancy = discrepancy.reindex(columns=tip_columns, fill_value=0).reset_index()
+            discrepancy.columns.name = None
         else:
-            discrepancy['Metro Speedy Payable Delivery Tips'] = 0
+            discrepancy = pd.DataFrame(columns=['Location', 'Date'] + tip_columns)
+
+        # Set OLO Payable and Toast OLO Delivery Tips to 0 for new company locations
+        discrepancy.loc[discrepancy['Location'].isin(new_company_locations), 'OLO Payable Delivery Tips'] = 0
+        discrepancy.loc[discrepancy['Location'].isin(new_company_locations), 'Toast OLO Delivery Tips'] = 0
 
         # In the column setup section:
         discrepancy['Incorrect Dining Option'] = ''
@@ -1381,7 +1412,7 @@ class TipsReconcileThread(QThread):
 
 
             # Add orders from knock tip difference check if any
-            matching_orders = find_matching_tip_orders(row, toast_df)
+            matching_orders = find_matching_tip_orders(row)
             if matching_orders:
                 if discrepancy.at[idx, 'Incorrect Dining Option']:
                     discrepancy.at[idx, 'Incorrect Dining Option'] += f", {matching_orders}"
@@ -1510,53 +1541,34 @@ class TipsReconcileThread(QThread):
 
         return discrepancy
 
-    def format_summary_excel(self, summary_df, output_path, ws):
-        import openpyxl
-        from openpyxl.styles import PatternFill, Border, Side, Alignment, Font
-        from openpyxl.utils import get_column_letter
-
-        # Rename the difference columns (remove the word "Difference")
-        renamed_columns = {
-            'Difference Toast - 3P Delivery Tips': 'Toast - 3P Delivery Tips',
-            'Difference Toast - R365 Delivery Tips': 'Toast - R365 Delivery Tips',
-            'Difference Toast - R365 Employee Tips': 'Toast - R365 Employee Tips'
-        }
-        summary_df = summary_df.rename(columns=renamed_columns)
-
+    def write_summary_sheet(self, summary_df, ws):
+        from openpyxl.utils import get_column_letter, column_index_from_string
+        from excel_styles import StyleRegistry, THICK_BOX, append_styled_row, set_column_widths
 
-        # Insert new row at top for grouped headers
-        ws.insert_rows(1)
-
-        # Apply Aptos Narrow font to all cells
-        for row in ws.rows:
-            for cell in row:
-                cell.font = Font(name='Aptos Narrow')
+        # Every style carries the Aptos Narrow font
+        styles = StyleRegistry(ws.parent, font_name='Aptos Narrow')
+        columns = list(summary_df.columns)
+        max_col = len(columns)
+        max_row = len(summary_df) + 2
 
         # Set column width
         EXCEL_COLUMN_WIDTH = 19
         WIDE_COLUMN_WIDTH = 25  # approximately 170 pixels
+        set_column_widths(ws, 1, min(2, max_col), WIDE_COLUMN_WIDTH)
+        set_column_widths(ws, 3, max_col, EXCEL_COLUMN_WIDTH)
+
         # Set row height for row 2
         ws.row_dimensions[2].height = 35
 
-        # Set default width for all columns
-        for col in range(1, ws.max_column + 1):
-            column_letter = get_column_letter(col)
-            # Special width for columns A and B
-            if col <= 2:
-                ws.column_dimensions[column_letter].width = WIDE_COLUMN_WIDTH
-            else:
-                ws.column_dimensions[column_letter].width = EXCEL_COLUMN_WIDTH
-
         # Define colors
-        light_blue = PatternFill(start_color="B8CCE4", end_color="B8CCE4", fill_type="solid")
-        light_orange = PatternFill(start_color="FCD5B4", end_color="FCD5B4", fill_type="solid")
-        light_green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-        yellow = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-        super_light_red = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+        light_blue = 'B8CCE4'
+        light_orange = 'FCD5B4'
+        light_green = 'C6EFCE'
+        yellow = 'FFEB9C'
+        super_light_red = 'FFE6E6'
 
-        # Define sections and their headers
+        # Define sections and their headers; Location and Date range (A-B) have no group or borders
         sections = [
-            ('A', 'B', None, None),  # Location, Date range
             ('C', 'D', 'Toast Totals', light_orange),
             ('E', 'F', 'R365 Totals', light_green),
             ('G', 'K', '3P Delivery Total', light_blue),
@@ -1564,118 +1576,71 @@ class TipsReconcileThread(QThread):
             ('O', 'P', 'PAYROLL DIFFERENCES', yellow)
         ]
 
-        # Define center alignment
-        center_align = Alignment(horizontal='center', vertical='center')
-        thick = Side(style='thick')
+        # Specific header cells in row 2 that get colored
+        header_fills = {
+            'G': light_blue,   # Total 3rd Party Delivery Tips
+            'L': light_blue,   # Toast - 3P Delivery Tips
+            'M': light_green,  # Toast - R365 Delivery Tips
+            'N': light_green   # Toast - R365 Employee Tips
+        }
 
-        # Apply merged headers, colors, and borders for row 1
+        # Per-column styles for the grouped header, column header, body and last rows
+        plain = styles.style()
+        group_values = [None] * max_col
+        group_styles = [plain] * max_col
+        header_styles = [styles.style(align='wrap')] * max_col
+        body_styles = [plain] * max_col
+        last_styles = [plain] * max_col
         for start_col, end_col, header_text, color in sections:
-            if header_text:  # Skip the first section
-                # Merge cells and add header text
-                if start_col != end_col:
-                    ws.merge_cells(f'{start_col}1:{end_col}1')
-                cell = ws[f'{start_col}1']
-                cell.value = header_text
-                cell.alignment = center_align
-
-                # Apply color if specified
-                if color:
-                    for col in range(ord(start_col) - 64, ord(end_col) - 64 + 1):
-                        col_letter = get_column_letter(col)
-                        ws[f'{col_letter}1'].fill = color
-
-                # Apply borders
-                if start_col == end_col:
-                    ws[f'{start_col}1'].border = Border(top=thick, right=thick, bottom=thick, left=thick)
-                else:
-                    ws[f'{start_col}1'].border = Border(left=thick, top=thick, bottom=thick)
-                    ws[f'{end_col}1'].border = Border(right=thick, top=thick, bottom=thick)
-                    for col in range(ord(start_col) - 64 + 1, ord(end_col) - 64):
-                        col_letter = get_column_letter(col)
-                        ws[f'{col_letter}1'].border = Border(top=thick, bottom=thick)
-
-        # Apply text wrapping and alignment to row 2
-        for col in range(1, ws.max_column + 1):
-            col_letter = get_column_letter(col)
-            cell = ws[f'{col_letter}2']
-            cell.alignment = Alignment(wrap_text=True, vertical='center', horizontal='center')
-
-        # Color the specific cells in row 2
-        ws['G2'].fill = light_blue   # Total 3rd Party Delivery Tips
-        ws['L2'].fill = light_blue   # Toast - 3P Delivery Tips
-        ws['M2'].fill = light_green # Toast - R365 Delivery Tips
-        ws['N2'].fill = light_green  # Toast - R365 Employee Tips
-
-        # Apply borders to the data section
-        max_row = ws.max_row
-        for start_col, end_col, _, _ in sections[1:]:  # Skip first section
-            for row in range(2, max_row + 1):
-                for col in range(ord(start_col) - 64, ord(end_col) - 64 + 1):
-                    col_letter = get_column_letter(col)
-                    cell = ws[f'{col_letter}{row}']
-                    if row == 2:
-                        # Skip borders for A2 and B2
-                        if col_letter not in ['A', 'B']:
-                            cell.border = Border(top=thick, bottom=thick,
-                                                 left=thick if col_letter == start_col else None,
-                                                 right=thick if col_letter == end_col else None)
-                    else:
-                        cell.border = Border(left=thick if col_letter == start_col else None,
-                                             right=thick if col_letter == end_col else None,
-                                             bottom=thick if row == max_row else None)
-        # Remove borders from cells A2 and B2
-        ws['A2'].border = Border()
-        ws['B2'].border = Border()
-
-
-
-
-    def format_discrepancy_excel(self, discrepancy_df, output_path, ws):
-        import openpyxl
-        from openpyxl.styles import PatternFill, Border, Side, Alignment, Font
-        from openpyxl.utils import get_column_letter
+            start = column_index_from_string(start_col)
+            end = column_index_from_string(end_col)
+            group_values[start - 1] = header_text
+            group_styles[start - 1] = styles.style(fill=color, align='middle', border=THICK_BOX)
+            for col in range(start, end + 1):
+                left = 'thick' if col == start else None
+                right = 'thick' if col == end else None
+                header_styles[col - 1] = styles.style(fill=header_fills.get(get_column_letter(col)), align='wrap',
+                                                      border=(left, right, 'thick', 'thick'))
+                body_styles[col - 1] = styles.style(border=(left, right, None, None))
+                last_styles[col - 1] = styles.style(border=(left, right, None, 'thick'))
+
+        append_styled_row(ws, group_values, group_styles)
+        append_styled_row(ws, columns, header_styles)
+        for row_idx, values in enumerate(summary_df.itertuples(index=False, name=None), 3):
+            append_styled_row(ws, values, last_styles if row_idx == max_row else body_styles)
+
+        # Merge the group headers; the merge carries the thick box out to the section edges
+        for start_col, end_col, _, _ in sections:
+            ws.merge_cells(f'{start_col}1:{end_col}1')
 
-        # Insert new row at top for grouped headers
-        ws.insert_rows(1)
+    def write_discrepancy_sheet(self, discrepancy_df, ws):
+        from openpyxl.utils import get_column_letter, column_index_from_string
+        from excel_styles import StyleRegistry, append_styled_row, set_column_widths
 
-        # Apply Aptos Narrow font to all cells
-        for row in ws.rows:
-            for cell in row:
-                cell.font = Font(name='Aptos Narrow')
+        # Every style carries the Aptos Narrow font
+        styles = StyleRegistry(ws.parent, font_name='Aptos Narrow')
+        columns = list(discrepancy_df.columns)
+        max_col = len(columns)
+        max_row = len(discrepancy_df) + 2
 
         # Set exact column width of 115 pixels for all columns
         EXCEL_COLUMN_WIDTH = 19
-        for col in range(1, ws.max_column + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = EXCEL_COLUMN_WIDTH
+        set_column_widths(ws, 1, max_col, EXCEL_COLUMN_WIDTH)
 
         # Set row height for row 2
         ws.row_dimensions[2].height = 35
 
-        # Apply center alignment to A2 and B2 (both horizontal and vertical)
-        ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-        ws['B2'].alignment = Alignment(horizontal='center', vertical='center')
-
-        # Remove all borders and fills first
-        no_border = Border()
-        no_fill = PatternFill(fill_type=None)
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = no_border
-                cell.fill = no_fill
-
         # Define colors
-        light_blue = PatternFill(start_color="B8CCE4", end_color="B8CCE4", fill_type="solid")
-        light_orange = PatternFill(start_color="FCD5B4", end_color="FCD5B4", fill_type="solid")
-        light_green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-        yellow = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        super_light_red = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+        light_blue = 'B8CCE4'
+        light_orange = 'FCD5B4'
+        light_green = 'C6EFCE'
+        super_light_red = 'FFE6E6'
 
         # Define comparison highlight colors
-        comp_light_blue = PatternFill(start_color="DCEBF7", end_color="DCEBF7", fill_type="solid")
-        comp_light_yellow = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-        comp_light_orange = PatternFill(start_color="FFE4CC", end_color="FFE4CC", fill_type="solid")
-        comp_light_green = PatternFill(start_color="E8F3E8", end_color="E8F3E8", fill_type="solid")
+        comp_light_blue = 'DCEBF7'
+        comp_light_yellow = 'FFF2CC'
+        comp_light_orange = 'FFE4CC'
+        comp_light_green = 'E8F3E8'
 
         # Define sections and their headers
         sections = [
@@ -1684,121 +1649,48 @@ class TipsReconcileThread(QThread):
             ('M', 'N', 'R365', light_green),
             ('O', 'Q', 'TOTALS', super_light_red),
             ('R', 'T', 'DIFFERENCES', super_light_red),
-            ('U', 'X', 'ORDER NUMBER', None)  # Updated to span four columns U-X
+            ('U', 'X', 'ORDER NUMBER', None)  # Spans four columns U-X
         ]
 
-        # Define center alignment
-        center_align = Alignment(horizontal='center', vertical='center')
-        thick = Side(style='thick')
-        thin = Side(style='thin')
-
-        # Apply thick border around entire dataset
-        for row in range(1, ws.max_row + 1):
-            for col in range(1, ws.max_column + 1):
-                col_letter = get_column_letter(col)
-                cell = ws[f'{col_letter}{row}']
-
-                # Default thin borders
-                border_left = thin
-                border_right = thin
-                border_top = thin
-                border_bottom = thin
-
-                # Thick borders for edges
-                if col == 1:  # First column
-                    border_left = thick
-                if col == ws.max_column:  # Last column
-                    border_right = thick
-                if row == 1:  # First row
-                    border_top = thick
-                if row == ws.max_row:  # Last row
-                    border_bottom = thick
-                if row == 2:  # Second row
-                    border_top = thick
-                    border_bottom = thick
-
-                cell.border = Border(
-                    left=border_left,
-                    right=border_right,
-                    top=border_top,
-                    bottom=border_bottom
-                )
+        # Specific header cells in row 2 that get colored
+        header_fills = {
+            'O': light_blue,    # Total 3rd Party Delivery Tips
+            'P': light_blue,    # Total Toast Delivery Tips
+            'Q': light_orange,  # Total Toast Employee Tips
+            'R': light_green,   # Toast - R365 Delivery Tips
+            'S': light_green,   # Toast - R365 Employee Tips
+            'T': light_blue     # Toast - 3P Delivery Tips
+        }
 
-        # Apply merged headers, colors, and borders for row 1
+        # Thin grid with a thick outline, thick rules around the header row and between sections;
+        # the last ORDER NUMBER column (X) also closes with a thick rule
+        section_starts = {column_index_from_string(start) for start, _, _, _ in sections}
+        last_order_col = column_index_from_string('X')
+        column_sides = {}
+        for col in range(1, max_col + 1):
+            left = 'thick' if col == 1 or col in section_starts else 'thin'
+            right = 'thick' if col == max_col or col == last_order_col else 'thin'
+            column_sides[col] = (left, right)
+
+        def cell_style(col, row, fill=None):
+            left, right = column_sides[col]
+            top = 'thick' if row <= 2 else 'thin'
+            bottom = 'thick' if row == 2 or row == max_row else 'thin'
+            return styles.style(fill=fill, border=(left, right, top, bottom), align='wrap' if row == 2 else None)
+
+        # Grouped header row
+        group_values = [None] * max_col
+        group_styles = [cell_style(col, 1) for col in range(1, max_col + 1)]
         for start_col, end_col, header_text, color in sections:
-            # Merge cells and add header text
-            if start_col != end_col:
-                ws.merge_cells(f'{start_col}1:{end_col}1')
-            cell = ws[f'{start_col}1']
-            cell.value = header_text
-            cell.alignment = center_align
-
-            # Apply color if specified
-            if color:
-                for col in range(ord(start_col) - 64, ord(end_col) - 64 + 1):
-                    col_letter = get_column_letter(col)
-                    ws[f'{col_letter}1'].fill = color
-
-        # Apply thick borders between sections and within ORDER NUMBER section
-        for start_col, end_col, _, _ in sections:
-            start_num = ord(start_col) - 64
-            if start_col != 'A':  # Don't add left border to first column
-                for row in range(1, ws.max_row + 1):
-                    # Add thick left border to section start
-                    cell = ws[f'{start_col}{row}']
-                    current_border = cell.border
-                    cell.border = Border(
-                        left=thick,
-                        right=current_border.right,
-                        top=current_border.top,
-                        bottom=current_border.bottom
-                    )
+            start = column_index_from_string(start_col)
+            left, right = column_sides[start]
+            group_values[start - 1] = header_text
+            group_styles[start - 1] = styles.style(fill=color, align='middle', border=(left, right, 'thick', 'thin'))
+        append_styled_row(ws, group_values, group_styles)
 
-                    # Add thin vertical borders between ORDER NUMBER columns
-                    if start_col == 'U':  # ORDER NUMBER section
-                        # Add thin border between U and V
-                        cell_v = ws[f'V{row}']
-                        current_v_border = cell_v.border
-                        cell_v.border = Border(
-                            left=thin,
-                            right=current_v_border.right,
-                            top=current_v_border.top,
-                            bottom=current_v_border.bottom
-                        )
-
-                        # Add thin border between V and W
-                        cell_w = ws[f'W{row}']
-                        current_w_border = cell_w.border
-                        cell_w.border = Border(
-                            left=thin,
-                            right=thin,  # Change this to thin since it's not the last column anymore
-                            top=current_w_border.top,
-                            bottom=current_w_border.bottom
-                        )
-
-                        # Add border for column X (the actual last column)
-                        cell_x = ws[f'X{row}']
-                        current_x_border = cell_x.border
-                        cell_x.border = Border(
-                            left=thin,
-                            right=thick,  # This will create the thick right border
-                            top=current_x_border.top,
-                            bottom=current_x_border.bottom
-                        )
-
-        # Apply text wrapping and alignment to row 2
-        for col in range(1, ws.max_column + 1):
-            col_letter = get_column_letter(col)
-            cell = ws[f'{col_letter}2']
-            cell.alignment = Alignment(wrap_text=True, vertical='center', horizontal='center')
-
-        # Apply colors to specific cells in row 2
-        ws['O2'].fill = light_blue  # Total 3rd Party Delivery Tips
-        ws['P2'].fill = light_blue  # Total Toast Delivery Tips
-        ws['Q2'].fill = light_orange  # Total Toast Employee Tips
-        ws['R2'].fill = light_green  # Toast - R365 Delivery Tips
-        ws['S2'].fill = light_green  # Toast - R365 Employee Tips
-        ws['T2'].fill = light_blue  # Toast - 3P Delivery Tips
+        # Column header row
+        append_styled_row(ws, columns, [cell_style(col, 2, header_fills.get(get_column_letter(col)))
+                                        for col in range(1, max_col + 1)])
 
         # Define the pairs to compare and their corresponding highlight colors
         pair_configs = [
@@ -1808,31 +1700,31 @@ class TipsReconcileThread(QThread):
             ('Toast Relay Delivery Tips', 'Relay Payable Delivery Tips', comp_light_green),
             ('Toast New Company Delivery Tips', 'New Company Delivery Tips', light_blue)
         ]
+        pairs = [(columns.index(toast_col), columns.index(payable_col), highlight_color)
+                 for toast_col, payable_col, highlight_color in pair_configs
+                 if toast_col in columns and payable_col in columns]
+
+        # Data rows, with mismatched Toast/payable pairs highlighted as they are written
+        body_styles = [cell_style(col, 3) for col in range(1, max_col + 1)]
+        last_styles = [cell_style(col, max_row) for col in range(1, max_col + 1)]
+        for row_idx, values in enumerate(discrepancy_df.itertuples(index=False, name=None), 3):
+            row_styles = last_styles if row_idx == max_row else body_styles
+            for toast_idx, payable_idx, highlight_color in pairs:
+                try:
+                    toast_value = round(float(values[toast_idx] or 0), 2)
+                    payable_value = round(float(values[payable_idx] or 0), 2)
+                except (ValueError, TypeError):
+                    continue
 
-        # Apply highlighting for each row
-        for row in range(3, ws.max_row + 1):
-            for toast_col, payable_col, highlight_color in pair_configs:
-                if toast_col in discrepancy_df.columns and payable_col in discrepancy_df.columns:
-                    col_letters = {}
-                    for col in range(1, ws.max_column + 1):
-                        col_letter = get_column_letter(col)
-                        header_cell = ws[f"{col_letter}2"]
-                        if header_cell.value:
-                            col_letters[header_cell.value] = col_letter
-
-                    if toast_col in col_letters and payable_col in col_letters:
-                        toast_cell = ws[f"{col_letters[toast_col]}{row}"]
-                        payable_cell = ws[f"{col_letters[payable_col]}{row}"]
-
-                        try:
-                            toast_value = round(float(toast_cell.value or 0), 2)
-                            payable_value = round(float(payable_cell.value or 0), 2)
-
-                            if abs(toast_value - payable_value) > 0.01:
-                                toast_cell.fill = highlight_color
-                                payable_cell.fill = highlight_color
-                        except (ValueError, TypeError):
-                            continue
+                if abs(toast_value - payable_value) > 0.01:
+                    row_styles = list(row_styles)
+                    row_styles[toast_idx] = cell_style(toast_idx + 1, row_idx, highlight_color)
+                    row_styles[payable_idx] = cell_style(payable_idx + 1, row_idx, highlight_color)
+            append_styled_row(ws, values, row_styles)
+
+        # Merge the group headers
+        for start_col, end_col, _, _ in sections:
+            ws.merge_cells(f'{start_col}1:{end_col}1')
 
         return ws
 
@@ -1,14 +1,14 @@
 import sys
 import os
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton,
-                             QLabel, QFileDialog, QTextEdit, QMessageBox, QListWidget, QApplication, QWidget, QDialog, QScrollArea)
+                             QLabel, QFileDialog, QMessageBox, QListWidget, QApplication, QWidget, QDialog, QScrollArea)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from collections import defaultdict
 from datetime import datetime
 import csv
 import logging
 from pathlib import Path
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 from PyQt5.QtGui import QIcon, QPixmap
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill
@@ -924,7 +924,7 @@ class ToastReconcileWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 
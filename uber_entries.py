@@ -3,6 +3,7 @@ import os
 from datetime import datetime, timedelta
 import glob
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from shared_inputs import load_toast_orders
 
 # Location mapping dictionary stays the same
 LOCATION_MAPPING = {
@@ -57,7 +58,7 @@ def read_toast_files(toast_files):
     """
     toast_dfs = []
     for file in toast_files:
-        df = pd.read_csv(file, encoding='cp1252')
+        df = load_toast_orders(file)
         df['Opened'] = pd.to_datetime(df['Opened'], format='mixed')
         toast_dfs.append(df)
 
@@ -1,18 +1,19 @@
 from PyQt5.QtWidgets import (QVBoxLayout, QPushButton, QLabel,
-                           QFileDialog, QTextEdit, QMessageBox, QListWidget)
+                           QFileDialog, QMessageBox, QListWidget)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from datetime import datetime
 import os
-from retro_style import RetroWindow, create_retro_central_widget
+from retro_style import RetroWindow, RetroConsole, create_retro_central_widget
 
 
 class UberEatsProcessThread(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
 
-    def __init__(self, files):
+    def __init__(self, files, output_dir=None):
         super().__init__()
         self.files = files
+        self.output_dir = output_dir
 
     def run(self):
         import pandas as pd
@@ -60,8 +61,8 @@ class UberEatsProcessThread(QThread):
             # Combine both sets of entries
             combined_df = pd.concat([je_df, deposit_df], ignore_index=True) if not deposit_df.empty else je_df
 
-            # Create output directory in Downloads
-            downloads_path = os.path.join(os.path.expanduser('~'), 'Downloads')
+            # Save to Downloads unless an output directory was given
+            downloads_path = self.output_dir or os.path.join(os.path.expanduser('~'), 'Downloads')
             today = datetime.now().strftime("%m%d%Y")
             output_file = os.path.join(downloads_path, f"UE_PayoutImport_{today}.csv")
 
@@ -113,7 +114,7 @@ class UberEatsWindow(RetroWindow):
         layout.addWidget(self.run_button)
 
         # Console output
-        self.console_output = QTextEdit()
+        self.console_output = RetroConsole()
         self.console_output.setReadOnly(True)
         layout.addWidget(self.console_output)
 